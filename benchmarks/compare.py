@@ -0,0 +1,46 @@
+"""
+Compare two benchmark JSON files written by benchmarks.run
+
+    python -m benchmarks.compare old.json new.json
+"""
+import argparse
+import json
+
+
+def _key(result):
+    params = tuple(sorted((key, str(value)) for key, value in result["params"].items()))
+    return (result["benchmark"], result["model"], params)
+
+
+def compare(old, new):
+    """ (key, old min, new min, new / old) for benchmarks present in both """
+    old_results = {_key(result): result for result in old["results"]}
+    rows = list()
+    for result in new["results"]:
+        key = _key(result)
+        if key in old_results:
+            old_min = old_results[key]["min"]
+            rows.append((key, old_min, result["min"], result["min"] / old_min))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    args = parser.parse_args(argv)
+    with open(args.old) as rfile:
+        old = json.load(rfile)
+    with open(args.new) as rfile:
+        new = json.load(rfile)
+    print(f"old: {old['meta']['commit']}\nnew: {new['meta']['commit']}")
+    for (benchmark, model, params), old_min, new_min, ratio in compare(old, new):
+        params = ", ".join(f"{key}={value}" for key, value in params if key != "sweep")
+        print(
+            f"{benchmark:<20} {model:<10} {params:<45} "
+            f"{old_min * 1e3:10.3f} ms -> {new_min * 1e3:10.3f} ms   x{ratio:6.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
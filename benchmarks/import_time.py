@@ -0,0 +1,93 @@
+"""
+Cold-start import benchmark
+===========================
+
+Imports the packages in fresh interpreters, reports the wall time and
+checks that the heavy optional dependencies are not loaded on import.
+
+    python -m benchmarks.import_time --target-ms 300
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("scipy", "matplotlib")
+PACKAGES = ("numpy", "fe_code", "plotting")
+
+_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {package}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def measure(package, repeat=5):
+    """
+    import times in fresh interpreters and the heavy modules loaded with it
+
+    Returns
+    -------
+    times : list
+    loaded : list
+    """
+    times = list()
+    loaded = set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _SCRIPT.format(package=package, heavy=HEAVY_MODULES)],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True,
+        ).stdout.split()
+        times.append(float(output[0]))
+        if len(output) > 1:
+            loaded.update(output[1].split(","))
+    return times, sorted(loaded)
+
+
+def import_benchmarks(repeat=5):
+    """ results in the format of benchmarks.run """
+    results = list()
+    for package in PACKAGES:
+        times, loaded = measure(package, repeat)
+        results.append({
+            "benchmark": "import",
+            "model": package,
+            "params": {},
+            "times": times,
+            "min": min(times),
+            "median": statistics.median(times),
+            "heavy_modules": loaded,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=None,
+                        help="fail if importing fe_code takes longer (median)")
+    parser.add_argument("--output", default=None, help="JSON result file")
+    args = parser.parse_args(argv)
+
+    results = import_benchmarks(args.repeat)
+    failed = False
+    for result in results:
+        heavy = ", ".join(result["heavy_modules"]) or "-"
+        print(f"{result['model']:<10} median {result['median'] * 1e3:8.1f} ms   heavy: {heavy}")
+        if result["model"] != "numpy" and result["heavy_modules"]:
+            failed = True
+    fe_code = next(result for result in results if result["model"] == "fe_code")
+    if args.target_ms is not None and fe_code["median"] * 1e3 > args.target_ms:
+        print(f"fe_code import exceeds the target of {args.target_ms} ms")
+        failed = True
+    if args.output is not None:
+        with open(args.output, "w") as wfile:
+            json.dump({"results": results}, wfile, indent=1)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
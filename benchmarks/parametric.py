@@ -0,0 +1,56 @@
+"""
+Parametric cantilever used by the scaling sweeps
+"""
+from fe_code import Structure, MenegottoPinto, KentPark
+from fe_code.section_builder import (
+    build_section, rectangular_patch, straight_layer, add_to_section
+)
+
+
+def cantilever(no_elements=1, no_sections=4, no_fibers_y=15, no_fibers_z=15,
+               length=100.0, width=5.0, height=8.0, planar=False, element_type="force_based"):
+    """
+    planar cantilever along x with a rectangular reinforced concrete section,
+    loaded by a controlled displacement in z at the tip. with the default
+    arguments it matches model1_1. planar uses the 3-dof planar mode,
+    element_type is passed to Structure.add_fiber_beam_element
+    """
+    stru = Structure(planar)
+    for i in range(no_elements + 1):
+        stru.add_node(i + 1, length * i / no_elements, 0.0, 0.0)
+
+    w = width / no_fibers_y
+    h = height / no_fibers_z
+    y_bar = width / 2 - 1.5 * w
+    z_bar = height / 2 - 1.5 * h
+    fibers = build_section(
+        [rectangular_patch(-width / 2, -height / 2, width / 2, height / 2, no_fibers_y,
+                           no_fibers_z, 0)],
+        [
+            straight_layer(2, w * h, -y_bar, -z_bar, y_bar, -z_bar, 1),
+            straight_layer(2, w * h, -y_bar, z_bar, y_bar, z_bar, 1),
+        ],
+    )
+    materials = [
+        lambda: KentPark(6.95, 770, 0.0027),
+        lambda: MenegottoPinto(29000, 0.0042, 60, 20, 18.5, 0.0002),
+    ]
+
+    counter = 1
+    for i in range(no_elements):
+        stru.add_fiber_beam_element(i + 1, i + 1, i + 2, element_type)
+        element = stru.get_element(i + 1)
+        for j in range(no_sections):
+            element.add_section(j + 1)
+            counter = add_to_section(element.get_section(j + 1), fibers, materials, counter)
+
+    stru.set_tolerance(1e-7)
+    stru.set_section_tolerance(1e-6)
+
+    tip = no_elements + 1
+    stru.set_controlled_dof(tip, "w")
+    stru.add_dirichlet_condition(1, "uvwxyz", 0)
+    for node_id in range(2, tip + 1):
+        stru.add_dirichlet_condition(node_id, "vxz", 0)
+    stru.add_neumann_condition(tip, "w", 1.0)
+    return stru
@@ -0,0 +1,240 @@
+"""
+Benchmark suite
+===============
+
+Times structure initialization, a single Newton-Raphson iteration, a full
+load step and complete cyclic protocols for the reference column models,
+and sweeps fibers per section, sections per element and elements per
+structure on a parametric cantilever, with force-based and with
+displacement-based elements. The cold-start import time is
+measured as well. Results are written as JSON.
+
+Run from the repository root::
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.compare old.json new.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+    from fe_code.protocol import LoadProtocol
+    from models.column import model1_1, model1_3, model2
+    from disp_calc import calculate_loadsteps, calculate_loadsteps2
+    from benchmarks.parametric import cantilever
+    from benchmarks.import_time import import_benchmarks
+
+
+MAX_NR_ITERATIONS = 10
+MAX_ELE_ITERATIONS = 100
+MODELS = {"model1_1": model1_1, "model1_3": model1_3, "model2": model2}
+PROTOCOLS = {"loadsteps": calculate_loadsteps, "loadsteps2": calculate_loadsteps2}
+SWEEPS = {
+    "fibers_per_section": ("no_fibers", [5, 10, 20, 40]),
+    "sections_per_element": ("no_sections", [2, 3, 5, 9, 17, 37, 65]),
+    "elements_per_structure": ("no_elements", [1, 2, 4, 8, 16]),
+    "displacement_based_elements": ("no_elements", [1, 2, 4, 8, 16]),
+}
+QUICK_SWEEPS = {
+    "fibers_per_section": ("no_fibers", [5, 20]),
+    "sections_per_element": ("no_sections", [2, 9]),
+    "elements_per_structure": ("no_elements", [1, 4]),
+    "displacement_based_elements": ("no_elements", [1, 4]),
+}
+# fixed cantilever arguments of a sweep
+SWEEP_OPTIONS = {
+    "displacement_based_elements": {"element_type": "displacement_based", "no_sections": 3},
+}
+
+
+@contextlib.contextmanager
+def silent():
+    """ suppress the solver output """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def run_load_step(structure):
+    """ Newton-Raphson iterations until convergence, then finalize """
+    for _ in range(MAX_NR_ITERATIONS):
+        convergence, _ = structure.solve_NR_iteration(MAX_ELE_ITERATIONS)
+        if convergence:
+            structure.finalize_load_step()
+            return True
+    return False
+
+
+def run_protocol(structure, step_size, boundaries, max_steps=None):
+    """ complete cyclic protocol. returns the number of converged load steps """
+    structure.initialize()
+    protocol = LoadProtocol.from_boundaries(step_size, boundaries)
+    no_steps = len(protocol) if max_steps is None else min(len(protocol), max_steps)
+    for k in range(1, no_steps + 1):
+        structure.controlled_dof_increment = protocol.increment(k)
+        if not run_load_step(structure):
+            return k - 1
+    return no_steps
+
+
+def time_call(setup, func, repeat):
+    """ run setup (untimed) and func(setup()) (timed) repeat times """
+    times = list()
+    output = None
+    for _ in range(repeat):
+        with silent():
+            obj = setup()
+            start = time.perf_counter()
+            output = func(obj)
+            times.append(time.perf_counter() - start)
+    return times, output
+
+
+def _initialized(builder, step_size):
+    def setup():
+        structure = builder()
+        structure.initialize()
+        structure.controlled_dof_increment = step_size
+        return structure
+    return setup
+
+
+def core_benchmarks(model, builder, params, step_size, repeat):
+    """ initialize, one Newton iteration and one load step """
+    results = list()
+    times, _ = time_call(builder, lambda structure: structure.initialize(), repeat)
+    results.append(_result("initialize", model, params, times))
+    times, _ = time_call(
+        _initialized(builder, step_size),
+        lambda structure: structure.solve_NR_iteration(MAX_ELE_ITERATIONS),
+        repeat,
+    )
+    results.append(_result("newton_iteration", model, params, times))
+    times, _ = time_call(_initialized(builder, step_size), run_load_step, repeat)
+    results.append(_result("load_step", model, params, times))
+    return results
+
+
+def _result(benchmark, model, params, times, **extra):
+    result = {
+        "benchmark": benchmark,
+        "model": model,
+        "params": params,
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+    }
+    result.update(extra)
+    return result
+
+
+def model_benchmarks(step_size, repeat, protocol_repeat, max_steps, skip_protocol):
+    results = list()
+    for name, builder in MODELS.items():
+        params = {"step_size": step_size}
+        results += core_benchmarks(name, builder, params, step_size, repeat)
+        if skip_protocol:
+            continue
+        for protocol, calculate in PROTOCOLS.items():
+            boundaries = calculate(step_size)
+            times, no_steps = time_call(
+                builder,
+                lambda structure, b=boundaries: run_protocol(structure, step_size, b, max_steps),
+                protocol_repeat,
+            )
+            results.append(_result(
+                f"protocol_{protocol}", name, dict(params, max_steps=max_steps), times,
+                converged_steps=no_steps,
+            ))
+    return results
+
+
+def sweep_benchmarks(sweeps, step_size, repeat):
+    results = list()
+    for sweep, (parameter, values) in sweeps.items():
+        for value in values:
+            if parameter == "no_fibers":
+                kwargs = {"no_fibers_y": value, "no_fibers_z": value}
+            else:
+                kwargs = {parameter: value}
+            kwargs.update(SWEEP_OPTIONS.get(sweep, dict()))
+            params = dict(kwargs, sweep=sweep, step_size=step_size)
+            results += core_benchmarks(
+                "cantilever", lambda kw=kwargs: cantilever(**kw), params, step_size, repeat
+            )
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def print_table(results):
+    for result in results:
+        params = ", ".join(
+            f"{key}={value}" for key, value in result["params"].items() if key != "sweep"
+        )
+        print(
+            f"{result['benchmark']:<20} {result['model']:<10} {params:<45} "
+            f"min {result['min'] * 1e3:10.3f} ms   median {result['median'] * 1e3:10.3f} ms",
+            file=sys.stderr,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--output", default="bench_output.json", help="JSON result file")
+    parser.add_argument(
+        "--suite", choices=("models", "sweeps", "imports", "all"), default="all"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--protocol-repeat", type=int, default=1)
+    parser.add_argument("--step-size", type=float, default=0.4)
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="truncate the cyclic protocols")
+    parser.add_argument("--skip-protocol", action="store_true")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and sweep points")
+    args = parser.parse_args(argv)
+
+    repeat = 1 if args.quick else args.repeat
+    sweeps = QUICK_SWEEPS if args.quick else SWEEPS
+    max_steps = args.max_steps if args.max_steps or not args.quick else 20
+
+    results = list()
+    if args.suite in ("models", "all"):
+        results += model_benchmarks(
+            args.step_size, repeat, args.protocol_repeat, max_steps, args.skip_protocol
+        )
+    if args.suite in ("sweeps", "all"):
+        results += sweep_benchmarks(sweeps, args.step_size, repeat)
+    if args.suite in ("imports", "all"):
+        results += import_benchmarks(repeat)
+
+    print_table(results)
+    with open(args.output, "w") as wfile:
+        json.dump({"meta": metadata(), "results": results}, wfile, indent=1)
+
+
+if __name__ == "__main__":
+    main()
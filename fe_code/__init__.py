@@ -5,14 +5,19 @@ Module fe_code
 
 import sys
 
+import numpy as np
+
 from .structure import Structure
 from .material_laws import MenegottoPinto, KentPark
 
 if sys.version_info < (3, 6):
     raise RuntimeError("The fiber beam-column module requires at least Python 3.6!")
 
-import numpy as np
-np.set_printoptions(precision=4, suppress=True, linewidth=1000)
+
+def set_print_options():
+    """ compact numpy printing used by the example scripts """
+    np.set_printoptions(precision=4, suppress=True, linewidth=1000)
+
 
 MSG = "  ______ _____ ____  ______ _____\n"
 MSG += " |  ____|_   _|  _ \\|  ____|  __ \\ \n"
@@ -26,4 +31,7 @@ MSG += " |  _ <|  __|   / /\\ \\ | |\\/| ||____|| |   | |  | | |   | |  | | |\\/
 MSG += " | |_) | |____ / ____ \\| |  | |      | |___| |__| | |___| |__| | |  | | |\\  |\n"
 MSG += " |____/|______/_/    \\_\\_|  |_|       \\_____\\____/|______\\____/|_|  |_|_| \\_|\n"
 
-print(MSG)
+
+def print_banner():
+    """ print the module banner """
+    print(MSG)
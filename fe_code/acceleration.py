@@ -0,0 +1,89 @@
+"""
+Convergence acceleration
+========================
+
+Relaxation of the corrections of the element state determination and of the
+Newton-Raphson iterations of the structure. An accelerator turns the plain
+correction g_j of an iteration into the applied update, using the
+corrections of the previous iterations of the same loop. Aitken relaxation
+scales the correction by a dynamic relaxation factor (Irons-Tuck),
+omega_j = -omega_j-1 g_j-1 . (g_j - g_j-1) / |g_j - g_j-1|^2.
+
+The element iterations keep the section deformations compatible with the
+element deformations only for corrections along the plain correction, so the
+elements support scalar relaxations only; the sections take the same share
+of their residual deformations. The secant line search changes the step
+length eta of a correction until the residual projected onto the correction
+has decreased enough. The structure projects the unbalanced forces onto the
+displacement correction, the elements project the residual deformations onto
+the force correction; the sections follow a step length with the same share
+of their whole correction.
+"""
+
+ELEMENT_ACCELERATIONS = ("none", "aitken", "line_search")
+STRUCTURE_ACCELERATIONS = ("none", "aitken", "line_search")
+# secant line search: trials, accepted ratio of the projected residuals, step length bounds
+LINE_SEARCH_TRIALS = 3
+LINE_SEARCH_TOLERANCE = 0.5
+LINE_SEARCH_BOUNDS = (0.1, 2.0)
+
+
+class Aitken:
+    """
+    Aitken relaxation of the corrections
+
+    Parameters
+    ----------
+    bounds : tuple
+        minimum and maximum relaxation factor
+    """
+
+    def __init__(self, bounds=(0.1, 2.0)):
+        self._bounds = bounds
+        self.factor = 1.0
+        self._previous = None
+
+    def reset(self):
+        """ start a new iteration loop """
+        self.factor = 1.0
+        self._previous = None
+
+    def update(self, correction):
+        """ relaxed update of a correction """
+        if self._previous is not None:
+            difference = correction - self._previous
+            squared_norm = difference @ difference
+            if squared_norm > 0:
+                factor = -self.factor * (self._previous @ difference) / squared_norm
+                self.factor = min(max(factor, self._bounds[0]), self._bounds[1])
+        self._previous = correction.copy()
+        return self.factor * correction
+
+
+def make_accelerator(acceleration, accelerations=STRUCTURE_ACCELERATIONS):
+    """
+    accelerator of a method of accelerations, None for methods without an
+    accelerator object ("none" and "line_search")
+    """
+    if acceleration not in accelerations:
+        raise ValueError(f"Unknown acceleration {acceleration}. Use one of {accelerations}")
+    if acceleration == "aitken":
+        return Aitken()
+    return None
+
+
+def secant_step_length(step_lengths, projections):
+    """
+    next step length of a secant line search which started with the step
+    lengths [0, 1], None once the projected residual has decreased enough
+    or does not change
+    """
+    if (
+        abs(projections[-1]) <= LINE_SEARCH_TOLERANCE * abs(projections[0])
+        or projections[-1] == projections[-2]
+    ):
+        return None
+    step_length = step_lengths[-1] - projections[-1] * (
+        (step_lengths[-1] - step_lengths[-2]) / (projections[-1] - projections[-2])
+    )
+    return min(max(step_length, LINE_SEARCH_BOUNDS[0]), LINE_SEARCH_BOUNDS[1])
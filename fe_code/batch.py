@@ -0,0 +1,191 @@
+"""
+Batch time-history analyses
+===========================
+
+One model under many ground motion records. Every record runs on a fresh
+copy of the model, loaded from a model file (see model_io, e.g.
+`cached_model_path`) and optionally restored from a checkpoint, e.g. after
+the gravity loads. The records are distributed over a process pool. Each
+process streams its record in chunks and writes the full history to a result
+file; the peak responses of all records are collected in one result file
+with a row per record.
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .dynamics import CentralDifferenceIntegrator, NewmarkIntegrator
+from .ground_motion import open_record
+from .model_io import load_model
+from .results import ResultWriter
+
+
+INTEGRATORS = {"newmark": NewmarkIntegrator, "central_difference": CentralDifferenceIntegrator}
+PEAKS_FILE = "peaks.res"
+
+RecordResult = namedtuple("RecordResult", ["record", "no_steps", "completed", "peaks"])
+
+
+def record_paths(directory, extensions=(".at2", ".npy", ".txt", ".dat")):
+    """ sorted paths of the records in a directory """
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if os.path.splitext(name)[1].lower() in extensions
+    )
+
+
+def history_paths(records, output_dir):
+    """
+    result files of the record histories, <record name>.res. records with the
+    same name but different extensions keep the extension, e.g.
+    el_centro.at2.res, and a name which is still taken (equal file names in
+    different directories or the peaks file) gets the index of the record
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in records]
+    names = list()
+    for i, (path, stem) in enumerate(zip(records, stems)):
+        name = stem + ".res"
+        if stems.count(stem) > 1:
+            name = os.path.basename(path) + ".res"
+        if name in names or name == PEAKS_FILE:
+            name = f"{os.path.basename(path)}_{i}.res"
+        names.append(name)
+    return [os.path.join(output_dir, name) for name in names]
+
+
+class _PeakWriter:
+    """ result writer keeping the peak absolute displacements and resisting forces """
+
+    def __init__(self, structure, writer=None):
+        self.peaks = np.zeros(2 * structure.no_dofs)
+        self._writer = writer
+
+    def write_structure(self, structure):
+        values = np.concatenate((structure.get_displacements(), structure.get_forces()))
+        np.maximum(self.peaks, np.abs(values), out=self.peaks)
+        if self._writer is not None:
+            self._writer.write_row(values)
+
+
+def run_record(model_path, record_path, result_path=None, checkpoint=None, dt=None,
+               scale=1.0, integrator="newmark", chunk_size=1000, **options):
+    """
+    time-history analysis of one record on a fresh copy of a model
+
+    Parameters
+    ----------
+    model_path : str
+        model file, see model_io.save_model
+    record_path : str
+        ground motion record, see ground_motion.open_record
+    result_path : str, optional
+        result file of the full history
+    checkpoint : str, optional
+        state of the model at the start of the record, see Structure.save_checkpoint
+    dt : float, optional
+        time step of records without a header
+    scale : float
+        factor of the record values
+    integrator : str
+        "newmark" or "central_difference"
+    chunk_size : int
+        record values read at once
+    options
+        passed to the integrator, e.g. excitation, alpha or mass_coefficient
+
+    Returns
+    -------
+    result : RecordResult
+        peak absolute displacements and resisting forces, shape (2 no_dofs,)
+    """
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator {integrator}. Use one of {list(INTEGRATORS)}")
+    structure = load_model(model_path)
+    if checkpoint is not None:
+        structure.load_checkpoint(checkpoint)
+    else:
+        structure.initialize()
+    record_dt, chunks = open_record(record_path, dt, chunk_size, scale)
+    if integrator == "newmark":
+        integration = NewmarkIntegrator(structure, record_dt, **options)
+        run_options = dict()
+    else:
+        integration = CentralDifferenceIntegrator(structure, **options)
+        run_options = dict(record_dt=record_dt)
+
+    writer = None
+    if result_path is not None:
+        writer = ResultWriter.for_structure(
+            result_path, structure,
+            dict(record=os.path.basename(record_path), dt=record_dt, scale=scale),
+        )
+    peak_writer = _PeakWriter(structure, writer)
+    no_steps, completed = 0, True
+    try:
+        integration.initialize()
+        for chunk in chunks:
+            steps = integration.run(chunk, result_writer=peak_writer, **run_options)
+            no_steps += steps
+            if steps < len(chunk):
+                completed = False
+                break
+    finally:
+        if writer is not None:
+            writer.close()
+    return RecordResult(os.path.basename(record_path), no_steps, completed, peak_writer.peaks)
+
+
+def run_records(model_path, records, output_dir, processes=None, **kwargs):
+    """
+    run records in parallel, each on a fresh copy of the model. the history
+    of a record is written to <output_dir>/<record name>.res (see
+    history_paths) and the peak responses of all records to
+    <output_dir>/peaks.res, one row per record
+
+    Parameters
+    ----------
+    model_path : str
+        model file, see model_io.save_model or model_io.cached_model_path
+    records : list of str
+        record paths, e.g. from record_paths
+    output_dir : str
+    processes : int, optional
+        number of worker processes, the number of CPUs by default. 1 runs
+        the records in this process
+    kwargs
+        passed to run_record
+
+    Returns
+    -------
+    results : list of RecordResult
+        in the order of records
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    result_paths = history_paths(records, output_dir)
+    if processes == 1:
+        results = [
+            run_record(model_path, path, result_path, **kwargs)
+            for path, result_path in zip(records, result_paths)
+        ]
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [
+                pool.submit(run_record, model_path, path, result_path, **kwargs)
+                for path, result_path in zip(records, result_paths)
+            ]
+            results = [future.result() for future in futures]
+
+    structure = load_model(model_path)
+    metadata = dict(
+        records=[result.record for result in results],
+        histories=[os.path.basename(path) for path in result_paths],
+        no_steps=[result.no_steps for result in results],
+        completed=[result.completed for result in results],
+    )
+    with ResultWriter.for_structure(
+            os.path.join(output_dir, PEAKS_FILE), structure, metadata) as writer:
+        for result in results:
+            writer.write_row(result.peaks)
+    return results
@@ -0,0 +1,106 @@
+"""
+Convergence tests
+=================
+
+Tolerance policies of the iterations of the structure, the elements and the
+sections. Without a policy every level tests the norm of its unbalanced
+forces against an absolute tolerance, which mixes moments and axial forces
+of very different magnitudes. A policy tests one of the norms
+
+    residual        |W r|
+    energy          |r . du|
+    displacement    |W du|
+
+of the unbalanced forces r and the last correction du, with the component
+weights W. A relative policy divides the norm by the same norm of the
+reference forces and increments of the level: the resisting forces and the
+displacement increments of the load step for the structure, the element
+forces and deformation increments for the elements, and the section forces
+and deformation increments for the sections. The energy norm has consistent
+units and is not weighted.
+
+The components are named by the dof types "u", "v", "w", "x", "y", "z" of
+the structure and by "Mz", "My", "N" for the element and section forces.
+"""
+import numpy as np
+
+
+NORMS = ("residual", "energy", "displacement")
+SECTION_COMPONENTS = ("Mz", "My", "N")
+PLANAR_SECTION_COMPONENTS = ("My", "N")
+ELEMENT_COMPONENTS = ("Mz", "Mz", "My", "My", "N")
+PLANAR_ELEMENT_COMPONENTS = ("My", "My", "N")
+
+
+class TolerancePolicy:
+    """
+    convergence test of an iteration loop
+
+    Parameters
+    ----------
+    tolerance : float
+    norm : str
+        "residual", "energy" or "displacement"
+    relative : bool
+        norm relative to the norm of the reference of the level
+    scale : dict or array_like, optional
+        weight of every component, e.g. {"N": 100.0} or {"y": 0.01}, missing
+        components have the weight 1
+    absolute_tolerance : float
+        a relative test also converges below this absolute norm, e.g. for an
+        elastic load step whose first iteration is exact
+    """
+
+    def __init__(self, tolerance, norm="residual", relative=False, scale=None,
+                 absolute_tolerance=0.0):
+        if norm not in NORMS:
+            raise ValueError(f"Unknown norm {norm}. Use one of {NORMS}")
+        self.tolerance = tolerance
+        self.norm = norm
+        self.relative = relative
+        self.scale = scale
+        self.absolute_tolerance = absolute_tolerance
+
+    @property
+    def needs_increment(self):
+        """ the norm uses the correction """
+        return self.norm != "residual"
+
+    def weights(self, components):
+        """ weights of named components, None without scaling """
+        if self.scale is None:
+            return None
+        if isinstance(self.scale, dict):
+            return np.array([self.scale.get(component, 1.0) for component in components])
+        weights = np.asarray(self.scale, dtype=float)
+        if weights.shape != (len(components),):
+            raise ValueError(f"scale needs {len(components)} components, got {weights.shape}")
+        return weights
+
+    def value(self, residual, increment=None, weights=None):
+        """ norm of unbalanced forces and a correction """
+        if self.norm == "energy":
+            return abs(residual @ increment)
+        vector = residual if self.norm == "residual" else increment
+        if weights is not None:
+            vector = weights * vector
+        return np.linalg.norm(vector)
+
+    def converged(self, residual, increment=None, weights=None, reference=None):
+        """
+        test unbalanced forces and the last correction
+
+        Parameters
+        ----------
+        residual, increment : ndarray
+        weights : ndarray, optional
+            from weights
+        reference : tuple, optional
+            reference forces and increments of a relative policy
+        """
+        value = self.value(residual, increment, weights)
+        if not self.relative:
+            return value < self.tolerance
+        if value < self.absolute_tolerance:
+            return True
+        return value < self.tolerance * self.value(*reference, weights)
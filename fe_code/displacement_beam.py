@@ -0,0 +1,87 @@
+"""
+displacement_beam
+=================
+
+Module contains the displacement-based fiber beam element class
+"""
+import numpy as np
+
+from .fiber_beam import FiberBeam
+from .geometry import element_geometry, get_a_matrices
+
+
+class DisplacementFiberBeam(FiberBeam):
+    """
+    displacement-based fiber beam element. the section deformations are
+    interpolated from the basic deformations (linear curvatures, constant
+    axial strain), so the element state follows directly from the fiber
+    states without element iterations or flexibility inversions. it is
+    exact for linear moment distributions only, members are meshed with
+    several elements instead.
+
+    The sections, fibers and the geometry are shared with FiberBeam, the
+    default integration scheme is "gauss_legendre". see FiberBeam for the
+    attributes, acceleration and tolerance_policy have no effect
+    """
+
+    element_type = "displacement_based"
+
+    def __init__(self, element_id, node1, node2, planar=False):
+        super().__init__(element_id, node1, node2, planar)
+        self._integration_scheme = "gauss_legendre"
+        self._a_matrices = None
+
+    def initialize(self, geometry=None):
+        """
+        initialize matrices
+
+        Parameters
+        ----------
+        geometry : ElementGeometry
+            precomputed geometry, e.g. from the GeometryTable of the structure.
+            computed from the nodes and sections if not given
+        """
+        if geometry is None:
+            geometry = element_geometry(self)
+        self._a_matrices = get_a_matrices(geometry.positions, geometry.length, self._planar)
+        super().initialize(geometry)
+
+    def state_determination(self, structure_chng_disp_incr, max_ele_iterations):
+        """
+        element state for a change of the displacement increments
+
+        Returns
+        -------
+        convergence : bool
+            always True
+        """
+        chng_disp_incr = self._transform_matrix.T @ structure_chng_disp_incr
+        for a_matrix, section in zip(self._a_matrices, self.sections):
+            section.deformation_state_determination(a_matrix @ chng_disp_incr)
+        self._update_local_stiffness_matrix()
+        self.resisting_forces = np.zeros(len(self.resisting_forces))
+        for factor, a_matrix, section in zip(self._section_factors, self._a_matrices,
+                                             self.sections):
+            self.resisting_forces += factor * a_matrix.T @ section.forces
+        self._force_increment = self.resisting_forces - self.converged_resisting_forces
+        self.step_iterations += 1
+        self.step_section_iterations += len(self._sections)
+        return True
+
+    def non_iterative_state_determination(self, structure_chng_disp_incr, max_ele_iterations):
+        """ same as state_determination, there are no residuals """
+        return self.state_determination(structure_chng_disp_incr, max_ele_iterations)
+
+
+    ####################################################################################
+
+
+    def _update_local_stiffness_matrix(self):
+        """
+        update_local_stiffness_matrix based on the section stiffnesses
+        """
+        local_stiffness_matrix = np.zeros(self._local_stiffness_matrix.shape)
+        for factor, a_matrix, section in zip(self._section_factors, self._a_matrices,
+                                             self.sections):
+            local_stiffness_matrix += factor * a_matrix.T @ section.stiffness_matrix @ a_matrix
+        self._local_stiffness_matrix = local_stiffness_matrix
@@ -0,0 +1,473 @@
+"""
+Dynamics
+========
+
+Time-history analysis of a structure under ground acceleration. The
+integrators work on the relative displacements of the free dofs (the
+equations of the structure without the fixed dofs) and use the element
+state determination of the structure. The implicit Newmark integrator
+iterates on the global tangent; the explicit central difference integrator
+needs only the resisting forces of the elements and lumped masses.
+"""
+import math
+
+import numpy as np
+
+from . import events
+from .equations import Factorization
+
+
+TANGENTS = ("newton", "modified", "initial")
+
+
+def rayleigh_coefficients(damping_ratio, omega_1, omega_2):
+    """
+    coefficients (a_M, a_K) of the Rayleigh damping C = a_M M + a_K K with
+    damping_ratio at the circular frequencies omega_1 and omega_2
+    """
+    mass_coefficient = 2 * damping_ratio * omega_1 * omega_2 / (omega_1 + omega_2)
+    stiffness_coefficient = 2 * damping_ratio / (omega_1 + omega_2)
+    return mass_coefficient, stiffness_coefficient
+
+
+def influence_vector(structure, dofs, excitation):
+    """ 1 for the dofs (global indices) of the excitation direction, e.g. "u" """
+    dof_types = structure.dof_types
+    return np.array([dof_types[i % len(dof_types)] == excitation for i in dofs], dtype=float)
+
+
+def free_dofs(structure):
+    """ global indices of the equations without homogenuous dirichlet conditions """
+    return np.setdiff1d(structure.equations, structure.fixed_dofs)
+
+
+def critical_time_step(structure, masses, dofs=None):
+    """
+    estimate of the critical time step 2 / omega_max of the central difference
+    method. omega_max is bounded by the largest frequency of the single
+    elements with their current tangent stiffness and their share of the
+    lumped masses
+
+    Parameters
+    ----------
+    structure : Structure
+        initialized structure
+    masses : ndarray
+        positive lumped masses of the dofs, shape (no_dofs,)
+    dofs : array_like, optional
+        global indices of the integrated dofs, the free dofs by default
+
+    Returns
+    -------
+    dt : float
+    """
+    if dofs is None:
+        dofs = free_dofs(structure)
+    indices = structure.element_dof_indices
+    integrated = np.isin(indices, dofs)
+    # the masses of a dof are shared equally by its elements
+    shares = np.zeros(structure.no_dofs)
+    np.add.at(shares, indices, 1.0)
+    element_masses = np.where(integrated, masses[indices] / shares[indices], 1.0)
+    stiffness = structure.geometry.global_matrices(
+        np.array([element.local_stiffness_matrix for element in structure.elements])
+    )
+    stiffness *= integrated[:, :, None] & integrated[:, None, :]
+    scale = 1 / np.sqrt(element_masses)
+    omega_squared = np.linalg.eigvalsh(stiffness * scale[:, :, None] * scale[:, None, :]).max()
+    return 2 / math.sqrt(omega_squared)
+
+
+class NewmarkIntegrator:
+    """
+    implicit Newmark-beta / HHT-alpha integration. the record values are the
+    ground accelerations at t = dt, 2 dt, ..., the analysis starts at rest
+    from the current converged state (e.g. after a static preload)
+
+    Parameters
+    ----------
+    structure : Structure
+    dt : float
+    excitation : str
+        dof type of the ground motion direction, e.g. "u"
+    alpha : float
+        HHT parameter in [-1/3, 0]. 0 is the average acceleration method
+    beta, gamma : float, optional
+        by default (1 - alpha)^2 / 4 and 1/2 - alpha
+    mass_coefficient, stiffness_coefficient : float
+        Rayleigh damping with the initial tangent, C = a_M M + a_K K_0
+    consistent_mass : bool
+        consistent or lumped element masses
+    tangent : str
+        "newton" refactors the effective stiffness whenever the tangent has
+        changed, "modified" at most once per time step, "initial" never
+    max_iterations, max_ele_iterations : int
+    tolerance : float, optional
+        on the norm of the residual forces, the structure tolerance by default
+
+    Attributes
+    ----------
+    time : float
+    no_factorizations : int
+        factorizations of the effective stiffness so far
+    """
+
+    def __init__(self, structure, dt, excitation="u", alpha=0.0, beta=None, gamma=None,
+                 mass_coefficient=0.0, stiffness_coefficient=0.0, consistent_mass=False,
+                 tangent="newton", max_iterations=10, max_ele_iterations=100, tolerance=None):
+        if not -1 / 3 <= alpha <= 0:
+            raise ValueError("alpha has to be in [-1/3, 0]")
+        if tangent not in TANGENTS:
+            raise ValueError(f"Unknown tangent {tangent}. Use one of {TANGENTS}")
+        self._structure = structure
+        self.dt = dt
+        self._excitation = excitation
+        self._alpha = alpha
+        self._beta = (1 - alpha) ** 2 / 4 if beta is None else beta
+        self._gamma = 0.5 - alpha if gamma is None else gamma
+        self._mass_coefficient = mass_coefficient
+        self._stiffness_coefficient = stiffness_coefficient
+        self._consistent_mass = consistent_mass
+        self._tangent = tangent
+        self._max_iterations = max_iterations
+        self._max_ele_iterations = max_ele_iterations
+        self._tolerance = tolerance
+
+        self.time = 0.0
+        self.no_factorizations = 0
+        self._free = None
+        self._mass = None
+        self._damping = None
+        self._ground_forces = None
+        self._factorization = None
+        self._velocity = None
+        self._acceleration = None
+        self._forces = None
+        self._static_forces = None
+        self._ground_acceleration = 0.0
+
+    @property
+    def free_dofs(self):
+        """ global indices of the integrated dofs """
+        return self._free
+
+    @property
+    def velocity(self):
+        """ relative velocities, shape (no_dofs,) """
+        return self._expand(self._velocity)
+
+    @property
+    def acceleration(self):
+        """ relative accelerations, shape (no_dofs,) """
+        return self._expand(self._acceleration)
+
+    def initialize(self):
+        """ mass and damping matrices, state at rest. initializes the structure if needed """
+        structure = self._structure
+        if structure.stiffness_matrix is None:
+            structure.initialize()
+        if self._tolerance is None:
+            self._tolerance = structure.get_tolerance()
+        free = self._free = free_dofs(structure)
+        self._mass = structure.get_mass_matrix(self._consistent_mass)[np.ix_(free, free)]
+        stiffness = structure.stiffness_matrix[np.ix_(free, free)]
+        self._damping = (
+            self._mass_coefficient * self._mass + self._stiffness_coefficient * stiffness
+        )
+        self._ground_forces = -self._mass @ influence_vector(structure, free, self._excitation)
+
+        self.time = 0.0
+        self._velocity = np.zeros(len(free))
+        self._acceleration = np.zeros(len(free))
+        # resisting forces of the converged state are in equilibrium with the static loads
+        self._forces = structure.get_forces()[free].copy()
+        self._static_forces = self._forces.copy()
+        self._ground_acceleration = 0.0
+        self._factorization = None
+        if self._tangent == "initial":
+            self._factorize(self._effective_stiffness())
+
+    def step(self, ground_acceleration):
+        """
+        one time step
+
+        Returns
+        -------
+        convergence : bool
+        residual : float
+        """
+        structure = self._structure
+        dt, alpha, beta, gamma = self.dt, self._alpha, self._beta, self._gamma
+        mass, damping = self._mass, self._damping
+        velocity, acceleration = self._velocity, self._acceleration
+
+        load = self._static_forces + self._ground_forces * (
+            (1 + alpha) * ground_acceleration - alpha * self._ground_acceleration
+        )
+        load += alpha * (damping @ velocity + self._forces)
+
+        displacement_increment = np.zeros(len(self._free))
+        for i in range(self._max_iterations + 1):
+            new_acceleration = (
+                displacement_increment / (beta * dt ** 2) - velocity / (beta * dt)
+                - (1 / (2 * beta) - 1) * acceleration
+            )
+            new_velocity = velocity + dt * ((1 - gamma) * acceleration + gamma * new_acceleration)
+            forces = structure.get_forces()[self._free]
+            residual_forces = (
+                load - mass @ new_acceleration - (1 + alpha) * (damping @ new_velocity + forces)
+            )
+            residual = np.linalg.norm(residual_forces)
+            structure.convergence_statistics.add_iteration(residual)
+            converged = residual < self._tolerance and structure.elements_converged
+            if converged or i == self._max_iterations:
+                break
+            if self._tangent == "newton" or (self._tangent == "modified" and i == 0):
+                self._factorize(self._effective_stiffness())
+            correction = self._factorization.solve(residual_forces)
+            structure.update_state(self._expand(correction), self._max_ele_iterations)
+            displacement_increment += correction
+
+        if not converged:
+            events.emit(
+                events.NR_NOT_CONVERGED, events.WARNING,
+                "Newmark iterations did not converge at t = {time}. Residual = {residual}",
+                time=self.time + dt, load_step=structure.load_step + 1, iterations=i,
+                residual=residual,
+            )
+            return False, residual
+
+        self.time += dt
+        self._velocity = new_velocity
+        self._acceleration = new_acceleration
+        self._forces = forces
+        self._ground_acceleration = ground_acceleration
+        structure.finalize_load_step()
+        events.emit(
+            events.NR_CONVERGED, events.INFO,
+            "t = {time}: converged with {iterations} iteration(s). Residual = {residual}",
+            time=self.time, load_step=structure.load_step, iterations=i, residual=residual,
+        )
+        return True, residual
+
+    def run(self, accelerations, no_steps=None, result_writer=None):
+        """
+        integrate a ground motion record
+
+        Parameters
+        ----------
+        accelerations : iterable
+            ground accelerations, e.g. a generator of ground_motion.read_record
+        no_steps : int, optional
+            stop after this number of steps
+        result_writer : ResultWriter, optional
+            the structure is written after every step
+
+        Returns
+        -------
+        no_steps : int
+            converged time steps
+        """
+        if self._free is None:
+            self.initialize()
+        converged_steps = 0
+        for ground_acceleration in accelerations:
+            if no_steps is not None and converged_steps >= no_steps:
+                break
+            convergence, _ = self.step(ground_acceleration)
+            if not convergence:
+                break
+            converged_steps += 1
+            if result_writer is not None:
+                result_writer.write_structure(self._structure)
+        return converged_steps
+
+
+    ####################################################################################
+
+
+    def _effective_stiffness(self):
+        dt, alpha, beta, gamma = self.dt, self._alpha, self._beta, self._gamma
+        stiffness = self._structure.stiffness_matrix[np.ix_(self._free, self._free)]
+        return (
+            self._mass / (beta * dt ** 2)
+            + (1 + alpha) * gamma / (beta * dt) * self._damping
+            + (1 + alpha) * stiffness
+        )
+
+    def _factorize(self, matrix):
+        """ factorize unless the matrix is the factorized one """
+        if self._factorization is not None and np.array_equal(matrix, self._factorization.matrix):
+            return
+        self._factorization = Factorization(matrix)
+        self.no_factorizations += 1
+
+    def _expand(self, values):
+        """ values of the free dofs to a global vector """
+        vector = np.zeros(self._structure.no_dofs)
+        vector[self._free] = values
+        return vector
+
+
+class CentralDifferenceIntegrator:
+    """
+    explicit central difference integration with lumped masses. the resisting
+    forces follow from the element state determination, no global matrix is
+    assembled or factorized. the element masses include the rotational
+    inertia (see mass.lumped_element_mass), every free dof needs a mass. the
+    analysis starts at rest from the current converged state
+
+    Parameters
+    ----------
+    structure : Structure
+    dt : float, optional
+        at most the critical time step. safety_factor times the critical time
+        step by default
+    excitation : str
+        dof type of the ground motion direction, e.g. "u"
+    mass_coefficient : float
+        mass proportional damping, C = a_M M
+    safety_factor : float
+    max_ele_iterations : int
+
+    Attributes
+    ----------
+    time : float
+    critical_time_step : float
+        estimate with the initial element stiffness, see critical_time_step
+    """
+
+    def __init__(self, structure, dt=None, excitation="u", mass_coefficient=0.0,
+                 safety_factor=0.9, max_ele_iterations=100):
+        self._structure = structure
+        self.dt = dt
+        self._excitation = excitation
+        self._mass_coefficient = mass_coefficient
+        self._safety_factor = safety_factor
+        self._max_ele_iterations = max_ele_iterations
+
+        self.time = 0.0
+        self.critical_time_step = None
+        self._free = None
+        self._mass = None
+        self._influence = None
+        self._static_forces = None
+        self._velocity = None
+        self._acceleration = None
+        self._ground_acceleration = 0.0
+
+    @property
+    def free_dofs(self):
+        """ global indices of the integrated dofs """
+        return self._free
+
+    @property
+    def velocity(self):
+        """ relative velocities at the middle of the last time step, shape (no_dofs,) """
+        return self._expand(self._velocity)
+
+    @property
+    def acceleration(self):
+        """ relative accelerations at the start of the last time step, shape (no_dofs,) """
+        return self._expand(self._acceleration)
+
+    def initialize(self):
+        """
+        lumped masses, critical time step and state at rest. initializes the
+        structure if needed
+        """
+        structure = self._structure
+        if structure.stiffness_matrix is None:
+            structure.initialize()
+        free = self._free = free_dofs(structure)
+        masses = structure.get_lumped_masses(rotational_inertia=True)
+        massless = free[masses[free] <= 0]
+        if massless.size:
+            dof_types = structure.dof_types
+            dofs = [(1 + int(i) // len(dof_types), dof_types[i % len(dof_types)]) for i in massless]
+            raise ValueError(f"Explicit integration needs masses at the free dofs {dofs}")
+        self.critical_time_step = critical_time_step(structure, masses, free)
+        if self.dt is None:
+            self.dt = self._safety_factor * self.critical_time_step
+        elif self.dt > self.critical_time_step:
+            raise ValueError(
+                f"dt = {self.dt} exceeds the critical time step {self.critical_time_step}"
+            )
+        self._mass = masses[free]
+        self._influence = influence_vector(structure, free, self._excitation)
+
+        self.time = 0.0
+        self._velocity = np.zeros(len(free))
+        self._acceleration = np.zeros(len(free))
+        # resisting forces of the converged state are in equilibrium with the static loads
+        self._static_forces = structure.get_forces()[free].copy()
+        self._ground_acceleration = 0.0
+
+    def step(self, ground_acceleration):
+        """ one time step, ground_acceleration is the value at its end """
+        structure = self._structure
+        dt = self.dt
+        forces = structure.get_forces()[self._free]
+        self._acceleration = (
+            (self._static_forces - forces) / self._mass
+            - self._influence * self._ground_acceleration
+            - self._mass_coefficient * self._velocity
+        )
+        # the velocity at rest is the one at t = 0, a half step follows
+        self._velocity += (dt / 2 if self.time == 0.0 else dt) * self._acceleration
+        structure.update_state(
+            self._expand(dt * self._velocity), self._max_ele_iterations, update_stiffness=False
+        )
+        self.time += dt
+        self._ground_acceleration = ground_acceleration
+        structure.finalize_load_step()
+
+    def run(self, accelerations, record_dt=None, no_steps=None, result_writer=None):
+        """
+        integrate a ground motion record
+
+        Parameters
+        ----------
+        accelerations : iterable
+            ground accelerations, e.g. a generator of ground_motion.read_record
+        record_dt : float, optional
+            time step of the record. each record step is divided into time
+            steps of at most dt with linearly interpolated accelerations,
+            otherwise the record time step is dt
+        no_steps : int, optional
+            stop after this number of record values
+        result_writer : ResultWriter, optional
+            the structure is written after every record value
+
+        Returns
+        -------
+        no_steps : int
+            integrated record values
+        """
+        if self._free is None:
+            self.initialize()
+        substeps = 1
+        if record_dt is not None:
+            substeps = math.ceil(record_dt / self.dt * (1 - 1e-12))
+            self.dt = record_dt / substeps
+        integrated_steps = 0
+        for ground_acceleration in accelerations:
+            if no_steps is not None and integrated_steps >= no_steps:
+                break
+            start = self._ground_acceleration
+            for i in range(1, substeps + 1):
+                self.step(start + (ground_acceleration - start) * i / substeps)
+            integrated_steps += 1
+            if result_writer is not None:
+                result_writer.write_structure(self._structure)
+        return integrated_steps
+
+
+    ####################################################################################
+
+
+    def _expand(self, values):
+        """ values of the free dofs to a global vector """
+        vector = np.zeros(self._structure.no_dofs)
+        vector[self._free] = values
+        return vector
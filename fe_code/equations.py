@@ -0,0 +1,159 @@
+"""
+Equations
+=========
+
+Equation numbering and linear solvers of the structure. The nodes are
+renumbered with the reverse Cuthill-McKee algorithm to reduce the bandwidth
+of the stiffness matrix, which the banded solver exploits. The banded solver
+needs scipy, which is imported only when it is used.
+"""
+from collections import deque
+
+import numpy as np
+
+
+SOLVERS = ("auto", "dense", "banded")
+# "auto" uses the banded solver above this number of equations
+BANDED_MIN_EQUATIONS = 100
+
+
+def node_adjacency(elements):
+    """ dict of node id: set of the ids of the nodes sharing an element """
+    adjacency = dict()
+    for element in elements:
+        ids = [node.id for node in element.nodes]
+        for node_id in ids:
+            adjacency.setdefault(node_id, set()).update(i for i in ids if i != node_id)
+    return adjacency
+
+
+def reverse_cuthill_mckee(adjacency):
+    """
+    node order with a small bandwidth
+
+    Parameters
+    ----------
+    adjacency : dict
+        node id: set of neighbour ids
+
+    Returns
+    -------
+    order : list
+        node ids
+    """
+    degree = {node_id: len(neighbours) for node_id, neighbours in adjacency.items()}
+    order = list()
+    visited = set()
+    for start in sorted(adjacency, key=lambda node_id: (degree[node_id], node_id)):
+        if start in visited:
+            continue
+        visited.add(start)
+        queue = deque([start])
+        while queue:
+            node_id = queue.popleft()
+            order.append(node_id)
+            for neighbour in sorted(adjacency[node_id] - visited, key=lambda i: (degree[i], i)):
+                visited.add(neighbour)
+                queue.append(neighbour)
+    return order[::-1]
+
+
+def bandwidth(element_equations):
+    """
+    half bandwidth of the matrix assembled from elements
+
+    Parameters
+    ----------
+    element_equations : ndarray
+        equation numbers of the element dofs, shape (no_elements, no_element_dofs).
+        negative numbers (excluded dofs) are ignored
+    """
+    width = 0
+    for equations in element_equations:
+        equations = equations[equations >= 0]
+        if equations.size:
+            width = max(width, int(equations.max() - equations.min()))
+    return width
+
+
+def to_banded(matrix, lower, upper):
+    """ matrix in the diagonal ordered form of scipy.linalg.solve_banded """
+    n = len(matrix)
+    banded = np.zeros((lower + upper + 1, n))
+    for offset in range(-lower, upper + 1):
+        diagonal = np.diagonal(matrix, offset)
+        if offset >= 0:
+            banded[upper - offset, offset:] = diagonal
+        else:
+            banded[upper - offset, :n + offset] = diagonal
+    return banded
+
+
+def banded_available():
+    try:
+        import scipy.linalg  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        return False
+    return True
+
+
+def solve_bordered_banded(stiffness, column, row, corner, rhs, width):
+    """
+    solve the bordered system of the displacement control
+
+        [K  c] [x]   [r]
+        [d  e] [y] = [s]
+
+    with a banded factorization of K, which has the half bandwidth width
+
+    Parameters
+    ----------
+    stiffness : ndarray
+        K in the diagonal ordered form of scipy.linalg.solve_banded, see
+        to_banded. shape (2 width + 1, n)
+    column, row : ndarray
+        c and d, shape (n,)
+    corner : float
+        e
+    rhs : ndarray
+        r and s, shape (n + 1,)
+    width : int
+
+    Returns
+    -------
+    solution : ndarray
+        shape (n + 1,)
+    """
+    from scipy.linalg import solve_banded  # pylint: disable=import-outside-toplevel
+
+    a, b = solve_banded((width, width), stiffness, np.column_stack((rhs[:-1], column))).T
+    y = (rhs[-1] - row @ a) / (corner - row @ b)
+    return np.append(a - y * b, y)
+
+
+class Factorization:
+    """
+    LU factorization of a dense matrix, reused for many right-hand sides.
+    uses scipy.linalg.lu_factor if available, otherwise the inverse
+
+    Parameters
+    ----------
+    matrix : ndarray
+    """
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        try:
+            from scipy.linalg import lu_factor  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            self._lu = None
+            self._inverse = np.linalg.inv(matrix)
+        else:
+            self._lu = lu_factor(matrix)
+            self._inverse = None
+
+    def solve(self, rhs):
+        if self._lu is None:
+            return self._inverse @ rhs
+        from scipy.linalg import lu_solve  # pylint: disable=import-outside-toplevel
+        return lu_solve(self._lu, rhs)
@@ -0,0 +1,85 @@
+"""
+Events
+======
+
+Solver events with log levels. Every emitted event is counted in memory and
+passed to the callbacks subscribed to it; its message is only formatted and
+printed if its level reaches the current level. The default level prints
+warnings only, `set_level(SILENT)` prints nothing.
+"""
+from collections import Counter
+
+from . import io
+
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+SILENT = 100
+
+STEP_STARTED = "step_started"
+NR_ITERATION = "nr_iteration"
+NR_CONVERGED = "nr_converged"
+NR_NOT_CONVERGED = "nr_not_converged"
+ELEMENT_CONVERGED = "element_converged"
+ELEMENT_NOT_CONVERGED = "element_not_converged"
+INACTIVE_DOFS = "inactive_dofs"
+
+_LEVEL = WARNING
+_CALLBACKS = dict()
+_COUNTERS = Counter()
+
+
+def set_level(level):
+    """ print events with at least this level """
+    global _LEVEL
+    _LEVEL = level
+
+
+def get_level():
+    return _LEVEL
+
+
+def subscribe(event, callback):
+    """
+    call callback(event, data) whenever event is emitted. data is a dict
+    with the keyword arguments of the emit call
+    """
+    _CALLBACKS.setdefault(event, list()).append(callback)
+
+
+def unsubscribe(event, callback):
+    _CALLBACKS[event].remove(callback)
+
+
+def emit(event, level, message="", **data):
+    """
+    emit an event
+
+    Parameters
+    ----------
+    event : str
+    level : int
+    message : str
+        format string filled with data, only formatted when printed
+    data
+        event data passed to the callbacks
+    """
+    _COUNTERS[event] += 1
+    if event in _CALLBACKS:
+        for callback in _CALLBACKS[event]:
+            callback(event, data)
+    if level >= _LEVEL:
+        if level >= WARNING:
+            io.warning(message.format(**data))
+        else:
+            print(message.format(**data))
+
+
+def counters():
+    """ number of emitted events by name """
+    return dict(_COUNTERS)
+
+
+def reset_counters():
+    _COUNTERS.clear()
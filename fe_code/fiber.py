@@ -1,22 +1,18 @@
 """
 Module contains only the fiber class
 """
-import numpy as np
 
 
 class Fiber:
     """
-    Fiber class
+    view of a fiber of a section. the fiber state is stored in the arrays of
+    the section, see Section.add_fiber_arrays
 
     Parameters
     ----------
-    y : float
-        y location
-    z : float
-        z location
-    area : float
-        section area of the fiber
-    material_class : Material object
+    section : Section
+    index : int
+        position of the fiber in the arrays of the section
 
     Attributes
     ----------
@@ -24,6 +20,8 @@ class Fiber:
         converged from last load step
     strain : float
         current
+    stress : float
+        current
     direction : ndarray
         fiber to section variables
     area : float
@@ -32,46 +30,64 @@ class Fiber:
         material stiffness
     """
 
-    def __init__(self, fiber_id, y, z, area, material_class, w, h):
-        self._id = fiber_id
-        self.direction = np.array([-y, z, 1.0])
-        self.direction_matrix = np.outer(self.direction, self.direction)
-        self.area = area
-        self._material = material_class
+    def __init__(self, section, index):
+        self._section = section
+        self._index = index
 
-        self.w = w
-        self.h = h
+    @property
+    def id(self):
+        return self._section.fiber_ids[self._index]
 
-        self._strain_increment = 0.0
-        self.converged_strain = 0.0
-        self.strain = 0.0
-        self.stress = 0.0
+    @property
+    def y(self):
+        """ y location """
+        return float(self._section.fiber_geometry[self._index, 0])
 
-        self._rev = True
+    @property
+    def z(self):
+        """ z location """
+        return float(self._section.fiber_geometry[self._index, 1])
 
     @property
-    def id(self):
-        return self._id
+    def area(self):
+        return float(self._section.fiber_geometry[self._index, 2])
 
     @property
-    def tangent_stiffness(self):
-        """
-        material stiffness
-        """
-        return self._material.tangent_modulus
+    def w(self):
+        return float(self._section.fiber_geometry[self._index, 3])
 
-    def state_determination(self, sec_chng_def_increment):
-        """ step 10 + 11 """
-        chng_strain_increment = self.direction @ sec_chng_def_increment
-        self._strain_increment += chng_strain_increment
-        self.strain = self.converged_strain + self._strain_increment
-        self._material.update_strain(self.strain)
-        self.stress = self._material.stress
+    @property
+    def h(self):
+        return float(self._section.fiber_geometry[self._index, 4])
+
+    @property
+    def direction(self):
+        return self._section._directions[self._index]
 
-    def finalize_load_step(self):
+    @property
+    def direction_matrix(self):
+        return self.direction[:, None] * self.direction
+
+    @property
+    def material(self):
+        """ scalar material law with the current trial state of the fiber """
+        return self._section._fiber_material(self._index)
+
+    @property
+    def converged_strain(self):
+        return float(self._section._converged_strains[self._index])
+
+    @property
+    def strain(self):
+        return float(self._section.fiber_strains[self._index])
+
+    @property
+    def stress(self):
+        return float(self._section.fiber_stresses[self._index])
+
+    @property
+    def tangent_stiffness(self):
         """
-        finalize for next load step
+        material stiffness
         """
-        self.converged_strain = self.strain
-        self._strain_increment = 0.0
-        self._material.finalize_load_step()
+        return float(self._section._tangents[self._index])
@@ -8,8 +8,14 @@ import numpy as np
 
 from .section import Section
 from .dof import DoF
-from .gauss_lobatto import gauss_lobatto
-from .io import warning
+from .quadrature import QUADRATURE_RULES
+from .geometry import element_geometry
+from .acceleration import (
+    ELEMENT_ACCELERATIONS, LINE_SEARCH_TRIALS, make_accelerator, secant_step_length,
+)
+from .convergence import ELEMENT_COMPONENTS, PLANAR_ELEMENT_COMPONENTS
+from . import events
+from .statistics import GrowableArray
 
 
 class FiberBeam:
@@ -29,22 +35,54 @@ class FiberBeam:
     resisting_forces : ndarray
         current
     displacement_residual : ndarray
+    integration_scheme : str
+        quadrature rule along the element, see quadrature.QUADRATURE_RULES
+    planar : bool
+        planar elements bend in the x-z plane with the dofs (u, w, y) per node
+        and the basic forces (My_1, My_2, N)
+    mass_per_length : float
+        used by the dynamic analyses
+    acceleration : str
+        acceleration of the element iterations, see acceleration.ELEMENT_ACCELERATIONS
+    element_type : str
+        "force_based", see structure.ELEMENT_TYPES
+    tolerance_policy : TolerancePolicy
+        convergence test of the element iterations, see convergence. None
+        requires all sections to converge
     """
 
-    def __init__(self, element_id, node1, node2):
+    element_type = "force_based"
+
+    def __init__(self, element_id, node1, node2, planar=False):
         self._id = element_id
         self._nodes = [node1, node2]
         self._sections = dict()
-
-        self._force_increment = np.zeros(5)
-        self.resisting_forces = np.zeros(5)
-        self.converged_resisting_forces = np.zeros(5)
-        self._displacement_residual = np.zeros(5)
-
-        self._local_stiffness_matrix = np.zeros((5, 5))
-        self._transform_matrix = np.zeros((12, 5))
-
-        dof_types = "uvwxyz"
+        self._integration_scheme = "gauss_lobatto"
+        self._planar = planar
+        self.mass_per_length = 0.0
+        n = 3 if planar else 5
+
+        self._force_increment = np.zeros(n)
+        self.resisting_forces = np.zeros(n)
+        self.converged_resisting_forces = np.zeros(n)
+        self._displacement_residual = np.zeros(n)
+        self._residual_norm = np.inf
+        self._deformation_increment = np.zeros(n)
+        self._tolerance_policy = None
+        self._policy_weights = None
+
+        self._local_stiffness_matrix = np.zeros((n, n))
+        self._transform_matrix = np.zeros((6 if planar else 12, n))
+        self._geometry = None
+        self._section_factors = None
+        self._acceleration = "none"
+        self._accelerator = None
+
+        self.step_iterations = 0
+        self.step_section_iterations = 0
+        self._iteration_history = GrowableArray(2, dtype=int)
+
+        dof_types = "uwy" if planar else "uvwxyz"
         self.dofs = [DoF(node.id, dof_type) for node in self._nodes for dof_type in dof_types]
 
     @property
@@ -65,13 +103,61 @@ class FiberBeam:
         """
         return self._sections.values()
 
+    @property
+    def planar(self):
+        return self._planar
+
+    @property
+    def integration_scheme(self):
+        return self._integration_scheme
+
+    @integration_scheme.setter
+    def integration_scheme(self, scheme):
+        if scheme not in QUADRATURE_RULES:
+            raise ValueError(f"Unknown integration scheme {scheme}")
+        self._integration_scheme = scheme
+
+    @property
+    def acceleration(self):
+        return self._acceleration
+
+    @acceleration.setter
+    def acceleration(self, acceleration):
+        self._accelerator = make_accelerator(acceleration, ELEMENT_ACCELERATIONS)
+        self._acceleration = acceleration
+
+    @property
+    def tolerance_policy(self):
+        """
+        test of the unbalanced element forces k s_r and the residual
+        deformations s_r, relative to the element forces and the deformation
+        increments, instead of the section tests
+        """
+        return self._tolerance_policy
+
+    @tolerance_policy.setter
+    def tolerance_policy(self, policy):
+        self._tolerance_policy = policy
+        if policy is not None:
+            self._policy_weights = policy.weights(
+                PLANAR_ELEMENT_COMPONENTS if self._planar else ELEMENT_COMPONENTS
+            )
+
+    @property
+    def iteration_history(self):
+        """
+        element and section iterations of every converged load step
+        as an array of shape (no_steps, 2)
+        """
+        return self._iteration_history.array
+
     def add_section(self, section_id):
         """
         add a section
         """
         if section_id in self._sections:
             raise RuntimeError(f"Structure has already a section with id {section_id}")
-        self._sections[section_id] = Section(section_id)
+        self._sections[section_id] = Section(section_id, self._planar)
 
     def get_section(self, section_id):
         return self._sections[section_id]
@@ -80,17 +166,38 @@ class FiberBeam:
     ####################################################################################
 
 
-    def initialize(self):
+    def initialize(self, geometry=None):
         """
         initialize matrices
+
+        Parameters
+        ----------
+        geometry : ElementGeometry
+            precomputed geometry, e.g. from the GeometryTable of the structure.
+            computed from the nodes and sections if not given
         """
-        points, weights = gauss_lobatto(len(self.sections))
+        if geometry is None:
+            geometry = element_geometry(self)
+        self._geometry = geometry
+        self._transform_matrix = geometry.transform_matrix
+        self._section_factors = geometry.jacobian * geometry.weights
         for i, section in enumerate(self.sections):
-            section.position = points[i]
-            section.weight = weights[i]
-            section.initialize()
-        self._calculate_transform_matrix()
+            section.position = geometry.positions[i]
+            section.weight = geometry.weights[i]
+            section.initialize(geometry.b_matrices[i])
         self._update_local_stiffness_matrix()
+        self.step_iterations = 0
+        self.step_section_iterations = 0
+        self._iteration_history.clear()
+
+    @property
+    def geometry(self):
+        """ ElementGeometry, set in initialize """
+        return self._geometry
+
+    @property
+    def local_stiffness_matrix(self):
+        return self._local_stiffness_matrix
 
     def get_global_stiffness_matrix(self):
         """
@@ -105,36 +212,105 @@ class FiberBeam:
         return self._transform_matrix @ self.resisting_forces
 
     def state_determination(self, structure_chng_disp_incr, max_ele_iterations):
+        """
+        element state for a change of the displacement increments, iterated
+        until the sections are in equilibrium. the residual deformations
+        carried over from the last call are corrected in the first iteration
+
+        Returns
+        -------
+        convergence : bool
+        """
         #== step 6 ==#
         chng_disp_incr = self._transform_matrix.T @ structure_chng_disp_incr
+        self._deformation_increment += chng_disp_incr
+        relaxation = 1.0
         for j in range(1, max_ele_iterations + 1):
             #== step 7 ==#
             if j==1:
-                chng_force_increment = self._local_stiffness_matrix @ chng_disp_incr
+                chng_force_increment = self._local_stiffness_matrix @ (
+                    chng_disp_incr - self._displacement_residual
+                )
+                if self._accelerator is not None:
+                    self._accelerator.reset()
             else:
                 chng_force_increment = -self._local_stiffness_matrix @ self._displacement_residual
-            self._force_increment += chng_force_increment
-            self.resisting_forces = self.converged_resisting_forces + self._force_increment
-            #== steps 8-12 ==#
-            conv = True
-            for section in self.sections:
-                conv *= section.state_determination(chng_force_increment)
-            #== step 13 ==#
-            self._update_local_stiffness_matrix()
+                if self._accelerator is not None:
+                    chng_force_increment = self._accelerator.update(chng_force_increment)
+                    # the sections take the same share of their residuals to stay compatible
+                    relaxation = self._accelerator.factor
+            #== steps 8-13 ==#
+            initial_projection = self._displacement_residual @ chng_force_increment
+            conv = self._section_state_determination(chng_force_increment, relaxation)
+            if j > 1 and not conv and self._acceleration == "line_search":
+                conv = self._line_search(chng_force_increment, initial_projection)
             #== step 14 ==#
             if conv:
-                print(f"Element {self._id} converged with {j} iteration(s).")
-                return # FIXME:break piece of shite
-            else:
-                J = self._get_jacobian_determinant()
-                self._displacement_residual.fill(0.0)
-                for section in self.sections:
-                    self._displacement_residual += J * section.weight * section.get_global_residuals()
-        warning(f"ELEMENTS DID NOT CONVERGE WITH {max_ele_iterations} ITERATIONS")
+                self.step_iterations += j
+                events.emit(
+                    events.ELEMENT_CONVERGED, events.DEBUG,
+                    "Element {element_id} converged with {iterations} iteration(s).",
+                    element_id=self._id, iterations=j,
+                )
+                return True
+        self.step_iterations += max_ele_iterations
+        events.emit(
+            events.ELEMENT_NOT_CONVERGED, events.WARNING,
+            "Element {element_id} did not converge with {iterations} iterations",
+            element_id=self._id, iterations=max_ele_iterations,
+        )
+        return False
+
+    def non_iterative_state_determination(self, structure_chng_disp_incr, max_ele_iterations):
+        """
+        a single iteration of the element state determination. the residual
+        deformations of the sections are carried over to the next call
+        instead of being resolved by element iterations. residual deformations
+        which grew since the last call are resolved by element iterations
+        without a change of the displacements, as in state_determination. if
+        these do not converge, ELEMENT_NOT_CONVERGED is emitted and the
+        remaining residuals are carried over as well
+
+        Returns
+        -------
+        convergence : bool
+            all sections are in equilibrium
+        """
+        chng_disp_incr = self._transform_matrix.T @ structure_chng_disp_incr
+        self._deformation_increment += chng_disp_incr
+        chng_force_increment = self._local_stiffness_matrix @ (
+            chng_disp_incr - self._displacement_residual
+        )
+        conv = self._section_state_determination(chng_force_increment)
+        self.step_iterations += 1
+        residual_norm = np.linalg.norm(self._displacement_residual)
+        if not conv and residual_norm >= self._residual_norm:
+            conv = self.state_determination(np.zeros(len(structure_chng_disp_incr)),
+                                            max_ele_iterations)
+            residual_norm = np.linalg.norm(self._displacement_residual)
+        self._residual_norm = residual_norm
+        return conv
+
+    def restore_state(self, resisting_forces):
+        """
+        restore a converged state, e.g. from a checkpoint.
+        the sections have to be restored first
+        """
+        self.resisting_forces = np.array(resisting_forces, dtype=float)
+        self.converged_resisting_forces = self.resisting_forces
+        self._force_increment.fill(0.0)
+        self._deformation_increment.fill(0.0)
+        self._displacement_residual.fill(0.0)
+        self._residual_norm = np.inf
+        self.step_iterations = 0
+        self.step_section_iterations = 0
+        self._update_local_stiffness_matrix()
 
     def reset_section_residuals(self):
         for section in self.sections:
             section.reset_residual()
+        self._displacement_residual.fill(0.0)
+        self._residual_norm = np.inf
 
     def finalize_load_step(self):
         """
@@ -142,61 +318,77 @@ class FiberBeam:
         """
         self.converged_resisting_forces = self.resisting_forces
         self._force_increment.fill(0.0)
+        self._deformation_increment.fill(0.0)
+        self._residual_norm = np.inf
         for section in self.sections:
             section.finalize_load_step()
+        self._iteration_history.append((self.step_iterations, self.step_section_iterations))
+        self.step_iterations = 0
+        self.step_section_iterations = 0
 
 
     ####################################################################################
 
 
-    def _update_local_stiffness_matrix(self):
+    def _section_state_determination(self, chng_force_increment, relaxation=1.0):
         """
-        update_local_stiffness_matrix based on the section iterations
+        steps 8-13: section states for a change of the element forces, the
+        element tangent and the residual deformations
         """
-        local_flexibility_matrix = np.zeros((5, 5))
-        J = self._get_jacobian_determinant()
+        self._force_increment += chng_force_increment
+        self.resisting_forces = self.converged_resisting_forces + self._force_increment
+        conv = True
         for section in self.sections:
-            local_flexibility_matrix += J * section.weight * section.get_global_flexibility_matrix()
-        self._local_stiffness_matrix = np.linalg.inv(local_flexibility_matrix)
+            conv *= section.state_determination(chng_force_increment, relaxation)
+        self.step_section_iterations += len(self._sections)
+        return self._update_residuals(conv)
 
-    def _get_jacobian_determinant(self):
-        reference_local_vector = (
-            self.nodes[1].get_reference_location() - self.nodes[0].get_reference_location()
-        )
-        reference_length = np.linalg.norm(reference_local_vector)
-        return reference_length / 2.0
+    def _line_search(self, chng_force_increment, initial_projection):
+        """
+        secant line search along a correction of the element forces which has
+        been applied with the step length 1, the sections extend their whole
+        correction by the same share to stay compatible
+        """
+        step_lengths = [0.0, 1.0]
+        projections = [initial_projection, self._displacement_residual @ chng_force_increment]
+        conv = False
+        for _ in range(LINE_SEARCH_TRIALS):
+            step_length = secant_step_length(step_lengths, projections)
+            if step_length is None:
+                break
+            share = step_length - step_lengths[-1]
+            self._force_increment += share * chng_force_increment
+            self.resisting_forces = self.converged_resisting_forces + self._force_increment
+            conv = True
+            for section in self.sections:
+                conv *= section.extend_correction(share)
+            self.step_section_iterations += len(self._sections)
+            conv = self._update_residuals(conv)
+            if conv:
+                break
+            step_lengths.append(step_length)
+            projections.append(self._displacement_residual @ chng_force_increment)
+        return conv
+
+    def _update_residuals(self, conv):
+        """ steps 12-13: element tangent, residual deformations and convergence """
+        self._update_local_stiffness_matrix()
+        self._displacement_residual.fill(0.0)
+        for factor, section in zip(self._section_factors, self.sections):
+            self._displacement_residual += factor * section.get_global_residuals()
+        if self._tolerance_policy is not None:
+            return self._tolerance_policy.converged(
+                self._local_stiffness_matrix @ self._displacement_residual,
+                self._displacement_residual, self._policy_weights,
+                (self.resisting_forces, self._deformation_increment),
+            )
+        return bool(conv)
 
-    def _calculate_transform_matrix(self):
+    def _update_local_stiffness_matrix(self):
         """
-        called only in initialize
+        update_local_stiffness_matrix based on the section iterations
         """
-        reference_local_vector = (
-            self.nodes[1].get_reference_location() - self.nodes[0].get_reference_location()
-        )
-        reference_length = np.linalg.norm(reference_local_vector)
-        triad = self._get_triad()
-        e_1, e_2, e_3 = triad
-        # Forces of first node
-        self._transform_matrix[0:3, 0] = e_2 / reference_length
-        self._transform_matrix[0:3, 1] = e_2 / reference_length
-        self._transform_matrix[0:3, 2] = -e_3 / reference_length
-        self._transform_matrix[0:3, 3] = -e_3 / reference_length
-        self._transform_matrix[0:3, 4] = -e_1
-        # Moments of first node
-        self._transform_matrix[3:6, 0] = e_3
-        self._transform_matrix[3:6, 2] = e_2
-        # Forces of second node
-        self._transform_matrix[6:9, :] = -self._transform_matrix[0:3, :]
-        # Moments of second node
-        self._transform_matrix[9:12, 1] = e_3
-        self._transform_matrix[9:12, 3] = e_2
-
-    def _get_triad(self):
-        node1_coords = self._nodes[0].get_reference_location()
-        node2_coords = self._nodes[1].get_reference_location()
-        v1 = node2_coords - node1_coords
-        e1 = v1 / np.linalg.norm(v1)
-        # TODO: Generalize e2 ...
-        e2 = np.array([0, 1, 0])
-        e3 = np.cross(e1, e2)
-        return e1, e2, e3
+        local_flexibility_matrix = np.zeros(self._local_stiffness_matrix.shape)
+        for factor, section in zip(self._section_factors, self.sections):
+            local_flexibility_matrix += factor * section.get_global_flexibility_matrix()
+        self._local_stiffness_matrix = np.linalg.inv(local_flexibility_matrix)
@@ -0,0 +1,184 @@
+"""
+Element geometry
+================
+
+Geometric quantities of the fiber beam elements which are constant in a
+small-displacement analysis: length, Jacobian, triad, transform matrix and
+the b-matrices, positions and weights of the sections. They are computed
+once per structure in `GeometryTable` and shared with the elements.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .quadrature import integration_points
+
+
+ElementGeometry = namedtuple(
+    "ElementGeometry",
+    ["length", "jacobian", "triad", "transform_matrix", "positions", "weights", "b_matrices"],
+)
+
+
+def get_triad(node1_coords, node2_coords):
+    """ local axes e1 (along the element), e2, e3 """
+    v1 = node2_coords - node1_coords
+    e1 = v1 / np.linalg.norm(v1)
+    # TODO: Generalize e2 ...
+    e2 = np.array([0, 1, 0])
+    e3 = np.cross(e1, e2)
+    return np.array([e1, e2, e3])
+
+
+PLANAR_DOFS = [0, 2, 4, 6, 8, 10]
+PLANAR_BASIC_FORCES = [2, 3, 4]
+
+
+def get_transform_matrix(length, triad, planar=False):
+    """
+    12x5 matrix from the basic forces to the global nodal forces. planar
+    elements bend in the x-z plane: 6x3 matrix of the dofs (u, w, y) of both
+    nodes and the basic forces (My_1, My_2, N)
+    """
+    e_1, e_2, e_3 = triad
+    transform_matrix = np.zeros((12, 5))
+    # Forces of first node
+    transform_matrix[0:3, 0] = e_2 / length
+    transform_matrix[0:3, 1] = e_2 / length
+    transform_matrix[0:3, 2] = -e_3 / length
+    transform_matrix[0:3, 3] = -e_3 / length
+    transform_matrix[0:3, 4] = -e_1
+    # Moments of first node
+    transform_matrix[3:6, 0] = e_3
+    transform_matrix[3:6, 2] = e_2
+    # Forces of second node
+    transform_matrix[6:9, :] = -transform_matrix[0:3, :]
+    # Moments of second node
+    transform_matrix[9:12, 1] = e_3
+    transform_matrix[9:12, 3] = e_2
+    if planar:
+        return transform_matrix[np.ix_(PLANAR_DOFS, PLANAR_BASIC_FORCES)]
+    return transform_matrix
+
+
+def get_b_matrices(positions, planar=False):
+    """
+    force interpolation matrices of the sections, shape (no_sections, 3, 5)
+    or (no_sections, 2, 3) if planar
+    """
+    if planar:
+        b_matrices = np.zeros((len(positions), 2, 3))
+        b_matrices[:, 0, 0] = positions / 2 - 1 / 2
+        b_matrices[:, 0, 1] = positions / 2 + 1 / 2
+        b_matrices[:, 1, 2] = 1
+        return b_matrices
+    b_matrices = np.zeros((len(positions), 3, 5))
+    b_matrices[:, 0, 0] = positions / 2 - 1 / 2
+    b_matrices[:, 0, 1] = positions / 2 + 1 / 2
+    b_matrices[:, 1, 2] = positions / 2 - 1 / 2
+    b_matrices[:, 1, 3] = positions / 2 + 1 / 2
+    b_matrices[:, 2, 4] = 1
+    return b_matrices
+
+
+def get_a_matrices(positions, length, planar=False):
+    """
+    deformation interpolation matrices of the sections of displacement-based
+    elements, from the basic deformations to the section deformations with
+    linear curvatures and constant axial strain. shape (no_sections, 3, 5) or
+    (no_sections, 2, 3) if planar
+    """
+    if planar:
+        a_matrices = np.zeros((len(positions), 2, 3))
+        a_matrices[:, 0, 0] = (3 * positions - 1) / length
+        a_matrices[:, 0, 1] = (3 * positions + 1) / length
+        a_matrices[:, 1, 2] = 1 / length
+        return a_matrices
+    a_matrices = np.zeros((len(positions), 3, 5))
+    a_matrices[:, 0, 0] = (3 * positions - 1) / length
+    a_matrices[:, 0, 1] = (3 * positions + 1) / length
+    a_matrices[:, 1, 2] = (3 * positions - 1) / length
+    a_matrices[:, 1, 3] = (3 * positions + 1) / length
+    a_matrices[:, 2, 4] = 1 / length
+    return a_matrices
+
+
+def element_geometry(element):
+    """
+    geometry of a fiber beam element from its nodes, sections and integration scheme
+
+    Returns
+    -------
+    geometry : ElementGeometry
+    """
+    node1_coords = element.nodes[0].get_reference_location()
+    node2_coords = element.nodes[1].get_reference_location()
+    length = np.linalg.norm(node2_coords - node1_coords)
+    triad = get_triad(node1_coords, node2_coords)
+    positions, weights = integration_points(element.integration_scheme, len(element.sections))
+    return ElementGeometry(
+        length, length / 2.0, triad, get_transform_matrix(length, triad, element.planar),
+        positions, weights, get_b_matrices(positions, element.planar),
+    )
+
+
+def local_to_global(transform_matrices, local_matrices):
+    """
+    l_e^T . K_e . l_e of stacked elements in one batched product
+
+    Parameters
+    ----------
+    transform_matrices : ndarray
+        shape (no_elements, 12, 5), (no_elements, 6, 3) if planar
+    local_matrices : ndarray
+        shape (no_elements, 5, 5), (no_elements, 3, 3) if planar
+
+    Returns
+    -------
+    global_matrices : ndarray
+        shape (no_elements, 12, 12), (no_elements, 6, 6) if planar
+    """
+    return transform_matrices @ local_matrices @ transform_matrices.transpose(0, 2, 1)
+
+
+class GeometryTable:
+    """
+    geometry of all elements of a structure, built at initialize
+
+    Parameters
+    ----------
+    elements : iterable of FiberBeam
+    planar : bool
+
+    Attributes
+    ----------
+    element_ids : list
+    lengths, jacobians : ndarray
+        shape (no_elements,)
+    triads : ndarray
+        shape (no_elements, 3, 3)
+    transform_matrices : ndarray
+        shape (no_elements, 12, 5), (no_elements, 6, 3) if planar
+    """
+
+    def __init__(self, elements, planar=False):
+        self._geometries = {element.id: element_geometry(element) for element in elements}
+        self.element_ids = list(self._geometries)
+        geometries = self._geometries.values()
+        self.lengths = np.array([geometry.length for geometry in geometries])
+        self.jacobians = np.array([geometry.jacobian for geometry in geometries])
+        self.triads = np.array([geometry.triad for geometry in geometries]).reshape(-1, 3, 3)
+        self.transform_matrices = np.array(
+            [geometry.transform_matrix for geometry in geometries]
+        ).reshape((-1, 6, 3) if planar else (-1, 12, 5))
+
+    def __len__(self):
+        return len(self._geometries)
+
+    def get(self, element_id):
+        """ ElementGeometry of an element """
+        return self._geometries[element_id]
+
+    def global_matrices(self, local_matrices):
+        """ stacked local element matrices mapped to global coordinates """
+        return local_to_global(self.transform_matrices, local_matrices)
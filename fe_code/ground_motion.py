@@ -0,0 +1,109 @@
+"""
+Ground motion records
+=====================
+
+Ground accelerations are read lazily, so that long records are streamed to
+the dynamic analysis instead of being loaded at once. Plain text records have
+any number of values per line; PEER (.AT2) records carry the number of points
+and the time step in their header. Binary records (.npy) are memory-mapped.
+"""
+import itertools
+import os
+import re
+
+import numpy as np
+
+
+def read_record(path, skip_header=0, scale=1.0):
+    """
+    generator of the accelerations of a text file
+
+    Parameters
+    ----------
+    path : str
+    skip_header : int
+        number of header lines
+    scale : float
+        factor applied to every value, e.g. the gravity for records in g
+    """
+    with open(path) as rfile:
+        for line in itertools.islice(rfile, skip_header, None):
+            for value in line.split():
+                yield float(value) * scale
+
+
+def read_chunks(path, chunk_size=1000, skip_header=0, scale=1.0):
+    """ generator of arrays of at most chunk_size accelerations """
+    values = read_record(path, skip_header, scale)
+    while True:
+        chunk = np.fromiter(itertools.islice(values, chunk_size), dtype=float)
+        if not chunk.size:
+            return
+        yield chunk
+
+
+def read_at2_header(path):
+    """
+    number of points and time step of a PEER record
+
+    Returns
+    -------
+    no_points : int
+    dt : float
+    """
+    with open(path) as rfile:
+        header = "".join(itertools.islice(rfile, 4))
+    match = re.search(r"NPTS\s*=\s*(\d+)\s*,?\s*DT\s*=\s*([0-9.eE+-]+)", header)
+    if match is None:
+        raise ValueError(f"{path} has no PEER header with NPTS and DT")
+    return int(match.group(1)), float(match.group(2))
+
+
+def read_at2(path, scale=1.0):
+    """
+    PEER record
+
+    Returns
+    -------
+    dt : float
+    accelerations : generator
+    """
+    _, dt = read_at2_header(path)
+    return dt, read_record(path, skip_header=4, scale=scale)
+
+
+def read_npy_chunks(path, chunk_size=1000, scale=1.0):
+    """ generator of arrays of at most chunk_size accelerations of a memory-mapped .npy record """
+    values = np.load(path, mmap_mode="r")
+    for start in range(0, len(values), chunk_size):
+        yield np.asarray(values[start:start + chunk_size], dtype=float) * scale
+
+
+def open_record(path, dt=None, chunk_size=1000, scale=1.0):
+    """
+    chunked record of any supported format: PEER (.AT2), binary (.npy) or
+    plain text
+
+    Parameters
+    ----------
+    path : str
+    dt : float, optional
+        time step, required unless the record is a PEER record
+    chunk_size : int
+    scale : float
+
+    Returns
+    -------
+    dt : float
+    chunks : generator
+        arrays of at most chunk_size accelerations
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".at2":
+        _, dt = read_at2_header(path)
+        return dt, read_chunks(path, chunk_size, skip_header=4, scale=scale)
+    if dt is None:
+        raise ValueError(f"The time step of {path} has to be given")
+    if extension == ".npy":
+        return dt, read_npy_chunks(path, chunk_size, scale)
+    return dt, read_chunks(path, chunk_size, scale=scale)
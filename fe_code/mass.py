@@ -0,0 +1,88 @@
+"""
+Mass
+====
+
+Element mass matrices of the fiber beam elements from a mass per unit
+length. The lumped mass puts half of the element mass on the translations of
+each node, optionally with the rotational inertia of the HRZ lumping (the
+scaled diagonal of the consistent mass, m L^3 / 78 on the bending rotations);
+the consistent mass uses the linear axial and cubic (Hermitian) bending shape
+functions. Rotational inertia about the element axis is neglected since the
+elements have no torsional stiffness.
+"""
+import numpy as np
+
+from .geometry import PLANAR_DOFS
+
+
+def lumped_element_mass(length, triad, mass_per_length, planar=False, rotational_inertia=False):
+    """
+    diagonal of the lumped element mass matrix
+
+    Parameters
+    ----------
+    length : float
+    triad : ndarray
+        local axes as rows, see geometry.get_triad
+    mass_per_length : float
+    planar : bool
+    rotational_inertia : bool
+        add the inertia of the bending rotations, m L^3 / 78 about the local
+        axes e2 and e3
+
+    Returns
+    -------
+    masses : ndarray
+        shape (12,), (6,) if planar
+    """
+    half = mass_per_length * length / 2
+    inertia = mass_per_length * length ** 3 / 78 if rotational_inertia else 0.0
+    if planar:
+        return np.array([half, half, inertia, half, half, inertia])
+    # diagonal of triad^T diag(0, inertia, inertia) triad
+    rotations = inertia * (1 - np.asarray(triad)[0] ** 2)
+    return np.tile(np.concatenate(([half, half, half], rotations)), 2)
+
+
+def _local_consistent_mass(length, mass_per_length):
+    """ 12x12 consistent mass in the local axes, dofs (u, v, w, rx, ry, rz) per node """
+    l = length
+    mass = np.zeros((12, 12))
+    axial = mass_per_length * l / 6 * np.array([[2.0, 1.0], [1.0, 2.0]])
+    mass[np.ix_([0, 6], [0, 6])] = axial
+    bending = mass_per_length * l / 420 * np.array([
+        [156.0, 22 * l, 54.0, -13 * l],
+        [22 * l, 4 * l ** 2, 13 * l, -3 * l ** 2],
+        [54.0, 13 * l, 156.0, -22 * l],
+        [-13 * l, -3 * l ** 2, -22 * l, 4 * l ** 2],
+    ])
+    # bending in the local x-y plane: (v, rz)
+    mass[np.ix_([1, 5, 7, 11], [1, 5, 7, 11])] = bending
+    # bending in the local x-z plane: (w, -ry)
+    signs = np.array([1.0, -1.0, 1.0, -1.0])
+    mass[np.ix_([2, 4, 8, 10], [2, 4, 8, 10])] = bending * signs[:, None] * signs
+    return mass
+
+
+def consistent_element_mass(length, triad, mass_per_length, planar=False):
+    """
+    consistent element mass matrix in global coordinates
+
+    Parameters
+    ----------
+    length : float
+    triad : ndarray
+        local axes as rows, see geometry.get_triad
+    mass_per_length : float
+    planar : bool
+
+    Returns
+    -------
+    mass : ndarray
+        shape (12, 12), (6, 6) if planar
+    """
+    rotation = np.kron(np.eye(4), np.asarray(triad))
+    mass = rotation.T @ _local_consistent_mass(length, mass_per_length) @ rotation
+    if planar:
+        return mass[np.ix_(PLANAR_DOFS, PLANAR_DOFS)]
+    return mass
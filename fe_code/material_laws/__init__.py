@@ -3,7 +3,16 @@ Material Laws Module
 ====================
 """
 
-from .material import UniaxialIncrementalMaterial
-from .menegotto_pinto import MenegottoPinto
-from .kent_park import KentPark
+from .material import UniaxialIncrementalMaterial, UniaxialMaterialArray, MaterialObjects
+from .menegotto_pinto import MenegottoPinto, MenegottoPintoArray
+from .kent_park import KentPark, KentParkArray
 # from .kent_park_old import KentPark
+
+# array implementations of the scalar laws, used by the sections
+MATERIAL_ARRAYS = {KentPark: KentParkArray, MenegottoPinto: MenegottoPintoArray}
+
+
+def material_array_class(material):
+    """ array class which can hold the state of a scalar material object """
+    array_class = MATERIAL_ARRAYS.get(type(material), MaterialObjects)
+    return array_class if array_class.supports(material) else MaterialObjects
@@ -1,8 +1,10 @@
 """
-Module contains only KentParkMod class
+Module contains the KentPark material law
 """
 
-from .material import UniaxialIncrementalMaterial
+import numpy as np
+
+from .material import UniaxialIncrementalMaterial, UniaxialMaterialArray
 
 
 class KentPark(UniaxialIncrementalMaterial):
@@ -33,7 +35,12 @@ class KentPark(UniaxialIncrementalMaterial):
     strain : float
     """
 
+    STATE_VARIABLES = (
+        "_strain", "_stress", "_strain_min", "_strain_end", "_unload_slope", "_Et"
+    )
+
     def __init__(self, fc, Z, e0=0.002):
+        self._parameters = (fc, Z, e0)
 
         self._fc = fc
         self._strain_0 = e0
@@ -210,3 +217,140 @@ class KentPark(UniaxialIncrementalMaterial):
         self._c_strain_end = self._strain_end
         self._c_unload_slope = self._unload_slope
         self._c_Et = self._Et
+
+
+class KentParkArray(UniaxialMaterialArray):
+    """
+    KentPark law for many fibers, the branches of the scalar law are
+    evaluated for the subsets of fibers they apply to
+
+    Parameters
+    ----------
+    parameters : ndarray
+        rows (fc, Z, e0)
+    """
+
+    MATERIAL_CLASS = KentPark
+
+    def __init__(self, parameters):
+        super().__init__(parameters)
+        fc, Z, e0 = self._parameters.T
+        self._fc = -np.abs(fc)
+        self._strain_0 = -np.abs(e0)
+        self._strain_u = -(0.8 / np.abs(Z) + np.abs(e0))
+
+        Et0 = 2 * self._fc / self._strain_0
+        n = len(self)
+        self._strain = np.zeros(n)
+        self._stress = np.zeros(n)
+        self._strain_min = np.zeros(n)
+        self._strain_end = np.zeros(n)
+        self._unload_slope = Et0.copy()
+        self._Et = Et0.copy()
+
+        self._c_strain = np.zeros(n)
+        self._c_stress = np.zeros(n)
+        self._c_strain_min = np.zeros(n)
+        self._c_strain_end = np.zeros(n)
+        self._c_unload_slope = Et0.copy()
+        self._c_Et = Et0.copy()
+
+    def update_strain(self, fiber_strains):
+        """ set the new strains of all fibers, see KentPark.update_strain """
+        strain = self._strain = np.array(fiber_strains, dtype=float)
+
+        self._strain_min = self._c_strain_min.copy()
+        self._strain_end = self._c_strain_end.copy()
+        self._unload_slope = self._c_unload_slope.copy()
+        self._stress = self._c_stress.copy()
+        self._Et = self._c_Et.copy()
+
+        changed = np.abs(strain - self._c_strain) >= 1e-15
+        tension = changed & (strain > 0.0)
+        self._stress[tension] = 0.0
+        self._Et[tension] = 0.0
+
+        compressed = changed & ~tension
+        # further into compression
+        loading = compressed & (strain < self._c_strain)
+        if loading.any():
+            i = np.flatnonzero(loading)
+            stress_temp = (
+                self._c_stress[i] + self._unload_slope[i] * strain[i]
+                - self._unload_slope[i] * self._c_strain[i]
+            )
+            self._reload(i)
+            larger = stress_temp > self._stress[i]
+            self._stress[i[larger]] = stress_temp[larger]
+            self._Et[i[larger]] = self._unload_slope[i[larger]]
+        # towards tension
+        unloading = compressed & ~loading
+        if unloading.any():
+            closing = unloading & (strain < self._strain_end)
+            self._stress[closing] = self._c_stress[closing] + self._unload_slope[closing] * (
+                strain[closing] - self._c_strain[closing]
+            )
+            self._Et[closing] = self._unload_slope[closing]
+            opened = unloading & ~closing
+            self._stress[opened] = 0.0
+            self._Et[opened] = 0.0
+
+    def _reload(self, indices):
+        strain = self._strain[indices]
+        envelope = strain < self._strain_min[indices]
+        if envelope.any():
+            new_min = indices[envelope]
+            self._strain_min[new_min] = strain[envelope]
+            self._envelope(new_min)
+            self._unload(new_min)
+        if not envelope.all():
+            inside = indices[~envelope & (strain < self._strain_end[indices])]
+            self._Et[inside] = self._unload_slope[inside]
+            self._stress[inside] = self._Et[inside] * (
+                self._strain[inside] - self._strain_end[inside]
+            )
+            opened = indices[~envelope & (strain >= self._strain_end[indices])]
+            self._stress[opened] = 0.0
+            self._Et[opened] = 0.0
+
+    def _envelope(self, indices):
+        strain = self._strain[indices]
+        fc = self._fc[indices]
+        strain_0 = self._strain_0[indices]
+        strain_u = self._strain_u[indices]
+
+        ascending = strain > strain_0
+        i, eta = indices[ascending], strain[ascending] / strain_0[ascending]
+        self._stress[i] = fc[ascending] * (2 * eta - eta * eta)
+        E0 = 2 * fc[ascending] / strain_0[ascending]
+        self._Et[i] = E0 * (1.0 - eta)
+
+        softening = ~ascending & (strain >= strain_u)
+        i = indices[softening]
+        self._Et[i] = (fc[softening] - 0.2 * fc[softening]) / (
+            strain_0[softening] - strain_u[softening]
+        )
+        self._stress[i] = fc[softening] + self._Et[i] * (strain[softening] - strain_0[softening])
+
+        residual = ~ascending & ~softening
+        self._stress[indices[residual]] = 0.2 * fc[residual]
+        self._Et[indices[residual]] = 0.0
+
+    def _unload(self, indices):
+        strain_min = self._strain_min[indices]
+        strain_0 = self._strain_0[indices]
+        eta = strain_min / strain_0
+        ratio = np.where(eta < 2, 0.145 * eta * eta + 0.13 * eta, 0.707 * (eta - 2.0) + 0.834)
+        strain_end = ratio * strain_0
+
+        temp1 = strain_min - strain_end
+        E0 = 2 * self._fc[indices] / strain_0
+        stress = self._stress[indices]
+        temp2 = stress / E0
+        secant = temp1 <= temp2
+        i = indices[secant]
+        self._strain_end[i] = strain_min[secant] - temp1[secant]
+        self._unload_slope[i] = stress[secant] / temp1[secant]
+        i = indices[~secant]
+        self._strain_end[i] = strain_min[~secant] - temp2[~secant]
+        self._unload_slope[i] = E0[~secant]
@@ -1,15 +1,31 @@
 """
-Module contains the abstract class Material
+Module contains the abstract classes of the uniaxial materials
 """
 
+import copy
 from abc import ABC, abstractclassmethod
 
+import numpy as np
+
 
 class UniaxialIncrementalMaterial(ABC):
     """
     Material abstract class to be used in fiber-beam-column element
+
+    Attributes
+    ----------
+    STATE_VARIABLES : tuple
+        names of the trial state variables which describe the material history.
+        the converged counterpart of a variable "_x" is "_c_x" where it exists
     """
 
+    STATE_VARIABLES = ()
+
+    @property
+    def parameters(self):
+        """ constructor arguments, used to rebuild the material """
+        return self._parameters
+
     @abstractclassmethod
     def update_strain(self, fiber_strain):
         pass
@@ -21,3 +37,190 @@ class UniaxialIncrementalMaterial(ABC):
     @abstractclassmethod
     def finalize_load_step(self):
         pass
+
+    def get_state(self):
+        """
+        state variables packed in an array. only meaningful after
+        finalize_load_step, when the trial and converged states coincide
+        """
+        return np.array([getattr(self, name) for name in self.STATE_VARIABLES], dtype=float)
+
+    def set_state(self, values):
+        """ restore the trial and converged state from get_state """
+        for name, value in zip(self.STATE_VARIABLES, values):
+            setattr(self, name, value)
+            if hasattr(self, "_c" + name):
+                setattr(self, "_c" + name, value)
+
+
+class UniaxialMaterialArray(ABC):
+    """
+    a uniaxial material law evaluated for many fibers at once. the state
+    variables have the names of the scalar law (MATERIAL_CLASS) and hold one
+    value per fiber
+
+    Parameters
+    ----------
+    parameters : ndarray
+        constructor arguments of the scalar law, one row per fiber
+    """
+
+    MATERIAL_CLASS = None
+
+    def __init__(self, parameters):
+        self._parameters = np.array(parameters, dtype=float).reshape(len(parameters), -1)
+
+    def __len__(self):
+        return len(self._parameters)
+
+    @classmethod
+    def supports(cls, material):
+        """ True if the state of the scalar material can be represented """
+        return type(material) is cls.MATERIAL_CLASS
+
+    @classmethod
+    def from_materials(cls, materials):
+        """ array of the parameters and the trial and converged states of scalar materials """
+        array = cls([material.parameters for material in materials])
+        for name in array._state_names():
+            setattr(array, name, np.array([getattr(m, name) for m in materials], dtype=float))
+        return array
+
+    @classmethod
+    def concatenate(cls, arrays):
+        """ join several arrays of the same class """
+        array = cls(np.concatenate([a._parameters for a in arrays]))
+        for name in array._state_names():
+            setattr(array, name, np.concatenate([getattr(a, name) for a in arrays]))
+        return array
+
+    def take(self, indices):
+        """ array of a subset of the fibers, e.g. a material repeated for many fibers """
+        array = type(self)(self._parameters[indices])
+        for name in array._state_names():
+            setattr(array, name, getattr(self, name)[indices])
+        return array
+
+    def parameter_table(self):
+        """ unique (material class, parameters) and the row of every fiber """
+        table, rows = np.unique(self._parameters, axis=0, return_inverse=True)
+        return [(self.MATERIAL_CLASS, tuple(row)) for row in table.tolist()], rows.reshape(-1)
+
+    def material(self, index):
+        """ scalar material with the trial state of a fiber """
+        material = self.MATERIAL_CLASS(*self._parameters[index].tolist())
+        material.set_state(self.get_state()[index])
+        return material
+
+    @property
+    def tangent_modulus(self):
+        """ current tangent moduli """
+        return self._Et
+
+    @property
+    def stress(self):
+        """ current stresses """
+        return self._stress
+
+    @property
+    def strain(self):
+        """ current strains """
+        return self._strain
+
+    @abstractclassmethod
+    def update_strain(self, fiber_strains):
+        pass
+
+    def finalize_load_step(self):
+        """ update the converged variables """
+        for name in self.MATERIAL_CLASS.STATE_VARIABLES:
+            if hasattr(self, "_c" + name):
+                setattr(self, "_c" + name, getattr(self, name).copy())
+
+    def get_state(self):
+        """ state variables of the scalar law, one row per fiber """
+        names = self.MATERIAL_CLASS.STATE_VARIABLES
+        return np.column_stack([getattr(self, name) for name in names]).reshape(len(self), -1)
+
+    def set_state(self, values):
+        """ restore the trial and converged state from get_state """
+        for name, column in zip(self.MATERIAL_CLASS.STATE_VARIABLES, np.transpose(values)):
+            setattr(self, name, np.array(column, dtype=float))
+            if hasattr(self, "_c" + name):
+                setattr(self, "_c" + name, np.array(column, dtype=float))
+
+    def _state_names(self):
+        names = self.MATERIAL_CLASS.STATE_VARIABLES
+        return names + tuple("_c" + name for name in names if hasattr(self, "_c" + name))
+
+
+class MaterialObjects(UniaxialMaterialArray):
+    """
+    fallback for material laws without an array implementation, the fibers
+    keep one scalar material object each. all objects are of one class
+
+    Parameters
+    ----------
+    materials : list
+        UniaxialIncrementalMaterial objects
+    """
+
+    def __init__(self, materials):
+        self._materials = list(materials)
+        self.MATERIAL_CLASS = type(self._materials[0]) if self._materials else None
+
+    def __len__(self):
+        return len(self._materials)
+
+    @classmethod
+    def supports(cls, material):
+        return isinstance(material, UniaxialIncrementalMaterial)
+
+    @classmethod
+    def from_materials(cls, materials):
+        return cls(materials)
+
+    @classmethod
+    def concatenate(cls, arrays):
+        return cls([material for array in arrays for material in array._materials])
+
+    def take(self, indices):
+        return type(self)([copy.deepcopy(self._materials[i]) for i in indices])
+
+    def parameter_table(self):
+        table = dict()
+        rows = [
+            table.setdefault((type(m), tuple(float(p) for p in m.parameters)), len(table))
+            for m in self._materials
+        ]
+        return list(table), np.array(rows, dtype=int)
+
+    def material(self, index):
+        return self._materials[index]
+
+    @property
+    def tangent_modulus(self):
+        return np.array([material.tangent_modulus for material in self._materials], dtype=float)
+
+    @property
+    def stress(self):
+        return np.array([material.stress for material in self._materials], dtype=float)
+
+    @property
+    def strain(self):
+        return np.array([material.strain for material in self._materials], dtype=float)
+
+    def update_strain(self, fiber_strains):
+        for material, strain in zip(self._materials, fiber_strains.tolist()):
+            material.update_strain(strain)
+
+    def finalize_load_step(self):
+        for material in self._materials:
+            material.finalize_load_step()
+
+    def get_state(self):
+        return np.array([material.get_state() for material in self._materials], dtype=float)
+
+    def set_state(self, values):
+        for material, state in zip(self._materials, values):
+            material.set_state(state)
@@ -1,8 +1,10 @@
 """
-Module contains only MenegottoPinto class
+Module contains the MenegottoPinto material law
 """
 
-from .material import UniaxialIncrementalMaterial
+import numpy as np
+
+from .material import UniaxialIncrementalMaterial, UniaxialMaterialArray
 
 
 class MenegottoPinto(UniaxialIncrementalMaterial):
@@ -32,7 +34,13 @@ class MenegottoPinto(UniaxialIncrementalMaterial):
     strain : float
     """
 
+    STATE_VARIABLES = (
+        "_loading_index", "_strain_0", "_stress_0", "_strain_r", "_stress_r",
+        "_strain_plastic", "_strain_max", "_strain_min", "_strain", "_stress", "_Et",
+    )
+
     def __init__(self, E, b, fy, R0, a1, a2):
+        self._parameters = (E, b, fy, R0, a1, a2)
         self._E = E
         self._b = b
         self._R0 = R0
@@ -211,3 +219,128 @@ class MenegottoPinto(UniaxialIncrementalMaterial):
         self._c_strain_min = self._strain_min
         self._c_strain = self._strain
         self._c_stress = self._stress
+
+
+class MenegottoPintoArray(UniaxialMaterialArray):
+    """
+    MenegottoPinto law for many fibers, the loading index of every fiber
+    selects the branches of the scalar law. prestressed materials are not
+    supported
+
+    Parameters
+    ----------
+    parameters : ndarray
+        rows (E, b, fy, R0, a1, a2)
+    """
+
+    MATERIAL_CLASS = MenegottoPinto
+
+    def __init__(self, parameters):
+        super().__init__(parameters)
+        E, b, fy, R0, a1, a2 = self._parameters.T
+        self._E = E
+        self._b = b
+        self._R0 = R0
+        self._fy = fy
+        self._a1 = a1
+        self._a2 = a2
+
+        n = len(self)
+        self._loading_index = np.zeros(n)
+        self._Et = E.copy()
+        self._strain_0 = np.zeros(n)
+        self._stress_0 = np.zeros(n)
+        self._strain_r = np.zeros(n)
+        self._stress_r = np.zeros(n)
+        self._strain_plastic = np.zeros(n)
+        self._strain_max = fy / E
+        self._strain_min = -self._strain_max
+        self._strain = np.zeros(n)
+        self._stress = np.zeros(n)
+
+        self._c_loading_index = np.zeros(n)
+        self._c_strain_0 = np.zeros(n)
+        self._c_stress_0 = np.zeros(n)
+        self._c_strain_r = np.zeros(n)
+        self._c_stress_r = np.zeros(n)
+        self._c_strain_plastic = np.zeros(n)
+        self._c_strain_max = fy / E
+        self._c_strain_min = -self._c_strain_max
+        self._c_strain = np.zeros(n)
+        self._c_stress = np.zeros(n)
+
+    @classmethod
+    def supports(cls, material):
+        return super().supports(material) and material._stress_initial == 0
+
+    def update_strain(self, fiber_strains):
+        """ set the new strains of all fibers, see MenegottoPinto.update_strain """
+        fy = self._fy
+        E = self._E
+        b = self._b
+        E_inf = b * E
+        strain_y = fy / E
+
+        strain = self._strain = np.array(fiber_strains, dtype=float)
+        deps = strain - self._c_strain
+
+        self._strain_max = self._c_strain_max.copy()
+        self._strain_min = self._c_strain_min.copy()
+        self._strain_plastic = self._c_strain_plastic.copy()
+        self._strain_0 = self._c_strain_0.copy()
+        self._stress_0 = self._c_stress_0.copy()
+        self._strain_r = self._c_strain_r.copy()
+        self._stress_r = self._c_stress_r.copy()
+        self._loading_index = self._c_loading_index.copy()
+
+        # the stress and the tangent of fibers at rest keep their trial values
+        initial = (self._loading_index == 0) | (self._loading_index == 3)
+        at_rest = initial & (np.abs(deps) < 1e-15)
+        start = initial & ~at_rest
+        if start.any():
+            self._strain_max[start] = strain_y[start]
+            self._strain_min[start] = -strain_y[start]
+            for branch, index, sign, limit in (
+                    (start & (deps < 0), 2, -1.0, self._strain_min),
+                    (start & (deps >= 0), 1, 1.0, self._strain_max)):
+                self._loading_index[branch] = index
+                self._strain_0[branch] = limit[branch]
+                self._stress_0[branch] = sign * fy[branch]
+                self._strain_plastic[branch] = limit[branch]
+
+        for branch, index, sign in (
+                ((self._loading_index == 2) & (deps > 0), 1, 1.0),
+                ((self._loading_index == 1) & (deps < 0), 2, -1.0)):
+            if not branch.any():
+                continue
+            i = np.flatnonzero(branch)
+            self._loading_index[i] = index
+            self._strain_r[i] = self._c_strain[i]
+            self._stress_r[i] = self._c_stress[i]
+            if sign > 0:
+                self._strain_min[i] = np.minimum(self._strain_min[i], self._c_strain[i])
+            else:
+                self._strain_max[i] = np.maximum(self._strain_max[i], self._c_strain[i])
+            self._strain_0[i] = (
+                sign * fy[i] - sign * E_inf[i] * strain_y[i] - self._stress_r[i]
+                + E[i] * self._strain_r[i]
+            ) / (E[i] - E_inf[i])
+            self._stress_0[i] = sign * fy[i] + E_inf[i] * (self._strain_0[i] - sign * strain_y[i])
+            self._strain_plastic[i] = self._strain_max[i] if sign > 0 else self._strain_min[i]
+
+        if at_rest.all():
+            return
+        i = ~at_rest if at_rest.any() else slice(None)
+        strain_0, stress_0 = self._strain_0[i], self._stress_0[i]
+        strain_r, stress_r = self._strain_r[i], self._stress_r[i]
+        b = b[i]
+        xi = np.abs((self._strain_plastic[i] - strain_0) / strain_y[i])
+        R = self._R0[i] - self._a1[i] * xi / (self._a2[i] + xi)
+        eps_star = (strain[i] - strain_r) / (strain_0 - strain_r)
+        dum1 = 1.0 + (np.abs(eps_star)) ** R
+        dum2 = (dum1) ** (1.0 / R)
+        sg_star = b * eps_star + (1.0 - b) * eps_star / dum2
+        self._stress[i] = sg_star * (stress_0 - stress_r) + stress_r
+        Et = b + (1.0 - b) / (dum1 * dum2)
+        Et *= (stress_0 - stress_r) / (strain_0 - strain_r)
+        self._Et[i] = Et
@@ -0,0 +1,158 @@
+"""
+Modal analysis
+==============
+
+Natural frequencies and mode shapes of a structure with its current tangent
+stiffness, i.e. at the initial state or after any converged load step. The
+tangent of the free dofs (the equations without the fixed dofs) is assembled
+from the element stiffnesses as a sparse matrix and the lowest modes are
+found with the Lanczos method of scipy.sparse.linalg.eigsh in shift-invert
+mode, i.e. with a sparse factorization of the tangent shifted slightly below
+zero, so that a singular tangent at a limit point and a singular lumped mass
+are allowed. Without scipy, the massless dofs are condensed and a dense
+eigenvalue problem is solved.
+
+After cracking and crushing the tangent need not be positive definite. The
+eigenvalues closest to zero are returned in ascending order, non-positive
+eigenvalues have the circular frequency 0 and an infinite period.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .dynamics import free_dofs
+
+
+# shift of the shift-invert mode relative to the largest eigenvalue estimate
+SHIFT = 1e-8
+
+
+Modes = namedtuple("Modes", ["eigenvalues", "omegas", "periods", "shapes"])
+
+
+def _stiffness_entries(structure, free):
+    """ values, rows and columns of the element stiffnesses in the free dof numbering """
+    stiffness = structure.geometry.global_matrices(
+        np.array([element.local_stiffness_matrix for element in structure.elements])
+    )
+    positions = np.full(structure.no_dofs, -1)
+    positions[free] = np.arange(len(free))
+    indices = positions[structure.element_dof_indices]
+    rows = np.broadcast_to(indices[:, :, None], stiffness.shape).ravel()
+    columns = np.broadcast_to(indices[:, None, :], stiffness.shape).ravel()
+    keep = (rows >= 0) & (columns >= 0)
+    return stiffness.ravel()[keep], rows[keep], columns[keep]
+
+
+def _mass_matrix(structure, free, consistent_mass, rotational_inertia):
+    """ consistent mass matrix or diagonal of the lumped mass matrix of the free dofs """
+    if consistent_mass:
+        return structure.get_mass_matrix(consistent=True)[np.ix_(free, free)]
+    return structure.get_lumped_masses(rotational_inertia)[free]
+
+
+def _sparse_available():
+    try:
+        import scipy.sparse.linalg  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        return False
+    return True
+
+
+def _sparse_modes(entries, mass, no_modes):
+    # pylint: disable=import-outside-toplevel
+    from scipy.sparse import coo_matrix, csc_matrix, diags
+    from scipy.sparse.linalg import eigsh
+
+    values, rows, columns = entries
+    n = len(mass)
+    stiffness = coo_matrix((values, (rows, columns)), shape=(n, n)).tocsc()
+    masses = mass if mass.ndim == 1 else np.diag(mass)
+    if no_modes > np.count_nonzero(masses > 0):
+        raise ValueError(
+            f"{no_modes} modes requested, {np.count_nonzero(masses > 0)} dofs have a mass"
+        )
+    mass = diags(mass, format="csc") if mass.ndim == 1 else csc_matrix(mass)
+    # the tangent is indefinite after softening and the lumped mass can be
+    # singular, eigsh only needs K - sigma M to be regular. the Krylov space
+    # of (K - sigma M)^-1 M is limited by the rank of the mass matrix
+    sigma = -SHIFT * np.abs(stiffness.diagonal()).max() / masses.max()
+    ncv = min(n, max(2 * no_modes + 1, 20), np.count_nonzero(masses > 0))
+    return eigsh(stiffness, no_modes, mass, sigma=sigma, which="LM", ncv=ncv)
+
+
+def _dense_modes(entries, mass, no_modes):
+    values, rows, columns = entries
+    n = len(mass)
+    stiffness = np.zeros((n, n))
+    np.add.at(stiffness, (rows, columns), values)
+    if mass.ndim == 1:
+        mass = np.diag(mass)
+    massive = np.diag(mass) > 0
+    if no_modes > np.count_nonzero(massive):
+        raise ValueError(
+            f"{no_modes} modes requested, {np.count_nonzero(massive)} dofs have a mass"
+        )
+    # static condensation of the massless dofs
+    k_mm = stiffness[np.ix_(massive, massive)]
+    k_m0 = stiffness[np.ix_(massive, ~massive)]
+    k_00 = stiffness[np.ix_(~massive, ~massive)]
+    if k_00.size:
+        k_mm = k_mm - k_m0 @ np.linalg.solve(k_00, k_m0.T)
+    lower = np.linalg.cholesky(mass[np.ix_(massive, massive)])
+    symmetric = np.linalg.solve(lower, np.linalg.solve(lower, k_mm).T)
+    eigenvalues, vectors = np.linalg.eigh(symmetric)
+    shapes = np.zeros((n, no_modes))
+    shapes[massive] = np.linalg.solve(lower.T, vectors[:, :no_modes])
+    if k_00.size:
+        shapes[~massive] = -np.linalg.solve(k_00, k_m0.T @ shapes[massive])
+    return eigenvalues[:no_modes], shapes
+
+
+def modal_analysis(structure, no_modes=3, consistent_mass=False, rotational_inertia=False):
+    """
+    lowest modes of the structure with its current tangent stiffness, i.e.
+    the eigenvalues closest to zero. the fixed and the inactive dofs are
+    removed
+
+    Parameters
+    ----------
+    structure : Structure
+        at any converged load step, initialized if needed
+    no_modes : int
+    consistent_mass : bool
+        consistent or lumped element masses, the nodal masses are lumped
+    rotational_inertia : bool
+        include the rotational inertia in the lumped element masses
+
+    Returns
+    -------
+    modes : Modes
+        eigenvalues omega^2, circular frequencies and periods, shape
+        (no_modes,), and mass normalized mode shapes, shape (no_dofs, no_modes).
+        non-positive eigenvalues of a softened tangent have the circular
+        frequency 0 and an infinite period
+    """
+    if structure.stiffness_matrix is None:
+        structure.initialize()
+    free = free_dofs(structure)
+    entries = _stiffness_entries(structure, free)
+    mass = _mass_matrix(structure, free, consistent_mass, rotational_inertia)
+    masses = mass if mass.ndim == 1 else np.diag(mass)
+    if _sparse_available() and no_modes < np.count_nonzero(masses > 0):
+        eigenvalues, shapes = _sparse_modes(entries, mass, no_modes)
+    else:
+        eigenvalues, shapes = _dense_modes(entries, mass, no_modes)
+
+    order = np.argsort(eigenvalues)
+    eigenvalues, shapes = eigenvalues[order], shapes[:, order]
+    if mass.ndim == 1:
+        shapes /= np.sqrt(np.einsum("ik,i,ik->k", shapes, mass, shapes))
+    else:
+        shapes /= np.sqrt(np.einsum("ik,ij,jk->k", shapes, mass, shapes))
+    omegas = np.sqrt(np.maximum(eigenvalues, 0.0))
+    periods = np.full(no_modes, np.inf)
+    np.divide(2 * np.pi, omegas, out=periods, where=omegas > 0)
+    global_shapes = np.zeros((structure.no_dofs, no_modes))
+    global_shapes[free] = shapes
+    return Modes(eigenvalues, omegas, periods, global_shapes)
@@ -0,0 +1,253 @@
+"""
+Model files
+===========
+
+A structural model is stored as an npz file of flat arrays: nodes, elements,
+sections referring to deduplicated section templates (fiber y, z, area,
+width, height and material id), a material parameter table and the boundary
+conditions. Loading a model builds the structure directly from these arrays.
+"""
+import hashlib
+import importlib
+import inspect
+import os
+
+import numpy as np
+
+from .structure import Structure
+from .material_laws import KentPark, MenegottoPinto
+
+
+MODEL_FILE_VERSION = 5
+MATERIAL_TYPES = {"KentPark": KentPark, "MenegottoPinto": MenegottoPinto}
+MAX_MATERIAL_PARAMETERS = 6
+DEFAULT_CACHE_DIR = ".model_cache"
+# modules which build the sections of a model, part of the hash of a cached model
+MODEL_SOURCE_MODULES = (
+    ".section_builder", ".section", ".material_laws.material", ".material_laws.kent_park",
+    ".material_laws.menegotto_pinto",
+)
+
+
+def _get_template(section, material_table):
+    """ fiber arrays of a section, materials replaced by table ids """
+    materials, material_ids = section.fiber_materials()
+    table_ids = list()
+    for material_class, parameters in materials:
+        key = (material_class.__name__, tuple(float(p) for p in parameters))
+        if key[0] not in MATERIAL_TYPES:
+            raise TypeError(f"Material {key[0]} can not be stored in a model file")
+        table_ids.append(material_table.setdefault(key, len(material_table)))
+    return section.fiber_geometry.copy(), np.array(table_ids, dtype=int)[material_ids]
+
+
+def save_model(structure, path):
+    """
+    write a model file
+
+    Parameters
+    ----------
+    structure : Structure
+        a structure which is not yet initialized
+    path : str
+    """
+    material_table = dict()
+    templates = dict()
+    section_rows = list()
+    fiber_ids = list()
+    for element in structure.elements:
+        for section in element.sections:
+            geometry, material_ids = _get_template(section, material_table)
+            key = geometry.tobytes() + material_ids.tobytes()
+            template_id = templates.setdefault(key, (len(templates), geometry, material_ids))[0]
+            section_rows.append((element.id, section.id, template_id, section.tolerance))
+            fiber_ids.extend(section.fiber_ids)
+
+    templates = sorted(templates.values(), key=lambda template: template[0])
+    template_sizes = [len(geometry) for _, geometry, _ in templates]
+    geometry = np.concatenate([geometry for _, geometry, _ in templates])
+    material_parameters = np.full((len(material_table), MAX_MATERIAL_PARAMETERS), np.nan)
+    for (_, parameters), i in material_table.items():
+        material_parameters[i, :len(parameters)] = parameters
+
+    dirichlet = structure.dirichlet_conditions
+    neumann = structure.neumann_conditions
+    masses = structure.nodal_masses
+    with open(path, "wb") as wfile:
+        np.savez(
+            wfile,
+            version=MODEL_FILE_VERSION,
+            planar=structure.planar,
+            node_ids=np.array([node.id for node in structure.nodes], dtype=int),
+            node_coordinates=np.array(
+                [node.get_reference_location() for node in structure.nodes]
+            ).reshape(-1, 3),
+            element_ids=np.array([element.id for element in structure.elements], dtype=int),
+            element_nodes=np.array(
+                [[node.id for node in element.nodes] for element in structure.elements], dtype=int
+            ).reshape(-1, 2),
+            element_types=np.array(
+                [element.element_type for element in structure.elements], dtype=str
+            ),
+            element_integration=np.array(
+                [element.integration_scheme for element in structure.elements], dtype=str
+            ),
+            element_mass_per_length=np.array(
+                [element.mass_per_length for element in structure.elements], dtype=float
+            ),
+            section_element_ids=np.array([row[0] for row in section_rows], dtype=int),
+            section_ids=np.array([row[1] for row in section_rows], dtype=int),
+            section_templates=np.array([row[2] for row in section_rows], dtype=int),
+            section_tolerances=np.array([row[3] for row in section_rows], dtype=float),
+            fiber_ids=np.array(fiber_ids, dtype=int),
+            template_offsets=np.concatenate(([0], np.cumsum(template_sizes))).astype(int),
+            fiber_geometry=geometry,
+            fiber_materials=np.concatenate([ids for _, _, ids in templates]),
+            material_types=np.array([key[0] for key in material_table], dtype=str),
+            material_parameters=material_parameters,
+            dirichlet_nodes=np.array([dof.node_id for dof in dirichlet], dtype=int),
+            dirichlet_dofs=np.array([dof.type for dof in dirichlet], dtype=str),
+            dirichlet_values=np.array(list(dirichlet.values()), dtype=float),
+            neumann_nodes=np.array([dof.node_id for dof in neumann], dtype=int),
+            neumann_dofs=np.array([dof.type for dof in neumann], dtype=str),
+            neumann_values=np.array(list(neumann.values()), dtype=float),
+            mass_nodes=np.array([dof.node_id for dof in masses], dtype=int),
+            mass_dofs=np.array([dof.type for dof in masses], dtype=str),
+            mass_values=np.array(list(masses.values()), dtype=float),
+            controlled_dof=np.array(
+                [structure.controlled_dof.node_id, structure.controlled_dof.type], dtype=str
+            ),
+            tolerance=structure.get_tolerance(),
+        )
+
+
+def load_model(path):
+    """
+    build a structure from a model file
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    structure : Structure
+    """
+    with np.load(path) as data:
+        if int(data["version"]) != MODEL_FILE_VERSION:
+            raise ValueError(f"Unsupported model file version {int(data['version'])}")
+        data = dict(data)
+
+    stru = Structure(bool(data["planar"]))
+    for node_id, (x, y, z) in zip(data["node_ids"].tolist(), data["node_coordinates"].tolist()):
+        stru.add_node(node_id, x, y, z)
+    for element_id, (node1, node2), element_type, scheme, mass_per_length in zip(
+            data["element_ids"].tolist(), data["element_nodes"].tolist(),
+            data["element_types"].tolist(), data["element_integration"].tolist(),
+            data["element_mass_per_length"].tolist()):
+        stru.add_fiber_beam_element(element_id, node1, node2, element_type)
+        element = stru.get_element(element_id)
+        element.integration_scheme = scheme
+        element.mass_per_length = mass_per_length
+
+    # one material object per table row, the sections copy their state into fiber arrays
+    materials = [
+        MATERIAL_TYPES[name](*[p for p in row if not np.isnan(p)])
+        for name, row in zip(data["material_types"], data["material_parameters"].tolist())
+    ]
+    offsets = data["template_offsets"].tolist()
+    geometry = data["fiber_geometry"]
+    fiber_materials = data["fiber_materials"]
+    fiber_ids = data["fiber_ids"].tolist()
+
+    position = 0
+    for element_id, section_id, template_id, tolerance in zip(
+            data["section_element_ids"].tolist(), data["section_ids"].tolist(),
+            data["section_templates"].tolist(), data["section_tolerances"].tolist()):
+        element = stru.get_element(element_id)
+        element.add_section(section_id)
+        section = element.get_section(section_id)
+        section.tolerance = tolerance
+        start, stop = offsets[template_id], offsets[template_id + 1]
+        ys, zs, areas, ws, hs = geometry[start:stop].T
+        ids = fiber_ids[position:position + stop - start]
+        position += stop - start
+        section.add_fiber_arrays(
+            ids, ys, zs, areas, ws, hs, materials, fiber_materials[start:stop]
+        )
+
+    stru.set_tolerance(float(data["tolerance"]))
+    for node_id, dof_type, value in zip(
+            data["dirichlet_nodes"].tolist(), data["dirichlet_dofs"].tolist(),
+            data["dirichlet_values"].tolist()):
+        stru.add_dirichlet_condition(node_id, dof_type, value)
+    for node_id, dof_type, value in zip(
+            data["neumann_nodes"].tolist(), data["neumann_dofs"].tolist(),
+            data["neumann_values"].tolist()):
+        stru.add_neumann_condition(node_id, dof_type, value)
+    for node_id, dof_type, value in zip(
+            data["mass_nodes"].tolist(), data["mass_dofs"].tolist(), data["mass_values"].tolist()):
+        stru.add_nodal_mass(node_id, dof_type, value)
+    node_id, dof_type = data["controlled_dof"].tolist()
+    stru.set_controlled_dof(int(node_id), dof_type)
+    return stru
+
+
+def model_hash(builder, *args, **kwargs):
+    """
+    hash of the source of the module defining builder, of the section and
+    material modules (MODEL_SOURCE_MODULES) and of the arguments. other
+    modules the builder depends on are not part of the hash, the cache has
+    to be cleared by hand after changing them
+    """
+    modules = [inspect.getmodule(builder)] + [
+        importlib.import_module(name, __package__) for name in MODEL_SOURCE_MODULES
+    ]
+    source = "\n".join(inspect.getsource(module) for module in modules)
+    key = f"{source}\n{builder.__name__}\n{args!r}\n{sorted(kwargs.items())!r}"
+    key += f"\n{MODEL_FILE_VERSION}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def cached_model_path(builder, *args, cache_dir=DEFAULT_CACHE_DIR, **kwargs):
+    """
+    path of the cached model file of a builder, written if the builder's
+    module source, the section and material modules or the arguments changed
+    since the file was written, see model_hash
+
+    Parameters
+    ----------
+    builder : callable
+        returns a structure, e.g. models.column.model1_3
+    cache_dir : str
+        directory of the cached model files
+
+    Returns
+    -------
+    path : str
+    """
+    path = os.path.join(cache_dir, f"{builder.__name__}_{model_hash(builder, *args, **kwargs)}.npz")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        save_model(builder(*args, **kwargs), path)
+    return path
+
+
+def cached_model(builder, *args, cache_dir=DEFAULT_CACHE_DIR, **kwargs):
+    """
+    build a model through a model file cache. the builder only runs if its
+    module source, the section and material modules or the arguments changed
+    since the cached file was written, see model_hash
+
+    Parameters
+    ----------
+    builder : callable
+        returns a structure, e.g. models.column.model1_3
+    cache_dir : str
+        directory of the cached model files
+
+    Returns
+    -------
+    structure : Structure
+    """
+    return load_model(cached_model_path(builder, *args, cache_dir=cache_dir, **kwargs))
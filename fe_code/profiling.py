@@ -0,0 +1,236 @@
+"""
+Profiling
+=========
+
+Phase timers and call counters for the solver. Profiling works by wrapping
+the instrumented methods while it is enabled; when it is disabled the
+original methods are in place, so it costs nothing.
+
+    from fe_code import profiling
+    with profiling.profile() as profiler:
+        solution_loop(structure)
+    print(profiler.table())
+    print(profiler.step_table())
+"""
+import contextlib
+import functools
+import json
+import time
+from collections import defaultdict
+
+from .structure import Structure
+from .fiber_beam import FiberBeam
+from .displacement_beam import DisplacementFiberBeam
+from .section import Section
+from .material_laws import UniaxialIncrementalMaterial, UniaxialMaterialArray
+from .recorders import Recorder
+from .results import ResultWriter
+
+
+# (class, method, phase)
+INSTRUMENTED_METHODS = [
+    (Structure, "solve_NR_iteration", "nr_iteration"),
+    (Structure, "_update_stiffness_matrix", "assembly"),
+    (Structure, "_update_resisting_forces", "assembly"),
+    (Structure, "_solve_linear_system", "linear_solve"),
+    (Structure, "finalize_load_step", "finalize"),
+    (FiberBeam, "state_determination", "element_state_determination"),
+    (FiberBeam, "non_iterative_state_determination", "element_state_determination"),
+    (DisplacementFiberBeam, "state_determination", "element_state_determination"),
+    (Section, "state_determination", "section_state_determination"),
+    (Section, "deformation_state_determination", "section_state_determination"),
+    (Recorder, "record", "output"),
+    (ResultWriter, "write_row", "output"),
+]
+MATERIAL_PHASE = "material_update"
+
+_ACTIVE = None
+
+
+def _material_classes(*bases):
+    for cls in bases or (UniaxialIncrementalMaterial, UniaxialMaterialArray):
+        for subclass in cls.__subclasses__():
+            if "update_strain" in vars(subclass):
+                yield subclass
+            yield from _material_classes(subclass)
+
+
+class Profiler:
+    """
+    collects phase times and call counts
+
+    Parameters
+    ----------
+    trace : bool
+        keep every timed call as an event for export_trace. this is
+        expensive for the material phase and meant for short runs
+    """
+
+    def __init__(self, trace=False):
+        self._trace = trace
+        self._events = list()
+        self._stack = list()
+        self._origin = time.perf_counter()
+        self.inclusive = defaultdict(float)
+        self.exclusive = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._step_start = dict()
+        self.steps = list()
+
+    def start(self, phase):
+        self._stack.append([phase, time.perf_counter(), 0.0])
+
+    def stop(self, phase):
+        name, start, children = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self.inclusive[name] += elapsed
+        self.exclusive[name] += elapsed - children
+        self.calls[name] += 1
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        if self._trace:
+            self._events.append((name, start - self._origin, elapsed, len(self._stack)))
+
+    def end_step(self, load_step):
+        """ store the exclusive times and calls since the last step """
+        previous = self._step_start
+        self._step_start = {
+            phase: (self.exclusive[phase], self.calls[phase]) for phase in self.exclusive
+        }
+        self.steps.append({
+            "load_step": load_step,
+            "exclusive": {
+                phase: time_ - previous.get(phase, (0.0, 0))[0]
+                for phase, (time_, _) in self._step_start.items()
+            },
+            "calls": {
+                phase: calls - previous.get(phase, (0.0, 0))[1]
+                for phase, (_, calls) in self._step_start.items()
+            },
+        })
+
+    def table(self):
+        """ per-run breakdown as text """
+        total = sum(self.exclusive.values())
+        lines = [
+            f"{'phase':<30}{'calls':>10}{'inclusive [s]':>16}{'exclusive [s]':>16}{'share':>8}"
+        ]
+        for phase in sorted(self.exclusive, key=self.exclusive.get, reverse=True):
+            share = self.exclusive[phase] / total if total else 0.0
+            lines.append(
+                f"{phase:<30}{self.calls[phase]:>10}{self.inclusive[phase]:>16.4f}"
+                f"{self.exclusive[phase]:>16.4f}{share:>8.1%}"
+            )
+        return "\n".join(lines)
+
+    def step_table(self):
+        """ per-step breakdown of the exclusive times in ms as text """
+        phases = sorted(self.exclusive, key=self.exclusive.get, reverse=True)
+        lines = [f"{'step':>6}" + "".join(f"{phase[:14]:>16}" for phase in phases)]
+        for step in self.steps:
+            lines.append(f"{step['load_step']:>6}" + "".join(
+                f"{step['exclusive'].get(phase, 0.0) * 1e3:>16.3f}" for phase in phases
+            ))
+        return "\n".join(lines)
+
+    def summary(self):
+        """ per-run and per-step data as a dict """
+        return {
+            "inclusive": dict(self.inclusive),
+            "exclusive": dict(self.exclusive),
+            "calls": dict(self.calls),
+            "steps": self.steps,
+        }
+
+    def export_trace(self, path):
+        """
+        write the summary, and the events if tracing, as JSON. the
+        "traceEvents" entry can be opened in chrome://tracing or Perfetto
+        """
+        events = [
+            {"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6,
+             "pid": 0, "tid": 0, "args": {"depth": depth}}
+            for name, start, duration, depth in self._events
+        ]
+        with open(path, "w") as wfile:
+            json.dump({"traceEvents": events, "summary": self.summary()}, wfile)
+
+
+def _wrap(function, phase, profiler):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        profiler.start(phase)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.stop(phase)
+    return wrapper
+
+
+def _wrap_finalize(function, phase, profiler):
+    @functools.wraps(function)
+    def wrapper(structure, *args, **kwargs):
+        profiler.start(phase)
+        try:
+            return function(structure, *args, **kwargs)
+        finally:
+            profiler.stop(phase)
+            profiler.end_step(structure.load_step)
+    return wrapper
+
+
+def enable(trace=False):
+    """
+    start profiling
+
+    Returns
+    -------
+    profiler : Profiler
+    """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        raise RuntimeError("Profiling is already enabled")
+    profiler = Profiler(trace)
+    originals = list()
+    methods = INSTRUMENTED_METHODS + [
+        (cls, "update_strain", MATERIAL_PHASE) for cls in _material_classes()
+    ]
+    for cls, name, phase in methods:
+        original = vars(cls)[name]
+        originals.append((cls, name, original))
+        wrap = _wrap_finalize if name == "finalize_load_step" else _wrap
+        setattr(cls, name, wrap(original, phase, profiler))
+    _ACTIVE = (profiler, originals)
+    return profiler
+
+
+def disable():
+    """
+    stop profiling and restore the original methods
+
+    Returns
+    -------
+    profiler : Profiler
+    """
+    global _ACTIVE
+    if _ACTIVE is None:
+        return None
+    profiler, originals = _ACTIVE
+    for cls, name, original in originals:
+        setattr(cls, name, original)
+    _ACTIVE = None
+    return profiler
+
+
+def is_enabled():
+    return _ACTIVE is not None
+
+
+@contextlib.contextmanager
+def profile(trace=False):
+    """ profile the enclosed block """
+    profiler = enable(trace)
+    try:
+        yield profiler
+    finally:
+        disable()
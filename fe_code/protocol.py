@@ -0,0 +1,170 @@
+"""
+Load protocols
+==============
+
+Displacement protocols of the controlled dof. A protocol is a sequence of
+target displacements (peaks) which is compiled into an array of increments
+of the controlled dof, one per load step, so that the increment of a load
+step is looked up in constant time. Every segment between two targets is
+divided into steps of at most its step size, which hit the target exactly,
+or into steps of exactly the step size, which end within half a step of the
+target. Very long protocols can be streamed with `iter_increments` instead.
+"""
+import itertools
+import math
+
+import numpy as np
+
+
+def _step_sizes(step_size):
+    if np.ndim(step_size) == 0:
+        return itertools.repeat(float(step_size))
+    return iter(step_size)
+
+
+def _segment(position, target, step_size, hit_peaks):
+    """ increments from position to target """
+    distance = target - position
+    if hit_peaks:
+        no_steps = math.ceil(abs(distance) / step_size - 1e-9)
+        return np.full(no_steps, distance / no_steps if no_steps else 0.0)
+    return np.full(round(abs(distance) / step_size), math.copysign(step_size, distance))
+
+
+def _segments(targets, step_size, hit_peaks, start):
+    """ generator of the increment arrays of the segments """
+    position = start
+    for target, size in zip(targets, _step_sizes(step_size)):
+        increments = _segment(position, target, size, hit_peaks)
+        position = target if hit_peaks else position + increments.sum()
+        yield increments
+
+
+def iter_increments(targets, step_size, hit_peaks=True, start=0.0):
+    """
+    generator of the increments of a protocol, computed segment by segment
+
+    Parameters
+    ----------
+    targets : iterable
+        target displacements, e.g. a generator
+    step_size : float or iterable
+        maximum increment, or one per segment
+    hit_peaks : bool
+        steps of at most step_size which hit every target exactly, otherwise
+        steps of exactly step_size
+    start : float
+        displacement at the start of the protocol
+    """
+    for increments in _segments(targets, step_size, hit_peaks, start):
+        yield from increments.tolist()
+
+
+def cyclic_targets(amplitudes, cycles=1):
+    """ generator of the peaks of full cycles +a, -a with cycles cycles per amplitude """
+    for amplitude in amplitudes:
+        for _ in range(cycles):
+            yield amplitude
+            yield -amplitude
+
+
+def read_targets(path, column=0, skip_header=1, delimiter=",", scale=1.0):
+    """ generator of the target displacements in a column of a csv file, e.g. ex1exper.csv """
+    with open(path) as rfile:
+        for line in itertools.islice(rfile, skip_header, None):
+            if line.strip():
+                yield float(line.split(delimiter)[column]) * scale
+
+
+class LoadProtocol:
+    """
+    precomputed increments of the controlled dof
+
+    Parameters
+    ----------
+    increments : array_like
+        increment of every load step, load step k (k >= 1) uses increments[k - 1]
+    segment_ends : array_like, optional
+        number of load steps at the end of every segment, i.e. at the targets
+    start : float
+        displacement at the start of the protocol
+    """
+
+    def __init__(self, increments, segment_ends=None, start=0.0):
+        self._increments = np.asarray(increments, dtype=float)
+        if segment_ends is None:
+            segment_ends = [len(self._increments)]
+        self._segment_ends = np.asarray(segment_ends, dtype=int)
+        self._displacements = start + np.cumsum(self._increments)
+
+    @classmethod
+    def from_targets(cls, targets, step_size, hit_peaks=True, start=0.0):
+        """
+        protocol through a sequence of target displacements
+
+        Parameters
+        ----------
+        targets : iterable
+            target displacements, e.g. a list, cyclic_targets or read_targets
+        step_size : float or iterable
+            maximum increment, or one per segment
+        hit_peaks : bool
+            steps of at most step_size which hit every target exactly,
+            otherwise steps of exactly step_size
+        start : float
+        """
+        segments = list(_segments(targets, step_size, hit_peaks, start))
+        if not segments:
+            return cls(np.zeros(0), [], start)
+        return cls(np.concatenate(segments), np.cumsum([len(s) for s in segments]), start)
+
+    @classmethod
+    def from_boundaries(cls, step_size, boundaries):
+        """
+        cyclic protocol of steps of +-step_size which starts positive and
+        changes its direction at the load step boundaries, e.g. of
+        disp_calc.calculate_loadsteps. the last boundary ends the protocol
+        """
+        steps = np.arange(1, boundaries[-1])
+        directions = np.where(np.searchsorted(boundaries, steps, side="right") % 2, -1.0, 1.0)
+        return cls(step_size * directions, np.asarray(boundaries) - 1)
+
+    @classmethod
+    def from_csv(cls, path, step_size, column=0, skip_header=1, delimiter=",", scale=1.0,
+                 **kwargs):
+        """ protocol through the targets of a csv column, see read_targets and from_targets """
+        targets = read_targets(path, column, skip_header, delimiter, scale)
+        return cls.from_targets(targets, step_size, **kwargs)
+
+    def __len__(self):
+        return len(self._increments)
+
+    def __iter__(self):
+        return iter(self._increments.tolist())
+
+    @property
+    def increments(self):
+        """ increments of all load steps """
+        return self._increments
+
+    @property
+    def displacements(self):
+        """ displacement at the end of every load step """
+        return self._displacements
+
+    @property
+    def segment_ends(self):
+        """ number of load steps at the end of every segment """
+        return self._segment_ends
+
+    def increment(self, load_step):
+        """ controlled dof increment of a load step, starting at 1 """
+        return float(self._increments[load_step - 1])
+
+    def displacement(self, load_step):
+        """ displacement at the end of a load step """
+        return float(self._displacements[load_step - 1])
+
+    def segment(self, load_step):
+        """ index of the segment of a load step """
+        return int(np.searchsorted(self._segment_ends, load_step))
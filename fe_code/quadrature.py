@@ -0,0 +1,177 @@
+"""
+Quadrature rules on [-1, 1]
+===========================
+
+Integration points and weights for the sections of the fiber beam elements.
+The rules are computed once per size and shared by all elements; the
+returned arrays are read-only.
+
+Gauss-Lobatto and Gauss-Radau nodes are found by Newton iterations on the
+Legendre three-term recurrence, which is stable for any number of points.
+Gauss-Legendre rules are taken from numpy.
+"""
+import functools
+
+import numpy as np
+
+
+def _legendre(x, degree):
+    """ Legendre polynomials of degree `degree` and `degree - 1` at x """
+    p_prev = np.ones_like(x)
+    p = x.copy()
+    for k in range(2, degree + 1):
+        p_prev, p = p, ((2 * k - 1) * x * p - (k - 1) * p_prev) / k
+    return p, p_prev
+
+
+def _read_only(*arrays):
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+def _check_num(num, minimum):
+    if not isinstance(num, (int, np.integer)):
+        raise ValueError(f"Value must be of type int. given type: {type(num)}")
+    if num < minimum:
+        raise ValueError(f"num has to be at least {minimum}")
+    return int(num)
+
+
+@functools.lru_cache(maxsize=None)
+def _gauss_lobatto(num):
+    degree = num - 1
+    # Chebyshev-Gauss-Lobatto points as initial guess
+    x = np.cos(np.pi * np.arange(num) / degree)[::-1].copy()
+    for _ in range(100):
+        p, p_prev = _legendre(x, degree)
+        dx = (x * p - p_prev) / (num * p)
+        x -= dx
+        if np.max(np.abs(dx)) < 1e-15:
+            break
+    x[0], x[-1] = -1.0, 1.0
+    p, _ = _legendre(x, degree)
+    w = 2 / (degree * num * p ** 2)
+    return _read_only(x, w)
+
+
+def gauss_lobatto(num):
+    """
+    Gauss-Lobatto rule, including both end points
+
+    Parameters
+    ----------
+    num : int
+        number of points, at least 2
+
+    Returns
+    -------
+    x, w : ndarray
+        points and weights
+    """
+    return _gauss_lobatto(_check_num(num, 2))
+
+
+@functools.lru_cache(maxsize=None)
+def _gauss_radau(num):
+    if num == 1:
+        return _read_only(np.array([-1.0]), np.array([2.0]))
+    x = -np.cos(2 * np.pi * np.arange(num) / (2 * num - 1))
+    free = x[1:]
+    for _ in range(100):
+        p_num, p_prev = _legendre(free, num)
+        dx = (1 - free) / num * (p_prev + p_num) / (p_prev - p_num)
+        free -= dx
+        if np.max(np.abs(dx)) < 1e-15:
+            break
+    _, p_prev = _legendre(free, num)
+    w = np.empty(num)
+    w[0] = 2 / num ** 2
+    w[1:] = (1 - free) / (num * p_prev) ** 2
+    x[0] = -1.0
+    return _read_only(x, w)
+
+
+def gauss_radau(num):
+    """
+    Gauss-Radau rule, including the end point -1 (the first node)
+
+    Parameters
+    ----------
+    num : int
+        number of points, at least 1
+
+    Returns
+    -------
+    x, w : ndarray
+        points and weights
+    """
+    return _gauss_radau(_check_num(num, 1))
+
+
+@functools.lru_cache(maxsize=None)
+def _gauss_legendre(num):
+    x, w = np.polynomial.legendre.leggauss(num)
+    return _read_only(x, w)
+
+
+def gauss_legendre(num):
+    """
+    Gauss-Legendre rule without the end points, the usual rule of
+    displacement-based elements
+
+    Parameters
+    ----------
+    num : int
+        number of points, at least 1
+
+    Returns
+    -------
+    x, w : ndarray
+        points and weights
+    """
+    return _gauss_legendre(_check_num(num, 1))
+
+
+@functools.lru_cache(maxsize=None)
+def _newton_cotes(num):
+    x = np.linspace(-1.0, 1.0, num)
+    powers = np.arange(num)
+    moments = np.where(powers % 2 == 0, 2.0 / (powers + 1), 0.0)
+    w = np.linalg.solve(np.vander(x, increasing=True).T, moments)
+    return _read_only(x, w)
+
+
+def newton_cotes(num):
+    """
+    closed Newton-Cotes rule with equally spaced points. the weights become
+    negative for more than 8 points
+
+    Parameters
+    ----------
+    num : int
+        number of points, at least 2
+
+    Returns
+    -------
+    x, w : ndarray
+        points and weights
+    """
+    return _newton_cotes(_check_num(num, 2))
+
+
+QUADRATURE_RULES = {
+    "gauss_lobatto": gauss_lobatto,
+    "gauss_radau": gauss_radau,
+    "gauss_legendre": gauss_legendre,
+    "newton_cotes": newton_cotes,
+}
+
+
+def integration_points(scheme, num):
+    """ points and weights of a named quadrature rule """
+    if scheme not in QUADRATURE_RULES:
+        raise ValueError(
+            f"Unknown integration scheme {scheme}. Use one of {list(QUADRATURE_RULES)}"
+        )
+    return QUADRATURE_RULES[scheme](num)
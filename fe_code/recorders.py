@@ -0,0 +1,311 @@
+"""
+Recorders
+=========
+
+Recorders collect selected response quantities after every converged load
+step. Rows are kept in a fixed size buffer; a recorder with a file name
+flushes the full buffer in one batch to a binary result file, a recorder
+without one keeps the latest rows only (ring buffer). The result file is
+opened at the first flush, so that a restart from a checkpoint continues an
+existing file (`resume`).
+"""
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from .results import ResultReader, ResultWriter
+
+
+SECTION_FORCE_COMPONENTS = ("mz", "my", "n")
+SECTION_DEFORMATION_COMPONENTS = ("kz", "ky", "eps")
+BASIC_FORCE_COMPONENTS = ("q1", "q2", "q3", "q4", "q5")
+PLANAR_SECTION_FORCE_COMPONENTS = ("my", "n")
+PLANAR_SECTION_DEFORMATION_COMPONENTS = ("ky", "eps")
+PLANAR_BASIC_FORCE_COMPONENTS = ("q1", "q2", "q3")
+
+
+class Recorder(ABC):
+    """
+    Recorder abstract class
+
+    Parameters
+    ----------
+    filename : str, optional
+        binary result file. the rows stay in memory if not given
+    every : int
+        record every k-th load step
+    on_reversal : bool
+        record only the last step before the controlled dof reverses
+    buffer_size : int
+        number of rows kept in memory before flushing
+    """
+
+    def __init__(self, filename=None, every=1, on_reversal=False, buffer_size=1000):
+        if every < 1:
+            raise ValueError("every must be a positive integer")
+        self._filename = filename
+        self._every = every
+        self._on_reversal = on_reversal
+        self._buffer_size = buffer_size
+
+        self._columns = None
+        self._writer = None
+        self._keep_rows = None
+        self._buffer = None
+        self._no_rows = 0
+        self._no_buffered = 0
+        self._direction = 0.0
+        self._previous_row = None
+
+    @property
+    def columns(self):
+        """ column keys, the first column is the load step """
+        return self._columns
+
+    @abstractmethod
+    def _get_columns(self, structure):
+        pass
+
+    @abstractmethod
+    def _get_values(self, structure):
+        pass
+
+    def initialize(self, structure):
+        """ allocate the buffer, the result file is opened at the first flush """
+        self._close_writer()
+        self._columns = [("step", None, None)] + list(self._get_columns(structure))
+        self._buffer = np.zeros((self._buffer_size, len(self._columns)))
+        self._keep_rows = None
+        self._no_rows = 0
+        self._no_buffered = 0
+        self._direction = 0.0
+        self._previous_row = None
+        self._store(self._get_row(structure))
+
+    def resume(self, structure):
+        """
+        continue after a restart from a checkpoint: the rows of an existing
+        result file up to the load step of the structure are kept and the
+        new rows are appended after them
+        """
+        self._close_writer()
+        self._no_rows = 0
+        self._no_buffered = 0
+        self._direction = np.sign(structure.controlled_dof_increment)
+        self._previous_row = self._get_row(structure)
+        if self._filename is not None and os.path.exists(self._filename):
+            steps = np.array(ResultReader(self._filename).get("step"))
+            self._keep_rows = int(np.searchsorted(steps, structure.load_step, side="right"))
+            self._no_rows = self._keep_rows
+        else:
+            self._keep_rows = None
+            self._store(self._get_row(structure))
+
+    def record(self, structure):
+        """ called by the structure after a converged load step """
+        if self._on_reversal:
+            direction = np.sign(structure.controlled_dof_increment)
+            if self._direction * direction < 0:
+                self._store(self._previous_row)
+            if direction != 0:
+                self._direction = direction
+            self._previous_row = self._get_row(structure)
+        elif structure.load_step % self._every == 0:
+            self._store(self._get_row(structure))
+
+    def get_history(self):
+        """
+        rows in memory in chronological order. for a recorder with a file
+        these are the rows written since the last flush
+        """
+        if self._no_buffered < self._buffer_size:
+            return self._buffer[:self._no_buffered].copy()
+        start = self._no_rows % self._buffer_size
+        return np.roll(self._buffer, -start, axis=0)
+
+    def flush(self):
+        """ write buffered rows to the result file """
+        if self._filename is None or self._no_buffered == 0:
+            return
+        if self._writer is None:
+            self._writer = ResultWriter(self._filename, self._columns, keep_rows=self._keep_rows)
+        self._writer.write_rows(self._buffer[:self._no_buffered])
+        self._writer.flush()
+        self._no_buffered = 0
+
+    def close(self):
+        """
+        flush and close the result file. a recorder on reversals stores the
+        last recorded step first, it ends the last half cycle
+        """
+        if self._on_reversal and self._previous_row is not None:
+            self._store(self._previous_row)
+            self._previous_row = None
+        self.flush()
+        self._close_writer()
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _get_row(self, structure):
+        return np.concatenate(([structure.load_step], self._get_values(structure)))
+
+    def _store(self, row):
+        if self._filename is not None:
+            self._buffer[self._no_buffered] = row
+            self._no_buffered += 1
+            if self._no_buffered == self._buffer_size:
+                self.flush()
+        else:
+            self._buffer[self._no_rows % self._buffer_size] = row
+            self._no_buffered = min(self._no_buffered + 1, self._buffer_size)
+        self._no_rows += 1
+
+
+class NodeRecorder(Recorder):
+    """
+    records nodal displacements and resisting forces
+
+    Parameters
+    ----------
+    node_ids : list
+    dof_types : str
+        e.g. "uw", all dofs of the structure by default
+    quantities : tuple
+        any of "disp" and "force"
+    """
+
+    def __init__(self, node_ids, dof_types=None, quantities=("disp", "force"), **kwargs):
+        super().__init__(**kwargs)
+        self._node_ids = list(node_ids)
+        self._dof_types = dof_types
+        self._quantities = quantities
+        self._indices = None
+
+    def _get_columns(self, structure):
+        dof_types = structure.dof_types if self._dof_types is None else self._dof_types
+        keys = [(node_id, dof) for node_id in self._node_ids for dof in dof_types]
+        self._indices = [structure.get_dof_index((node_id, dof)) for node_id, dof in keys]
+        return [(quantity, node_id, dof) for quantity in self._quantities for node_id, dof in keys]
+
+    def _get_values(self, structure):
+        vectors = {"disp": structure.get_displacements, "force": structure.get_forces}
+        return np.concatenate([vectors[quantity]()[self._indices] for quantity in self._quantities])
+
+
+class ElementRecorder(Recorder):
+    """
+    records the basic (local) resisting forces of elements
+
+    Parameters
+    ----------
+    element_ids : list
+    """
+
+    def __init__(self, element_ids, **kwargs):
+        super().__init__(**kwargs)
+        self._element_ids = list(element_ids)
+        self._elements = None
+
+    def _get_columns(self, structure):
+        self._elements = [structure.get_element(element_id) for element_id in self._element_ids]
+        return [
+            ("basic_force", element.id, component)
+            for element in self._elements
+            for component in (
+                PLANAR_BASIC_FORCE_COMPONENTS if element.planar else BASIC_FORCE_COMPONENTS
+            )
+        ]
+
+    def _get_values(self, structure):
+        return np.concatenate([element.resisting_forces for element in self._elements])
+
+
+class SectionRecorder(Recorder):
+    """
+    records section forces and deformations (moment-curvature)
+
+    Parameters
+    ----------
+    element_id : int
+    section_ids : list
+    quantities : tuple
+        any of "force" and "deformation"
+    """
+
+    def __init__(self, element_id, section_ids, quantities=("force", "deformation"), **kwargs):
+        super().__init__(**kwargs)
+        self._element_id = element_id
+        self._section_ids = list(section_ids)
+        self._quantities = quantities
+        self._sections = None
+
+    def _get_columns(self, structure):
+        element = structure.get_element(self._element_id)
+        self._sections = [element.get_section(section_id) for section_id in self._section_ids]
+        if element.planar:
+            components = {
+                "force": PLANAR_SECTION_FORCE_COMPONENTS,
+                "deformation": PLANAR_SECTION_DEFORMATION_COMPONENTS,
+            }
+        else:
+            components = {
+                "force": SECTION_FORCE_COMPONENTS,
+                "deformation": SECTION_DEFORMATION_COMPONENTS,
+            }
+        return [
+            (quantity, section_id, component)
+            for quantity in self._quantities
+            for section_id in self._section_ids
+            for component in components[quantity]
+        ]
+
+    def _get_values(self, structure):
+        values = {
+            "force": lambda section: section.forces,
+            "deformation": lambda section: section.deformations,
+        }
+        return np.concatenate([
+            values[quantity](section)
+            for quantity in self._quantities
+            for section in self._sections
+        ])
+
+
+class FiberRecorder(Recorder):
+    """
+    records fiber stresses and strains
+
+    Parameters
+    ----------
+    element_id : int
+    section_id : int
+    fiber_ids : list
+    """
+
+    def __init__(self, element_id, section_id, fiber_ids, **kwargs):
+        super().__init__(**kwargs)
+        self._element_id = element_id
+        self._section_id = section_id
+        self._fiber_ids = list(fiber_ids)
+        self._section = None
+        self._indices = None
+
+    def _get_columns(self, structure):
+        section = structure.get_element(self._element_id).get_section(self._section_id)
+        positions = {fiber_id: i for i, fiber_id in enumerate(section.fiber_ids)}
+        self._section = section
+        self._indices = np.array([positions[fiber_id] for fiber_id in self._fiber_ids], dtype=int)
+        return [
+            (quantity, fiber_id, None)
+            for quantity in ("stress", "strain")
+            for fiber_id in self._fiber_ids
+        ]
+
+    def _get_values(self, structure):
+        stresses = self._section.fiber_stresses[self._indices]
+        strains = self._section.fiber_strains[self._indices]
+        return np.concatenate([stresses, strains])
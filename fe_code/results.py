@@ -0,0 +1,296 @@
+"""
+Module contains the binary result store
+=======================================
+
+Results are written as a small JSON header followed by float64 rows, one row
+per recorded load step. The reader memory-maps the rows, so querying a single
+curve does not load the whole file into memory.
+"""
+import json
+import os
+import struct
+from collections import Counter
+
+import numpy as np
+
+
+MAGIC = b"FBCRES01"
+DTYPE = np.dtype("<f8")
+HEADER_ALIGNMENT = 64
+STRUCTURE_DOF_TYPES = "uvwxyz"
+
+
+def structure_columns(node_ids, dof_types=STRUCTURE_DOF_TYPES):
+    """
+    columns of the displacement and resisting force vectors of a structure,
+    in the same order as `Structure.get_displacements()` and `get_forces()`
+    """
+    columns = [("disp", node_id, dof) for node_id in node_ids for dof in dof_types]
+    columns += [("force", node_id, dof) for node_id in node_ids for dof in dof_types]
+    return columns
+
+
+def _normalize_column(column):
+    if isinstance(column, str):
+        return (column, None, None)
+    quantity, node_id, dof = column
+    return (str(quantity), None if node_id is None else int(node_id), dof)
+
+
+class ResultWriter:
+    """
+    Writes results row by row to a binary result file
+
+    Parameters
+    ----------
+    path : str
+        file path
+    columns : list
+        column keys as tuples (quantity, node_id, dof_type) or plain names
+    metadata : dict, optional
+        JSON serializable data stored in the header
+    keep_rows : int, optional
+        continue an existing file with the same columns after its first
+        keep_rows rows, e.g. after a restart from a checkpoint. the later
+        rows are removed and the header is kept
+    """
+
+    def __init__(self, path, columns, metadata=None, keep_rows=None):
+        self._path = path
+        self._columns = [_normalize_column(column) for column in columns]
+        if len(set(self._columns)) != len(self._columns):
+            raise ValueError("Result columns must be unique")
+        if keep_rows is None:
+            self._file = open(path, "wb")
+            self._write_header(metadata or dict())
+        else:
+            self._file = self._open_existing(keep_rows)
+
+    @classmethod
+    def for_structure(cls, path, structure, metadata=None, keep_rows=None):
+        """ writer for the nodal displacements and resisting forces of a structure """
+        node_ids = [node.id for node in structure.nodes]
+        return cls(path, structure_columns(node_ids, structure.dof_types), metadata, keep_rows)
+
+    @property
+    def columns(self):
+        """ column keys """
+        return self._columns
+
+    def write_row(self, values):
+        """ append one row """
+        row = np.asarray(values, dtype=DTYPE).ravel()
+        if row.size != len(self._columns):
+            raise ValueError(f"Expected {len(self._columns)} values, got {row.size}")
+        self._file.write(row.tobytes())
+
+    def write_rows(self, values):
+        """ append a block of rows """
+        rows = np.asarray(values, dtype=DTYPE)
+        if rows.ndim != 2 or rows.shape[1] != len(self._columns):
+            raise ValueError(f"Expected rows with {len(self._columns)} columns")
+        self._file.write(np.ascontiguousarray(rows).tobytes())
+
+    def write_structure(self, structure):
+        """ append the converged displacements and the resisting forces """
+        self.write_row(np.concatenate((structure.get_displacements(), structure.get_forces())))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _open_existing(self, keep_rows):
+        """ open an existing file truncated to keep_rows rows for appending """
+        reader = ResultReader(self._path)
+        if reader.columns != self._columns:
+            raise ValueError(f"{self._path} has different result columns")
+        if reader.no_steps < keep_rows:
+            raise ValueError(f"{self._path} has {reader.no_steps} rows, {keep_rows} are needed")
+        size = reader.offset + keep_rows * len(self._columns) * DTYPE.itemsize
+        rfile = open(self._path, "r+b")
+        rfile.truncate(size)
+        rfile.seek(size)
+        return rfile
+
+    def _write_header(self, metadata):
+        header = json.dumps({"columns": self._columns, "metadata": metadata}).encode()
+        length = len(MAGIC) + 4 + len(header)
+        padding = -length % HEADER_ALIGNMENT
+        header += b" " * padding
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+
+class ResultReader:
+    """
+    Memory-mapped view on a binary result file
+
+    Values are queried by column key and step range, e.g.
+    ``result["disp", 2, "w"]`` or ``result["force", 1, "y", 100:200]``.
+    A bare quantity name returns all columns of that quantity.
+
+    Parameters
+    ----------
+    path : str
+        file path
+    """
+
+    def __init__(self, path):
+        self._path = path
+        with open(path, "rb") as rfile:
+            if rfile.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a binary result file")
+            (length,) = struct.unpack("<I", rfile.read(4))
+            header = json.loads(rfile.read(length).decode())
+        self._offset = len(MAGIC) + 4 + length
+        self._columns = [_normalize_column(column) for column in header["columns"]]
+        self._index = {column: i for i, column in enumerate(self._columns)}
+        self.metadata = header["metadata"]
+        self._data = None
+
+    @property
+    def columns(self):
+        """ column keys """
+        return self._columns
+
+    @property
+    def offset(self):
+        """ size of the header in bytes """
+        return self._offset
+
+    @property
+    def no_steps(self):
+        """ number of complete rows in the file """
+        row_size = len(self._columns) * DTYPE.itemsize
+        return (os.path.getsize(self._path) - self._offset) // row_size
+
+    @property
+    def data(self):
+        """ memory-mapped array of shape (no_steps, no_columns) """
+        no_steps = self.no_steps
+        if self._data is None or self._data.shape[0] != no_steps:
+            if no_steps == 0:
+                return np.empty((0, len(self._columns)), dtype=DTYPE)
+            self._data = np.memmap(
+                self._path, dtype=DTYPE, mode="r", offset=self._offset,
+                shape=(no_steps, len(self._columns)),
+            )
+        return self._data
+
+    def __len__(self):
+        return self.no_steps
+
+    def column_index(self, quantity, node=None, dof=None):
+        """ index of a column """
+        key = (quantity, node, dof)
+        if key not in self._index:
+            raise KeyError(f"No result column {key}")
+        return self._index[key]
+
+    def column_indices(self, quantity, node=None, dof=None):
+        """ indices of all columns matching the given (partial) key """
+        indices = [
+            i for i, (c_quantity, c_node, c_dof) in enumerate(self._columns)
+            if c_quantity == quantity
+            and (node is None or c_node == node)
+            and (dof is None or c_dof == dof)
+        ]
+        if not indices:
+            raise KeyError(f"No result column matches {(quantity, node, dof)}")
+        return indices
+
+    def get(self, quantity, node=None, dof=None, steps=None):
+        """
+        query results
+
+        Parameters
+        ----------
+        quantity : str
+            e.g. "disp" or "force"
+        node : int, optional
+        dof : str, optional
+        steps : slice or array_like, optional
+            rows to return. all rows by default
+
+        Returns
+        -------
+        values : ndarray
+            one dimensional if the key names a single column
+        """
+        if steps is None:
+            steps = slice(None)
+        if (quantity, node, dof) in self._index:
+            return self.data[steps, self._index[(quantity, node, dof)]]
+        return self.data[steps][:, self.column_indices(quantity, node, dof)]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        steps = None
+        if len(key) == 4 or (key and isinstance(key[-1], slice)):
+            *key, steps = key
+        return self.get(*key, steps=steps)
+
+
+def convert_legacy(dat_path, res_path=None, columns=None):
+    """
+    convert a text result file written by the old solution loop
+
+    Parameters
+    ----------
+    dat_path : str
+        legacy text file
+    res_path : str, optional
+        output path. defaults to dat_path with the extension ".res"
+    columns : list, optional
+        column keys. by default the displacement and force layout of
+        `structure_columns` is assumed when the column count allows it
+
+    Returns
+    -------
+    res_path : str
+    """
+    if res_path is None:
+        res_path = os.path.splitext(dat_path)[0] + ".res"
+
+    with open(dat_path) as rfile:
+        lines = [line.split() for line in rfile if line.strip() and not line.startswith("#")]
+    no_columns = Counter(len(tokens) for tokens in lines).most_common(1)[0][0]
+
+    if columns is None:
+        if no_columns % 12 == 0:
+            columns = structure_columns(range(1, no_columns // 12 + 1))
+        else:
+            columns = [f"col{i}" for i in range(no_columns)]
+
+    with ResultWriter(res_path, columns, {"converted_from": os.path.basename(dat_path)}) as writer:
+        for tokens in lines:
+            # the old writer omitted the newline after the initial zero row
+            if len(tokens) == 2 * no_columns - 1:
+                glued = tokens[no_columns - 1]
+                tokens = tokens[:no_columns - 1] + [glued[0], glued[1:]] + tokens[no_columns:]
+            if len(tokens) % no_columns:
+                raise ValueError(f"Unexpected row length {len(tokens)} in {dat_path}")
+            writer.write_rows(np.array(tokens, dtype=float).reshape(-1, no_columns))
+    return res_path
+
+
+def open_results(path, columns=None):
+    """
+    open a result file for reading. legacy text files are converted once to
+    a binary file next to them, which is reused while it is up to date
+    """
+    if path.endswith(".dat"):
+        res_path = os.path.splitext(path)[0] + ".res"
+        if not os.path.exists(res_path) or os.path.getmtime(res_path) < os.path.getmtime(path):
+            convert_legacy(path, res_path, columns)
+        path = res_path
+    return ResultReader(path)
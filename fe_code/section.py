@@ -3,8 +3,10 @@ Section
 """
 import numpy as np
 
+from .convergence import PLANAR_SECTION_COMPONENTS, SECTION_COMPONENTS
 from .fiber import Fiber
-from .material_laws import UniaxialIncrementalMaterial
+from .geometry import get_b_matrices
+from .material_laws import UniaxialIncrementalMaterial, material_array_class
 
 
 class Section:
@@ -12,35 +14,70 @@ class Section:
 
     Attributes
     ----------
-    fibers : dict_values
+    fibers : list
+        Fiber views of the fiber arrays
+
+    deformations : ndarray
+        current section deformations
 
     position : float
         position based on Gauss-Lobatto rule
     weight : float
         weight based on Gauss-Lobatto rule
+    planar : bool
+        planar sections have the components (My, N), otherwise (Mz, My, N)
     """
 
-    def __init__(self, section_id):
+    def __init__(self, section_id, planar=False):
         self._id = section_id
-        self._fibers = dict()
+        self._fiber_index = dict()
+        self._new_fibers = list()
         self._tolerance = 1e-7
+        self._tolerance_policy = None
+        self._policy_weights = None
+        self._planar = planar
+        n = 2 if planar else 3
+
+        self._force_increment = np.zeros(n)
+        self._forces = np.zeros(n)
+        self._converged_section_forces = np.zeros(n)
+        self._unbalance_forces = np.zeros(n)
+        self._residual = np.zeros(n)
+        self._correction = None
 
-        self._force_increment = np.zeros(3)
-        self._forces = np.zeros(3)
-        self._converged_section_forces = np.zeros(3)
-        self._unbalance_forces = np.zeros(3)
-        self._residual = np.zeros(3)
+        self._deformation_increment = np.zeros(n)
+        self.deformations = np.zeros(n)
+        self._converged_deformations = np.zeros(n)
 
         self.position = None
         self.weight = None
 
-        self._flexibility_matrix = np.zeros((3, 3))
-        self._b_matrix = np.zeros((3, 5))
+        self._stiffness_matrix = np.zeros((n, n))
+        self._flexibility_matrix = np.zeros((n, n))
+        self._b_matrix = np.zeros((n, 3 if planar else 5))
+
+        # fiber arrays, see _pack
+        self._fiber_ids = list()
+        self._geometry = np.zeros((0, 5))
+        self._directions = np.zeros((0, n))
+        self._areas = np.zeros(0)
+        self._strain_increments = np.zeros(0)
+        self._converged_strains = np.zeros(0)
+        self._strains = np.zeros(0)
+        self._stresses = np.zeros(0)
+        self._tangents = np.zeros(0)
+        # (fiber indices, UniaxialMaterialArray) of every material class
+        self._materials = list()
+        self._material_positions = np.zeros((0, 2), dtype=int)
 
     @property
     def id(self):
         return self._id
 
+    @property
+    def planar(self):
+        return self._planar
+
     @property
     def tolerance(self):
         """N-R iterations tolerance"""
@@ -50,10 +87,61 @@ class Section:
     def tolerance(self, value):
         self._tolerance = value
 
+    @property
+    def tolerance_policy(self):
+        """convergence.TolerancePolicy of the unbalanced section forces and the
+        residual deformations, relative to the section forces and the
+        deformation increments. None tests the norm of the unbalanced forces
+        against the tolerance"""
+        return self._tolerance_policy
+
+    @tolerance_policy.setter
+    def tolerance_policy(self, policy):
+        self._tolerance_policy = policy
+        if policy is not None:
+            self._policy_weights = policy.weights(
+                PLANAR_SECTION_COMPONENTS if self._planar else SECTION_COMPONENTS
+            )
+
+    @property
+    def forces(self):
+        """current section forces"""
+        return self._forces
+
+    @property
+    def stiffness_matrix(self):
+        """current section tangent stiffness"""
+        return self._stiffness_matrix
+
     @property
     def fibers(self):
         """fibers list"""
-        return self._fibers.values()
+        self._pack()
+        return [Fiber(self, index) for index in range(len(self._fiber_ids))]
+
+    @property
+    def fiber_ids(self):
+        """ids of the fibers in the order of the fiber arrays"""
+        self._pack()
+        return self._fiber_ids
+
+    @property
+    def fiber_geometry(self):
+        """fiber arrays, columns y, z, area, w, h"""
+        self._pack()
+        return self._geometry
+
+    @property
+    def fiber_strains(self):
+        """current fiber strains"""
+        self._pack()
+        return self._strains
+
+    @property
+    def fiber_stresses(self):
+        """current fiber stresses"""
+        self._pack()
+        return self._stresses
 
     def add_fiber(self, fiber_id, y, z, area, material_class, w, h):
         """add a fiber to the section
@@ -71,22 +159,138 @@ class Section:
         material_class : object of type Material
             material model
         """
-        if not isinstance(material_class, UniaxialIncrementalMaterial):
-            raise ValueError("material_class is not of type : UniaxialIncrementalMaterial")
-        if fiber_id in self._fibers:
-            raise RuntimeError(f"Section already contains fiber with id {fiber_id}")
-        self._fibers[fiber_id] = Fiber(fiber_id, y, z, area, material_class, w, h)
+        self.add_fiber_arrays([fiber_id], [y], [z], [area], [w], [h], [material_class], [0])
+
+    def add_fibers(self, fiber_ids, ys, zs, areas, materials, ws, hs):
+        """add many fibers at once, the arguments are sequences of the
+        arguments of add_fiber. one material object is needed per fiber"""
+        materials = list(materials)
+        self.add_fiber_arrays(fiber_ids, ys, zs, areas, ws, hs, materials, range(len(materials)))
+
+    def add_fiber_arrays(self, fiber_ids, ys, zs, areas, ws, hs, materials, material_ids):
+        """add many fibers which share a few material objects. every fiber
+        gets a material with the state of materials[material_ids[i]]
+
+        Parameters
+        ----------
+        fiber_ids : sequence of int
+        ys, zs, areas, ws, hs : array_like
+            fiber coordinates, areas and sizes
+        materials : sequence of UniaxialIncrementalMaterial
+            prototypes of the fiber materials
+        material_ids : array_like
+            index of the material of every fiber
+        """
+        for material in materials:
+            if not isinstance(material, UniaxialIncrementalMaterial):
+                raise ValueError("material_class is not of type : UniaxialIncrementalMaterial")
+        fiber_ids = list(fiber_ids)
+        if len(set(fiber_ids)) < len(fiber_ids):
+            raise RuntimeError("The fiber ids are not unique")
+        for fiber_id in fiber_ids:
+            if fiber_id in self._fiber_index:
+                raise RuntimeError(f"Section already contains fiber with id {fiber_id}")
+        geometry = np.column_stack([ys, zs, areas, ws, hs]).astype(float).reshape(-1, 5)
+        material_ids = np.asarray(material_ids, dtype=int).reshape(-1)
+        if not len(fiber_ids) == len(geometry) == len(material_ids):
+            raise ValueError("The fiber arrays have different lengths")
+
+        offset = len(self._fiber_index)
+        self._fiber_index.update(zip(fiber_ids, range(offset, offset + len(fiber_ids))))
+        # fibers of the same material class share one material array
+        groups = dict()
+        for i, material in enumerate(materials):
+            key = (material_array_class(material), type(material))
+            groups.setdefault(key, list()).append(i)
+        material_groups = list()
+        for (array_class, _), prototypes in groups.items():
+            local = np.searchsorted(prototypes, material_ids)
+            indices = np.flatnonzero(np.isin(material_ids, prototypes))
+            if not indices.size:
+                continue
+            array = array_class.from_materials([materials[i] for i in prototypes])
+            material_groups.append((indices, array.take(local[indices])))
+        self._new_fibers.append((fiber_ids, geometry, material_groups))
 
     def get_fiber(self, fiber_id):
-        return self._fibers[fiber_id]
+        self._pack()
+        return Fiber(self, self._fiber_index[fiber_id])
+
+    def fiber_materials(self):
+        """material table of the fibers
+
+        Returns
+        -------
+        materials : list
+            unique (material class, parameters) in the order of appearance
+        material_ids : ndarray
+            index of the material of every fiber
+        """
+        self._pack()
+        keys = dict()
+        material_ids = np.zeros(len(self._fiber_ids), dtype=int)
+        for indices, array in self._materials:
+            table, rows = array.parameter_table()
+            ids = np.array([keys.setdefault(key, len(keys)) for key in table], dtype=int)
+            material_ids[indices] = ids[rows]
+        if not keys:
+            return list(), material_ids
+        first = np.unique(material_ids, return_index=True)[1]
+        order = np.argsort(first)
+        renumber = np.empty(len(keys), dtype=int)
+        renumber[order] = np.arange(len(keys))
+        table = list(keys)
+        return [table[i] for i in order], renumber[material_ids]
+
+    def get_fiber_states(self):
+        """converged fiber state, e.g. for a checkpoint. only valid after
+        finalize_load_step
+
+        Returns
+        -------
+        strains, stresses : ndarray
+        material_sizes : ndarray
+            number of state variables of every fiber
+        material_state : ndarray
+            state variables of all fibers, see UniaxialIncrementalMaterial.get_state
+        """
+        self._pack()
+        sizes = np.zeros(len(self._fiber_ids), dtype=int)
+        states = list()
+        for indices, array in self._materials:
+            state = array.get_state()
+            sizes[indices] = state.shape[1]
+            states.append((indices, state))
+        offsets = np.cumsum(sizes) - sizes
+        material_state = np.zeros(sizes.sum())
+        for indices, state in states:
+            material_state[offsets[indices, None] + np.arange(state.shape[1])] = state
+        return self._converged_strains.copy(), self._stresses.copy(), sizes, material_state
+
+    def restore_fiber_states(self, strains, stresses, material_sizes, material_state):
+        """restore the converged fiber state of get_fiber_states"""
+        self._pack()
+        offsets = np.cumsum(material_sizes) - material_sizes
+        for indices, array in self._materials:
+            size = material_sizes[indices[0]]
+            array.set_state(material_state[offsets[indices, None] + np.arange(size)])
+        self._converged_strains = np.array(strains, dtype=float)
+        self._strains = self._converged_strains.copy()
+        self._strain_increments.fill(0.0)
+        self._stresses = np.array(stresses, dtype=float)
+        self._update_tangents()
 
 
     ####################################################################################
 
 
-    def initialize(self):
-        """initialize stiffness matrix"""
-        self._calculate_b_matrix()
+    def initialize(self, b_matrix=None):
+        """initialize stiffness matrix. the b-matrix is computed from the
+        position if not given"""
+        self._pack()
+        if b_matrix is None:
+            b_matrix = get_b_matrices(np.array([self.position]), self._planar)[0]
+        self._b_matrix = b_matrix
         self._update_flexibility_matrix()
 
     def get_global_flexibility_matrix(self):
@@ -95,25 +299,54 @@ class Section:
     def get_global_residuals(self):
         return self._b_matrix.T @ self._residual
 
-    def state_determination(self, ele_chng_force_increment):
+    def state_determination(self, ele_chng_force_increment, relaxation=1.0):
+        """
+        section state for a change of the element forces. relaxation is the
+        share of the residual deformations which is applied
+        """
         #== step 8 ==#
         chng_force_increment = self._b_matrix @ ele_chng_force_increment
-        self._force_increment += chng_force_increment
-        self._forces = self._converged_section_forces + self._force_increment
         #== step 9 ==#
-        chng_def_increment = self._residual + self._flexibility_matrix @ chng_force_increment
-        #== step 10 ==#
-        for fiber in self.fibers:
-            fiber.state_determination(chng_def_increment)
-        #== step 11 ==#
+        chng_def_increment = (
+            relaxation * self._residual + self._flexibility_matrix @ chng_force_increment
+        )
+        self._correction = (chng_force_increment, chng_def_increment)
+        return self._apply_correction(chng_force_increment, chng_def_increment)
+
+    def extend_correction(self, share):
+        """
+        add a share of the correction of the last state_determination, e.g. in
+        a line search of the element. the element deformations stay compatible
+        """
+        chng_force_increment, chng_def_increment = self._correction
+        return self._apply_correction(share * chng_force_increment, share * chng_def_increment)
+
+    def deformation_state_determination(self, chng_def_increment):
+        """
+        section state for a change of the section deformations, used by the
+        displacement-based elements. the section forces are the resisting
+        forces of the fibers, so there is no residual
+        """
+        self._deformation_increment += chng_def_increment
+        self.deformations = self._converged_deformations + self._deformation_increment
+        self._fiber_state_determination(chng_def_increment)
+        self._update_stiffness_matrix()
+        self._forces = self._directions.T @ (self._stresses * self._areas)
+        self._force_increment = self._forces - self._converged_section_forces
+
+    def restore_state(self, forces, deformations):
+        """
+        restore a converged state, e.g. from a checkpoint.
+        the fibers have to be restored first
+        """
+        self._forces = np.array(forces, dtype=float)
+        self._converged_section_forces = self._forces
+        self._force_increment.fill(0.0)
+        self.deformations = np.array(deformations, dtype=float)
+        self._converged_deformations = self.deformations
+        self._deformation_increment.fill(0.0)
+        self._residual.fill(0.0)
         self._update_flexibility_matrix()
-        #== step 12 ==#
-        resisting_forces = np.zeros(3)
-        for fiber in self.fibers:
-            resisting_forces += fiber.stress * fiber.area * fiber.direction
-        self._unbalance_forces = self._forces - resisting_forces
-        self._residual = self._flexibility_matrix @ self._unbalance_forces
-        return abs(np.linalg.norm(self._unbalance_forces)) < self._tolerance
 
     def reset_residual(self):
         self._residual.fill(0.0)
@@ -124,24 +357,105 @@ class Section:
         """
         self._converged_section_forces = self._forces
         self._force_increment.fill(0.0)
-        for fiber in self.fibers:
-            fiber.finalize_load_step()
+        self._converged_deformations = self.deformations
+        self._deformation_increment.fill(0.0)
+        self._converged_strains = self._strains.copy()
+        self._strain_increments.fill(0.0)
+        for _, array in self._materials:
+            array.finalize_load_step()
 
 
     ####################################################################################
 
 
-    def _update_flexibility_matrix(self):
+    def _pack(self):
+        """ append the fibers added since the last call to the fiber arrays """
+        if not self._new_fibers:
+            return
+        ids, geometries, groups = zip(*self._new_fibers)
+        self._new_fibers = list()
+        offsets = np.cumsum([len(self._fiber_ids)] + [len(g) for g in geometries])
+        for fiber_ids in ids:
+            self._fiber_ids.extend(fiber_ids)
+        self._geometry = np.concatenate((self._geometry,) + geometries)
+        y, z = self._geometry[:, 0], self._geometry[:, 1]
+        if self._planar:
+            self._directions = np.column_stack([z, np.ones(len(z))])
+        else:
+            self._directions = np.column_stack([-y, z, np.ones(len(z))])
+        self._areas = self._geometry[:, 2].copy()
+        no_new = offsets[-1] - offsets[0]
+        self._strain_increments = np.append(self._strain_increments, np.zeros(no_new))
+        self._converged_strains = np.append(self._converged_strains, np.zeros(no_new))
+        self._strains = np.append(self._strains, np.zeros(no_new))
+        self._stresses = np.append(self._stresses, np.zeros(no_new))
+
+        # one material array per material class
+        merged = dict()
+        for indices, array in self._materials:
+            merged[type(array), array.MATERIAL_CLASS] = [(indices, array)]
+        for offset, material_groups in zip(offsets, groups):
+            for indices, array in material_groups:
+                key = (type(array), array.MATERIAL_CLASS)
+                merged.setdefault(key, list()).append((offset + indices, array))
+        self._materials = list()
+        self._material_positions = np.zeros((len(self._fiber_ids), 2), dtype=int)
+        for (array_class, _), parts in merged.items():
+            indices = np.concatenate([part[0] for part in parts])
+            array = parts[0][1] if len(parts) == 1 else array_class.concatenate(
+                [part[1] for part in parts]
+            )
+            self._material_positions[indices] = np.column_stack(
+                [np.full(len(indices), len(self._materials)), np.arange(len(indices))]
+            )
+            self._materials.append((indices, array))
+        self._update_tangents()
+
+    def _fiber_material(self, index):
+        group, position = self._material_positions[index]
+        return self._materials[group][1].material(position)
+
+    def _fiber_state_determination(self, chng_def_increment):
+        """ step 10 + 11 of all fibers """
+        self._strain_increments += self._directions @ chng_def_increment
+        self._strains = self._converged_strains + self._strain_increments
+        for indices, array in self._materials:
+            array.update_strain(self._strains[indices])
+            self._stresses[indices] = array.stress
+            self._tangents[indices] = array.tangent_modulus
+
+    def _update_tangents(self):
+        self._tangents = np.zeros(len(self._fiber_ids))
+        for indices, array in self._materials:
+            self._tangents[indices] = array.tangent_modulus
+
+    def _update_stiffness_matrix(self):
         """ section stiffness matrix """
-        stiffness_matrix = np.zeros((3, 3))
-        for fiber in self.fibers:
-            EA = fiber.tangent_stiffness * fiber.area
-            stiffness_matrix += EA * fiber.direction_matrix
-        self._flexibility_matrix = np.linalg.inv(stiffness_matrix)
-
-    def _calculate_b_matrix(self):
-        self._b_matrix[0, 0] = self.position / 2 - 1 / 2
-        self._b_matrix[0, 1] = self.position / 2 + 1 / 2
-        self._b_matrix[1, 2] = self.position / 2 - 1 / 2
-        self._b_matrix[1, 3] = self.position / 2 + 1 / 2
-        self._b_matrix[2, 4] = 1
+        EA = self._tangents * self._areas
+        self._stiffness_matrix = (self._directions.T * EA) @ self._directions
+
+    def _apply_correction(self, chng_force_increment, chng_def_increment):
+        """ steps 8 to 12 for changes of the section forces and deformations """
+        self._force_increment += chng_force_increment
+        self._forces = self._converged_section_forces + self._force_increment
+        self._deformation_increment += chng_def_increment
+        self.deformations = self._converged_deformations + self._deformation_increment
+        #== step 10 ==#
+        self._fiber_state_determination(chng_def_increment)
+        #== step 11 ==#
+        self._update_flexibility_matrix()
+        #== step 12 ==#
+        resisting_forces = self._directions.T @ (self._stresses * self._areas)
+        self._unbalance_forces = self._forces - resisting_forces
+        self._residual = self._flexibility_matrix @ self._unbalance_forces
+        if self._tolerance_policy is not None:
+            return self._tolerance_policy.converged(
+                self._unbalance_forces, self._residual, self._policy_weights,
+                (self._forces, self._deformation_increment),
+            )
+        return abs(np.linalg.norm(self._unbalance_forces)) < self._tolerance
+
+    def _update_flexibility_matrix(self):
+        """ section flexibility matrix """
+        self._update_stiffness_matrix()
+        self._flexibility_matrix = np.linalg.inv(self._stiffness_matrix)
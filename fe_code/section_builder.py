@@ -0,0 +1,273 @@
+"""
+Section builder
+===============
+
+Vectorized generators for section discretizations. Every generator returns
+a `FiberArrays` tuple with the fiber coordinates, areas, sizes and material
+ids, which `build_section` concatenates. Reinforcing bars displace the
+concrete of the patch fiber they lie in.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+
+FiberArrays = namedtuple("FiberArrays", ["y", "z", "area", "w", "h", "material"])
+FiberArrays.__doc__ = """
+fibers of a section as arrays
+
+Attributes
+----------
+y, z : ndarray
+    fiber coordinates
+area : ndarray
+    fiber areas
+w, h : ndarray
+    fiber sizes in y and z direction (used for plotting)
+material : ndarray
+    material id of every fiber
+"""
+
+
+def _fiber_arrays(y, z, area, w, h, material_id):
+    y = np.asarray(y, dtype=float).ravel()
+    shape = y.shape
+    return FiberArrays(
+        y,
+        np.broadcast_to(np.asarray(z, dtype=float).ravel(), shape).copy(),
+        np.broadcast_to(np.asarray(area, dtype=float).ravel(), shape).copy(),
+        np.broadcast_to(np.asarray(w, dtype=float).ravel(), shape).copy(),
+        np.broadcast_to(np.asarray(h, dtype=float).ravel(), shape).copy(),
+        np.full(shape, material_id, dtype=int),
+    )
+
+
+def concatenate(*fiber_arrays):
+    """ join several FiberArrays """
+    return FiberArrays(*(np.concatenate(field) for field in zip(*fiber_arrays)))
+
+
+def rectangular_patch(y_min, z_min, y_max, z_max, no_fibers_y, no_fibers_z, material_id):
+    """
+    rectangle divided into a regular grid, ordered with z running fastest
+
+    Parameters
+    ----------
+    y_min, z_min, y_max, z_max : float
+        corners of the rectangle
+    no_fibers_y, no_fibers_z : int
+        number of fibers in y and z direction
+    material_id : int
+
+    Returns
+    -------
+    fibers : FiberArrays
+    """
+    w = (y_max - y_min) / no_fibers_y
+    h = (z_max - z_min) / no_fibers_z
+    ys = y_min + w * (np.arange(no_fibers_y) + 0.5)
+    zs = z_min + h * (np.arange(no_fibers_z) + 0.5)
+    y, z = np.meshgrid(ys, zs, indexing="ij")
+    return _fiber_arrays(y, z, w * h, w, h, material_id)
+
+
+def circular_patch(r_inner, r_outer, no_fibers_radial, no_fibers_circ, material_id,
+                   center=(0.0, 0.0), start_angle=0.0, end_angle=2 * np.pi):
+    """
+    annulus (or annular sector) divided into ring segments
+
+    Parameters
+    ----------
+    r_inner, r_outer : float
+        radii. r_inner = 0 gives a full circle
+    no_fibers_radial, no_fibers_circ : int
+        number of fibers in radial and circumferential direction
+    material_id : int
+    center : tuple
+        (y, z) of the center
+    start_angle, end_angle : float
+        angles in radians measured from the y axis
+
+    Returns
+    -------
+    fibers : FiberArrays
+    """
+    radii = np.linspace(r_inner, r_outer, no_fibers_radial + 1)
+    d_theta = (end_angle - start_angle) / no_fibers_circ
+    thetas = start_angle + d_theta * (np.arange(no_fibers_circ) + 0.5)
+    r_i, r_o = radii[:-1], radii[1:]
+    # centroid of an annular sector
+    r_c = 2 / 3 * (r_o ** 3 - r_i ** 3) / (r_o ** 2 - r_i ** 2)
+    r_c *= np.sin(d_theta / 2) / (d_theta / 2)
+    area = 0.5 * d_theta * (r_o ** 2 - r_i ** 2)
+    r_c, theta = np.meshgrid(r_c, thetas, indexing="ij")
+    y = center[0] + r_c * np.cos(theta)
+    z = center[1] + r_c * np.sin(theta)
+    area = np.repeat(area, no_fibers_circ)
+    w = np.repeat(0.5 * (r_i + r_o) * d_theta, no_fibers_circ)
+    h = np.repeat(r_o - r_i, no_fibers_circ)
+    return _fiber_arrays(y, z, area, w, h, material_id)
+
+
+def rectangular_cover_core(width, height, cover, no_fibers_y, no_fibers_z, core_material_id,
+                           cover_material_id, no_fibers_cover=1):
+    """
+    rectangular section centered at the origin, split into a confined core
+    and an unconfined cover of constant thickness
+
+    Parameters
+    ----------
+    width, height : float
+        dimensions in y and z direction
+    cover : float
+        cover thickness
+    no_fibers_y, no_fibers_z : int
+        core fibers in y and z direction. the cover uses the same division
+        along the edges
+    core_material_id, cover_material_id : int
+    no_fibers_cover : int
+        fibers through the cover thickness
+
+    Returns
+    -------
+    fibers : FiberArrays
+    """
+    y_c = width / 2 - cover
+    z_c = height / 2 - cover
+    n = no_fibers_cover
+    return concatenate(
+        rectangular_patch(-y_c, -z_c, y_c, z_c, no_fibers_y, no_fibers_z, core_material_id),
+        rectangular_patch(-width / 2, -height / 2, width / 2, -z_c, no_fibers_y, n,
+                          cover_material_id),
+        rectangular_patch(-width / 2, z_c, width / 2, height / 2, no_fibers_y, n,
+                          cover_material_id),
+        rectangular_patch(-width / 2, -z_c, -y_c, z_c, n, no_fibers_z, cover_material_id),
+        rectangular_patch(y_c, -z_c, width / 2, z_c, n, no_fibers_z, cover_material_id),
+    )
+
+
+def circular_cover_core(radius, cover, no_fibers_radial, no_fibers_circ, core_material_id,
+                        cover_material_id, no_fibers_cover=1, center=(0.0, 0.0)):
+    """
+    circular section split into a confined core and an unconfined cover
+
+    Returns
+    -------
+    fibers : FiberArrays
+    """
+    return concatenate(
+        circular_patch(0.0, radius - cover, no_fibers_radial, no_fibers_circ, core_material_id,
+                       center),
+        circular_patch(radius - cover, radius, no_fibers_cover, no_fibers_circ,
+                       cover_material_id, center),
+    )
+
+
+def straight_layer(no_bars, bar_area, y_start, z_start, y_end, z_end, material_id):
+    """
+    equally spaced bars on a straight line, including both end points
+
+    Returns
+    -------
+    bars : FiberArrays
+    """
+    if no_bars == 1:
+        y, z = [0.5 * (y_start + y_end)], [0.5 * (z_start + z_end)]
+    else:
+        y = np.linspace(y_start, y_end, no_bars)
+        z = np.linspace(z_start, z_end, no_bars)
+    size = np.sqrt(bar_area)
+    return _fiber_arrays(y, z, bar_area, size, size, material_id)
+
+
+def circular_layer(no_bars, bar_area, radius, material_id, center=(0.0, 0.0),
+                   start_angle=0.0):
+    """
+    equally spaced bars on a circle
+
+    Returns
+    -------
+    bars : FiberArrays
+    """
+    theta = start_angle + 2 * np.pi / no_bars * np.arange(no_bars)
+    y = center[0] + radius * np.cos(theta)
+    z = center[1] + radius * np.sin(theta)
+    size = np.sqrt(bar_area)
+    return _fiber_arrays(y, z, bar_area, size, size, material_id)
+
+
+def point_bar(y, z, bar_area, material_id):
+    """
+    single bar
+
+    Returns
+    -------
+    bar : FiberArrays
+    """
+    size = np.sqrt(bar_area)
+    return _fiber_arrays([y], [z], bar_area, size, size, material_id)
+
+
+def build_section(patches, bars=(), subtract_overlap=True):
+    """
+    join patches and bars into the fibers of one section
+
+    Parameters
+    ----------
+    patches : list of FiberArrays
+        concrete patches
+    bars : list of FiberArrays
+        reinforcement
+    subtract_overlap : bool
+        subtract the area of every bar from the patch fiber it lies in, i.e.
+        the fiber with the nearest centroid if the bar is within half the
+        fiber diagonal. a bar larger than that fiber removes only the fiber.
+        fibers left without area are removed
+
+    Returns
+    -------
+    fibers : FiberArrays
+        patch fibers followed by the bars
+    """
+    patch = concatenate(*patches)
+    if not bars:
+        return patch
+    bar = concatenate(*bars)
+    if subtract_overlap and patch.y.size:
+        distance = np.hypot(bar.y[:, None] - patch.y, bar.z[:, None] - patch.z)
+        nearest = np.argmin(distance, axis=1)
+        inside = distance[np.arange(bar.y.size), nearest] <= 0.5 * np.hypot(
+            patch.w[nearest], patch.h[nearest]
+        )
+        area = patch.area.copy()
+        np.subtract.at(area, nearest[inside], bar.area[inside])
+        area = np.maximum(area, 0.0)
+        keep = area > 1e-12 * patch.area
+        patch = FiberArrays(*(field[keep] for field in patch._replace(area=area)))
+    return concatenate(patch, bar)
+
+
+def add_to_section(section, fibers, materials, first_fiber_id=1):
+    """
+    add fibers to a section
+
+    Parameters
+    ----------
+    section : Section
+    fibers : FiberArrays
+    materials : sequence of callables
+        materials[material_id]() returns a new material object. it is called
+        once, the fibers get materials with the state of that object
+    first_fiber_id : int
+
+    Returns
+    -------
+    next_fiber_id : int
+    """
+    no_fibers = fibers.y.size
+    fiber_ids = range(first_fiber_id, first_fiber_id + no_fibers)
+    section.add_fiber_arrays(
+        fiber_ids, fibers.y, fibers.z, fibers.area, fibers.w, fibers.h,
+        [material() for material in materials], fibers.material,
+    )
+    return first_fiber_id + no_fibers
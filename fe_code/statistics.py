@@ -0,0 +1,153 @@
+"""
+Convergence statistics
+======================
+
+Compact per-step records of the iteration counts and residuals of the
+solver, kept in growing numpy arrays.
+"""
+import numpy as np
+
+from .results import ResultWriter
+
+
+class GrowableArray:
+    """
+    numpy array of rows which doubles its capacity when full
+
+    Parameters
+    ----------
+    no_columns : int
+    dtype : numpy dtype
+    """
+
+    def __init__(self, no_columns, dtype=float, capacity=64):
+        self._data = np.zeros((capacity, no_columns), dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, row):
+        if self._size == len(self._data):
+            self._data = np.concatenate((self._data, np.zeros_like(self._data)))
+        self._data[self._size] = row
+        self._size += 1
+
+    def clear(self):
+        self._size = 0
+
+    def truncate(self, size):
+        """ keep the first size rows """
+        self._size = min(size, self._size)
+
+    @property
+    def array(self):
+        """ view on the filled rows """
+        return self._data[:self._size]
+
+
+class ConvergenceStatistics:
+    """
+    iteration counts and residuals of every converged load step
+
+    Attributes
+    ----------
+    COLUMNS : tuple
+        names of the per-step columns
+    """
+
+    COLUMNS = (
+        "load_step", "nr_iterations", "element_iterations", "max_element_iterations",
+        "section_iterations", "residual",
+    )
+
+    def __init__(self):
+        self._steps = GrowableArray(len(self.COLUMNS))
+        self._trace = GrowableArray(3)
+        self._current_residuals = list()
+
+    def add_iteration(self, residual):
+        """ called after every Newton-Raphson iteration """
+        self._current_residuals.append(residual)
+
+    def finalize_load_step(self, load_step, element_iterations, section_iterations):
+        """
+        close the current load step
+
+        Parameters
+        ----------
+        load_step : int
+        element_iterations : list
+            element iterations of the step, one entry per element
+        section_iterations : int
+            section state determinations of the step
+        """
+        residuals = self._current_residuals
+        for i, residual in enumerate(residuals):
+            self._trace.append((load_step, i + 1, residual))
+        self._steps.append((
+            load_step, len(residuals), sum(element_iterations),
+            max(element_iterations, default=0), section_iterations,
+            residuals[-1] if residuals else np.nan,
+        ))
+        self._current_residuals = list()
+
+    def truncate(self, load_step):
+        """
+        drop the records of the load steps after load_step and the iterations
+        of the open load step, e.g. when an analysis resumes from a checkpoint
+        """
+        self._steps.truncate(int(np.count_nonzero(self._steps.array[:, 0] <= load_step)))
+        self._trace.truncate(int(np.count_nonzero(self._trace.array[:, 0] <= load_step)))
+        self._current_residuals = list()
+
+    def __len__(self):
+        return len(self._steps)
+
+    def get(self, column):
+        """ per-step values of a column """
+        return self._steps.array[:, self.COLUMNS.index(column)]
+
+    @property
+    def table(self):
+        """ array of shape (no_steps, len(COLUMNS)) """
+        return self._steps.array
+
+    @property
+    def residual_trace(self):
+        """ array of rows (load_step, nr_iteration, residual) """
+        return self._trace.array
+
+    def get_residual_trace(self, load_step):
+        """ residual norms of the Newton-Raphson iterations of a load step """
+        trace = self._trace.array
+        return trace[trace[:, 0] == load_step, 2]
+
+    def summary(self, no_expensive_steps=5):
+        """
+        totals, means and the most expensive load steps
+
+        Returns
+        -------
+        summary : dict
+        """
+        if not len(self):
+            return {"load_steps": 0}
+        element_iterations = self.get("element_iterations")
+        expensive = np.argsort(element_iterations)[::-1][:no_expensive_steps]
+        summary = {"load_steps": len(self)}
+        for column in ("nr_iterations", "element_iterations", "section_iterations"):
+            values = self.get(column)
+            summary[column] = {
+                "total": int(values.sum()), "mean": float(values.mean()), "max": int(values.max()),
+            }
+        summary["most_expensive_steps"] = [int(step) for step in self.get("load_step")[expensive]]
+        return summary
+
+    def write(self, path, trace_path=None):
+        """ write the per-step table, and optionally the residual trace, as result files """
+        with ResultWriter(path, list(self.COLUMNS)) as writer:
+            writer.write_rows(self.table)
+        if trace_path is not None:
+            with ResultWriter(trace_path, ["load_step", "nr_iteration", "residual"]) as writer:
+                writer.write_rows(self.residual_trace)
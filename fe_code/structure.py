@@ -6,22 +6,37 @@ import numpy as np
 from .node import Node
 from .dof import DoF
 from .fiber_beam import FiberBeam
-from .io import warning
+from .displacement_beam import DisplacementFiberBeam
+from .geometry import GeometryTable
+from .acceleration import LINE_SEARCH_TRIALS, make_accelerator, secant_step_length
+from .mass import lumped_element_mass, consistent_element_mass
+from .equations import (
+    SOLVERS, BANDED_MIN_EQUATIONS, node_adjacency, reverse_cuthill_mckee, bandwidth,
+    banded_available, solve_bordered_banded,
+)
+from . import events
+from .statistics import ConvergenceStatistics
 
 
 DOF_INDEX_MAP = {"u": 0, "v": 1, "w": 2, "x": 3, "y": 4, "z": 5}
+PLANAR_DOF_INDEX_MAP = {"u": 0, "w": 1, "y": 2}
+CHECKPOINT_VERSION = 2
+PREDICTORS = ("tangent", "secant")
+STATE_DETERMINATIONS = ("iterative", "non_iterative")
+ELEMENT_TYPES = {"force_based": FiberBeam, "displacement_based": DisplacementFiberBeam}
 
 
-def index_from_dof(dof):
+def index_from_dof(dof, dof_index_map=DOF_INDEX_MAP):
     """get the index from dof"""
-    return 6 * (dof.node_id - 1) + DOF_INDEX_MAP[dof.type]
+    return len(dof_index_map) * (dof.node_id - 1) + dof_index_map[dof.type]
 
 
-def dof_from_index(index):
+def dof_from_index(index, dof_index_map=DOF_INDEX_MAP):
     """get the dof from index"""
-    node_id = 1 + index // 6
-    for key, value in DOF_INDEX_MAP.items():
-        if value == index % 6:
+    no_node_dofs = len(dof_index_map)
+    node_id = 1 + index // no_node_dofs
+    for key, value in dof_index_map.items():
+        if value == index % no_node_dofs:
             dof_type = key
     return DoF(node_id, dof_type)
 
@@ -43,9 +58,21 @@ class Structure:
 
     controlled_dof_increment : float
         used in the displacement-control solver
+
+    convergence_statistics : ConvergenceStatistics
+        iteration counts and residuals of the converged load steps since initialize
+
+    geometry : GeometryTable
+        element geometry, built in initialize
+
+    planar : bool
+        planar structures in the x-z plane have the dofs (u, w, y) per node.
+        the out-of-plane dofs are fixed implicitly
     """
 
-    def __init__(self):
+    def __init__(self, planar=False):
+        self._planar = planar
+        self._dof_index_map = PLANAR_DOF_INDEX_MAP if planar else DOF_INDEX_MAP
         self._nodes = dict()
         self._elements = dict()
         self._dirichlet_conditions = dict()
@@ -53,6 +80,33 @@ class Structure:
         self._tolerance = 1e-7
 
         self._controlled_dof = None
+        self._geometry = None
+        self._element_dof_indices = None
+        self._equations = None
+        self._equation_numbers = None
+        self._bandwidth = None
+        self._solver = "auto"
+        self._banded = False
+        self._banded_stiffness = None
+        self._banded_indices = None
+        self._element_stiffness_matrices = None
+        self._stiffness_stale = False
+        self._predictor = "tangent"
+        self._state_determination = "iterative"
+        self._elements_converged = True
+        self._tolerance_policy = None
+        self._policy_weights = None
+        self._acceleration = "none"
+        self._accelerator = None
+        self._step_started = False
+        self._resolve_residuals = False
+        self._previous_residual = np.inf
+        self._previous_increment = None
+        self._previous_load_factor_increment = 0.0
+        self._recorders = list()
+        self._nodal_masses = dict()
+        self._load_step = 0
+        self.convergence_statistics = ConvergenceStatistics()
 
         self._load_factor_increment = 0.0
         self._load_factor = 0.0
@@ -70,12 +124,112 @@ class Structure:
     def set_tolerance(self, value):
         self._tolerance = value
 
+    def get_tolerance(self):
+        return self._tolerance
+
     def set_section_tolerance(self, value):
         """ set convergence tolerance for sections """
         for element in self.elements:
             for section in element.sections:
                 section.tolerance = value
 
+    def set_tolerance_policy(self, policy):
+        """
+        convergence test of the Newton-Raphson iterations, a
+        convergence.TolerancePolicy on the unbalanced forces and the
+        corrections of the load step, relative to the resisting forces and
+        the displacement increments. None tests the norm of the unbalanced
+        forces against the tolerance
+        """
+        self._tolerance_policy = policy
+        self._update_policy_weights()
+
+    def set_element_tolerance_policy(self, policy):
+        """
+        convergence test of the element iterations, see FiberBeam.tolerance_policy.
+        None requires all sections to converge
+        """
+        for element in self.elements:
+            element.tolerance_policy = policy
+
+    def set_section_tolerance_policy(self, policy):
+        """
+        convergence test of the sections, see Section.tolerance_policy. None
+        tests the norm of the unbalanced section forces against the section tolerance
+        """
+        for element in self.elements:
+            for section in element.sections:
+                section.tolerance_policy = policy
+
+    def set_solver(self, solver):
+        """
+        linear solver of the Newton-Raphson iterations: "dense", "banded" (needs
+        scipy) or "auto", which is banded for large systems if scipy is available
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver {solver}. Use one of {SOLVERS}")
+        self._solver = solver
+
+    def set_state_determination(self, method):
+        """
+        element state determination: "iterative" resolves the section
+        residuals by element iterations in every Newton-Raphson iteration,
+        "non_iterative" does one element iteration and carries the section
+        residuals over to the next Newton-Raphson iteration. a load step then
+        only converges when all sections are in equilibrium as well. elements
+        with growing residuals resolve them by element iterations and a load
+        step whose residual grows continues with the iterative state
+        determination. it trades element iterations for Newton-Raphson
+        iterations and is not faster in general, see the README
+        """
+        if method not in STATE_DETERMINATIONS:
+            raise ValueError(
+                f"Unknown state determination {method}. Use one of {STATE_DETERMINATIONS}"
+            )
+        self._state_determination = method
+
+    @property
+    def elements_converged(self):
+        """ all sections were in equilibrium after the last state determination """
+        return self._elements_converged
+
+    def set_predictor(self, predictor):
+        """
+        first iterate of a load step: "tangent" solves with the converged
+        tangent from the converged state, "secant" extrapolates the converged
+        increment of the previous load step to the controlled dof increment.
+        the secant predictor falls back to the tangent one when the direction
+        of the controlled dof reverses
+        """
+        if predictor not in PREDICTORS:
+            raise ValueError(f"Unknown predictor {predictor}. Use one of {PREDICTORS}")
+        self._predictor = predictor
+
+    def set_acceleration(self, acceleration):
+        """
+        acceleration of the Newton-Raphson iterations: "aitken" relaxes the
+        corrections, "line_search" scales every correction by a secant line
+        search on the unbalanced forces projected onto the correction.
+        the first iteration of a load step, which applies the controlled dof
+        increment, is not accelerated
+        """
+        self._accelerator = make_accelerator(acceleration)
+        self._acceleration = acceleration
+
+    def set_element_acceleration(self, acceleration):
+        """
+        acceleration of the iterations of all elements: "none", "aitken" or
+        "line_search". opt-in for large load steps only, where the element
+        iterations fail without it. on small steps it adds iterations
+        """
+        for element in self.elements:
+            element.acceleration = acceleration
+
+    def set_integration_scheme(self, scheme):
+        """ set the quadrature rule of all elements, e.g. "gauss_lobatto" or "gauss_radau" """
+        for element in self.elements:
+            element.integration_scheme = scheme
+
     @property
     def nodes(self):
         """ nodes """
@@ -94,40 +248,189 @@ class Structure:
         """ get element with id """
         return self._elements[element_id]
 
+    @property
+    def geometry(self):
+        """ GeometryTable of the elements, built in initialize """
+        return self._geometry
+
+    @property
+    def element_dof_indices(self):
+        """ global dof indices of the element dofs, shape (no_elements, no_element_dofs) """
+        return self._element_dof_indices
+
+    @property
+    def load_step(self):
+        """ number of converged load steps """
+        return self._load_step
+
+    @property
+    def planar(self):
+        return self._planar
+
+    @property
+    def dof_types(self):
+        """ dof types of a node, in the order of the global vectors """
+        return "".join(self._dof_index_map)
+
+    @property
+    def no_equations(self):
+        """ number of dofs in the equation system, set in initialize """
+        return len(self._equations)
+
+    @property
+    def equations(self):
+        """ global dof indices of the equation system, set in initialize """
+        return self._equations
+
+    @property
+    def fixed_dofs(self):
+        """ global dof indices with homogenuous dirichlet conditions """
+        fixed = [dof for dof, value in self._dirichlet_conditions.items() if value == 0]
+        return np.array([self._dof_index(dof) for dof in fixed], dtype=int)
+
+    @property
+    def stiffness_matrix(self):
+        """
+        current global tangent stiffness matrix. the banded solver assembles
+        it only when it is accessed
+        """
+        if self._stiffness_stale:
+            self._assemble_stiffness_matrix()
+        return self._stiffness_matrix
+
+    @property
+    def bandwidth(self):
+        """ half bandwidth of the stiffness matrix in the equation numbering """
+        return self._bandwidth
+
+    @property
+    def inactive_dofs(self):
+        """ dofs which no element stiffens, excluded from the equation system """
+        inactive = np.flatnonzero(self._equation_numbers < 0)
+        return [dof_from_index(i, self._dof_index_map) for i in inactive]
+
     @property
     def no_dofs(self):
         """ number of dofs """
-        return len(self._nodes) * 6
+        return len(self._nodes) * len(self._dof_index_map)
 
     def add_node(self, node_id, x_pos, y_pos, z_pos):
         """ add a node """
         self._nodes[node_id] = Node(node_id, x_pos, y_pos, z_pos)
 
-    def add_fiber_beam_element(self, element_id, node1_id, node2_id):
-        """ add an element """
+    def add_fiber_beam_element(self, element_id, node1_id, node2_id, element_type="force_based"):
+        """
+        add an element. element_type is "force_based" (FiberBeam) or
+        "displacement_based" (DisplacementFiberBeam, without element
+        iterations, long members are meshed with several elements)
+        """
+        if element_type not in ELEMENT_TYPES:
+            raise ValueError(
+                f"Unknown element type {element_type}. Use one of {list(ELEMENT_TYPES)}"
+            )
         node1 = self.get_node(node1_id)
         node2 = self.get_node(node2_id)
-        self._elements[element_id] = FiberBeam(element_id, node1, node2)
+        self._elements[element_id] = ELEMENT_TYPES[element_type](
+            element_id, node1, node2, self._planar
+        )
 
     def add_dirichlet_condition(self, node_id, dof_types, value):
         """ add a dirichlet boundary condition """
-        for dof_type in dof_types:
+        for dof_type in self._in_plane(dof_types, value):
             dof = DoF(node_id, dof_type)
             self._dirichlet_conditions[dof] = value
 
     def add_neumann_condition(self, node_id, dof_types, value):
         """ add a Neumann boundary condition """
-        for dof_type in dof_types:
+        for dof_type in self._in_plane(dof_types, value):
             dof = DoF(node_id, dof_type)
             self._neumann_conditions[dof] = value
 
+    def add_nodal_mass(self, node_id, dof_types, value):
+        """ add a lumped mass (or rotational inertia) to dofs of a node """
+        for dof_type in self._in_plane(dof_types, value):
+            dof = DoF(node_id, dof_type)
+            self._nodal_masses[dof] = self._nodal_masses.get(dof, 0.0) + value
+
+    @property
+    def nodal_masses(self):
+        """ dict of DoF: lumped mass """
+        return self._nodal_masses
+
+    def get_lumped_masses(self, rotational_inertia=False):
+        """
+        diagonal of the lumped mass matrix: nodal masses and the lumped
+        element masses, with the rotational inertia of the elements if
+        rotational_inertia. shape (no_dofs,)
+        """
+        masses = np.zeros(self.no_dofs)
+        for dof, value in self._nodal_masses.items():
+            masses[self._dof_index(dof)] += value
+        element_masses = np.array([
+            lumped_element_mass(
+                element.geometry.length, element.geometry.triad, element.mass_per_length,
+                self._planar, rotational_inertia,
+            )
+            for element in self.elements
+        ]).reshape(self._element_dof_indices.shape)
+        np.add.at(masses, self._element_dof_indices, element_masses)
+        return masses
+
+    def get_mass_matrix(self, consistent=False):
+        """
+        global mass matrix, shape (no_dofs, no_dofs). the element masses are
+        lumped or consistent, the nodal masses are always lumped
+        """
+        if not consistent:
+            return np.diag(self.get_lumped_masses())
+        mass_matrix = np.zeros((self.no_dofs, self.no_dofs))
+        for dof, value in self._nodal_masses.items():
+            i = self._dof_index(dof)
+            mass_matrix[i, i] += value
+        element_masses = np.array([
+            consistent_element_mass(
+                element.geometry.length, element.geometry.triad, element.mass_per_length,
+                self._planar,
+            )
+            for element in self.elements
+        ]).reshape(self._element_dof_indices.shape + self._element_dof_indices.shape[1:])
+        i = self._element_dof_indices
+        np.add.at(mass_matrix, (i[:, :, None], i[:, None, :]), element_masses)
+        return mass_matrix
+
+    def add_recorder(self, recorder):
+        """ add a recorder which is called after every converged load step """
+        self._recorders.append(recorder)
+
+    def close_recorders(self):
+        """ flush and close all recorders """
+        for recorder in self._recorders:
+            recorder.close()
+
     def set_controlled_dof(self, node_id, dof_type):
         """ sets the controlled dof """
+        if dof_type not in self._dof_index_map:
+            raise ValueError(f"dof {dof_type} does not exist in a planar structure")
         self._controlled_dof = DoF(node_id, dof_type)
 
+    @property
+    def controlled_dof(self):
+        """ controlled dof """
+        return self._controlled_dof
+
+    @property
+    def dirichlet_conditions(self):
+        """ dict of DoF: prescribed value """
+        return self._dirichlet_conditions
+
+    @property
+    def neumann_conditions(self):
+        """ dict of DoF: load value """
+        return self._neumann_conditions
+
     def get_force(self, dof):
         node_id, dof_type = dof
-        i = index_from_dof(DoF(node_id, dof_type))
+        i = self._dof_index(DoF(node_id, dof_type))
         return self._resisting_forces[i]
 
     def get_forces(self):
@@ -135,12 +438,17 @@ class Structure:
 
     def get_displacement(self, dof):
         node_id, dof_type = dof
-        i = index_from_dof(DoF(node_id, dof_type))
+        i = self._dof_index(DoF(node_id, dof_type))
         return self._converged_displacement[i]
 
     def get_displacements(self):
         return self._converged_displacement
 
+    def get_dof_index(self, dof):
+        """ index of a dof given as (node_id, dof_type) in the global vectors """
+        node_id, dof_type = dof
+        return self._dof_index(DoF(node_id, dof_type))
+
     def get_dof_value(self, dof):
         if isinstance(dof, DoF):
             node_id = dof.node_id
@@ -149,7 +457,7 @@ class Structure:
             node_id, dof_type = dof
         else:
             raise
-        i = index_from_dof(DoF(node_id, dof_type))
+        i = self._dof_index(DoF(node_id, dof_type))
         return self._converged_displacement[i]
 
     ####################################################################################
@@ -164,105 +472,493 @@ class Structure:
         self._displacement = np.zeros(self.no_dofs)
         self._converged_displacement = np.zeros(self.no_dofs)
         self._resisting_forces = np.zeros(self.no_dofs)
+        self._step_started = False
+        self._resolve_residuals = False
+        self._previous_residual = np.inf
+        self._previous_increment = None
+        self._geometry = GeometryTable(self.elements, self._planar)
+        self._element_dof_indices = np.array(
+            [[self._dof_index(dof) for dof in element.dofs] for element in self.elements], dtype=int
+        ).reshape(len(self._elements), -1)
+        self._number_equations()
+        self._update_policy_weights()
         for element in self.elements:
-            element.initialize()
+            element.initialize(self._geometry.get(element.id))
         self._update_stiffness_matrix()
+        self._load_step = 0
+        self.convergence_statistics = ConvergenceStatistics()
+        for recorder in self._recorders:
+            recorder.initialize(self)
 
     def solve_NR_iteration(self, max_ele_iterations):
         """
         main solution loop until element convergence
         """
+        # the tangent predictor applies the controlled dof increment and is not accelerated
+        accelerate = self._step_started
+        if not self._step_started:
+            self._step_started = True
+            if self._accelerator is not None:
+                self._accelerator.reset()
+            if self._predict(max_ele_iterations):
+                accelerate = True
+                res = np.linalg.norm(self._unbalanced_forces)
+                converged = self._converged(res, self._displacement_increment)
+                if converged and self._elements_converged:
+                    self.convergence_statistics.add_iteration(res)
+                    return True, res
+
+        start_increment = self._displacement_increment.copy()
         #== step 4 ==#
         lhs, rhs = self._build_system_NR_displacement_control()
-        self._apply_homogenuous_dirichlet_BCs(lhs)
 
-        change_in_increments = np.linalg.solve(lhs, rhs)
-        self._displacement_increment += change_in_increments[:self.no_dofs]
-        self._load_factor_increment += change_in_increments[-1]
-        self._displacement = self._converged_displacement + self._displacement_increment
+        solution = self._solve_linear_system(lhs, rhs)
+        if accelerate and self._accelerator is not None:
+            solution = self._accelerator.update(solution)
+        change_in_increments = np.zeros(self.no_dofs)
+        change_in_increments[self._equations] = solution[:-1]
+        self._load_factor_increment += solution[-1]
         self._load_factor = self._converged_load_factor + self._load_factor_increment
+        self.update_state(change_in_increments, max_ele_iterations)
+        self._update_unbalanced_forces()
+        if accelerate and self._acceleration == "line_search":
+            self._line_search(solution, rhs[:-1] @ solution[:-1], max_ele_iterations)
+
+        #== step 16 ==#
+        res = abs(np.linalg.norm(self._unbalanced_forces))
+        # a non-iterative load step continues with the iterative state determination
+        # once the residual grows
+        if res > self._previous_residual:
+            self._resolve_residuals = True
+        self._previous_residual = res
+        self.convergence_statistics.add_iteration(res)
+        events.emit(
+            events.NR_ITERATION, events.DEBUG, "NR iteration residual = {residual}", residual=res
+        )
+        converged = self._converged(res, self._displacement_increment - start_increment)
+        return converged and self._elements_converged, res
+
+
+    def update_state(self, change_in_increments, max_ele_iterations, update_stiffness=True):
+        """
+        state determination of all elements for a change of the displacement
+        increments, then update the tangent stiffness and the resisting forces
+
+        Parameters
+        ----------
+        change_in_increments : ndarray
+            change of the global displacement increments, shape (no_dofs,)
+        max_ele_iterations : int
+        update_stiffness : bool
+            assemble the tangent stiffness, not needed by explicit integration
+        """
+        self._displacement_increment += change_in_increments
+        self._displacement = self._converged_displacement + self._displacement_increment
 
         #== steps 5-14 ==#
-        for element in self.elements:
-            indices = [index_from_dof(dof) for dof in element.dofs]
-            element.state_determination(
-                change_in_increments[:self.no_dofs][indices], max_ele_iterations)
+        iterative = self._state_determination == "iterative" or self._resolve_residuals
+        if iterative:
+            for element, indices in zip(self.elements, self._element_dof_indices):
+                element.state_determination(change_in_increments[indices], max_ele_iterations)
+            self._elements_converged = True
+        else:
+            self._elements_converged = all([
+                element.non_iterative_state_determination(
+                    change_in_increments[indices], max_ele_iterations
+                )
+                for element, indices in zip(self.elements, self._element_dof_indices)
+            ])
 
         #== step 15 ==#
-        self._update_stiffness_matrix()
-        for element in self.elements:
-            element.reset_section_residuals()
-
-        self._resisting_forces.fill(0.0)
-        for element in self.elements:
-            f_e = element.get_global_resisting_forces()
-            i = [index_from_dof(dof) for dof in element.dofs]
-            self._resisting_forces[i] += f_e
-
-        external_forces = self._get_external_force_vector() * self._load_factor
-
-        self._unbalanced_forces = external_forces - self._resisting_forces
-        for dof, value in self._dirichlet_conditions.items():
-            if value == 0:
-                self._unbalanced_forces[index_from_dof(dof)] = value
-
-        #== step 16 ==#
-        res = abs(np.linalg.norm(self._unbalanced_forces))
-        return res < self._tolerance, res
+        if update_stiffness:
+            self._update_stiffness_matrix()
+        if iterative:
+            for element in self.elements:
+                element.reset_section_residuals()
 
+        self._update_resisting_forces()
 
     def finalize_load_step(self):
+        self._step_started = False
+        self._resolve_residuals = False
+        self._previous_residual = np.inf
+        self._previous_increment = self._displacement_increment.copy()
+        self._previous_load_factor_increment = self._load_factor_increment
         self._displacement_increment.fill(0.0)
         self._load_factor_increment = 0.0
         self._converged_displacement = self._displacement
         self._converged_load_factor = self._load_factor
-        for node in self.nodes:
-            indices = [index_from_dof(DoF(node.id, dof_type)) for dof_type in "uvw"]
-            node.u, node.v, node.w = self._converged_displacement[indices]
+        self._update_nodes()
+        self._load_step += 1
+        self.convergence_statistics.finalize_load_step(
+            self._load_step,
+            [element.step_iterations for element in self.elements],
+            sum(element.step_section_iterations for element in self.elements),
+        )
         for element in self.elements:
             element.finalize_load_step()
+        for recorder in self._recorders:
+            recorder.record(self)
+
+    def save_checkpoint(self, path):
+        """
+        write the converged state of the analysis to a binary file.
+        only valid between load steps, i.e. after finalize_load_step
+
+        Parameters
+        ----------
+        path : str
+        """
+        sections = [section for element in self.elements for section in element.sections]
+        strains, stresses, material_sizes, material_state = (
+            np.concatenate(arrays) if arrays else np.zeros(0)
+            for arrays in zip(*(section.get_fiber_states() for section in sections))
+        )
+        with open(path, "wb") as wfile:
+            np.savez(
+                wfile,
+                version=CHECKPOINT_VERSION,
+                load_step=self._load_step,
+                load_factor=self._converged_load_factor,
+                controlled_dof_increment=self.controlled_dof_increment,
+                displacement=self._converged_displacement,
+                unbalanced_forces=self._unbalanced_forces,
+                # converged increments of the last load step for the secant predictor
+                previous_increment=(
+                    np.zeros(0) if self._previous_increment is None else self._previous_increment
+                ),
+                previous_load_factor_increment=self._previous_load_factor_increment,
+                element_forces=np.array([e.converged_resisting_forces for e in self.elements]),
+                section_forces=np.array([section.forces for section in sections]),
+                section_deformations=np.array([section.deformations for section in sections]),
+                fiber_strains=strains,
+                fiber_stresses=stresses,
+                material_sizes=material_sizes.astype(int),
+                material_state=material_state,
+            )
+
+    def load_checkpoint(self, path):
+        """
+        restore the state written by save_checkpoint. the structure has to be
+        the same model, the analysis resumes after the saved load step. the
+        recorders keep the rows of their result files up to that load step
+
+        Parameters
+        ----------
+        path : str
+        """
+        if self._stiffness_matrix is None:
+            self.initialize()
+        sections = [section for element in self.elements for section in element.sections]
+        no_fibers = [len(section.fiber_ids) for section in sections]
+
+        with np.load(path) as data:
+            if int(data["version"]) != CHECKPOINT_VERSION:
+                raise ValueError(f"Unsupported checkpoint version {int(data['version'])}")
+            material_sizes = data["material_sizes"]
+            if (
+                data["displacement"].size != self.no_dofs
+                or len(data["element_forces"]) != len(self.elements)
+                or len(data["section_forces"]) != len(sections)
+                or len(material_sizes) != sum(no_fibers)
+            ):
+                raise ValueError(f"Checkpoint {path} does not match the structure")
+
+            self._load_step = int(data["load_step"])
+            self._converged_load_factor = float(data["load_factor"])
+            self._load_factor = self._converged_load_factor
+            self._load_factor_increment = 0.0
+            self.controlled_dof_increment = float(data["controlled_dof_increment"])
+            self._converged_displacement = data["displacement"].copy()
+            self._displacement = self._converged_displacement
+            self._displacement_increment.fill(0.0)
+            self._step_started = False
+            self._resolve_residuals = False
+            self._previous_residual = np.inf
+            previous_increment = data["previous_increment"].copy()
+            self._previous_increment = previous_increment if previous_increment.size else None
+            self._previous_load_factor_increment = float(data["previous_load_factor_increment"])
+            self._unbalanced_forces = data["unbalanced_forces"].copy()
+            self._update_nodes()
+            self.convergence_statistics.truncate(self._load_step)
+
+            fiber_offsets = np.cumsum([0] + no_fibers)
+            state_offsets = np.concatenate(([0], np.cumsum(material_sizes)))
+            material_state = data["material_state"]
+            for i, section in enumerate(sections):
+                start, stop = fiber_offsets[i], fiber_offsets[i + 1]
+                section.restore_fiber_states(
+                    data["fiber_strains"][start:stop], data["fiber_stresses"][start:stop],
+                    material_sizes[start:stop],
+                    material_state[state_offsets[start]:state_offsets[stop]],
+                )
+            for i, section in enumerate(sections):
+                section.restore_state(data["section_forces"][i], data["section_deformations"][i])
+            for i, element in enumerate(self.elements):
+                element.restore_state(data["element_forces"][i])
+
+        self._update_stiffness_matrix()
+        self._update_resisting_forces()
+        for recorder in self._recorders:
+            recorder.resume(self)
 
 
     ####################################################################################
 
 
+    def _dof_index(self, dof):
+        return index_from_dof(dof, self._dof_index_map)
+
+    def _in_plane(self, dof_types, value):
+        """ dof types which exist in the structure. the out-of-plane dofs of
+        a planar structure can only be zero """
+        dofs = [dof_type for dof_type in dof_types if dof_type in self._dof_index_map]
+        if value != 0 and len(dofs) != len(dof_types):
+            raise ValueError(f"dofs {dof_types} do not exist in a planar structure")
+        return dofs
+
+    def _number_equations(self):
+        """
+        number the dofs which are stiffened by at least one element, i.e. have
+        a nonzero row in an element transform matrix. the others (e.g. the
+        torsion of fiber beams) are excluded from the equation system.
+        the nodes are renumbered with reverse Cuthill-McKee if that reduces
+        the bandwidth
+        """
+        active = np.zeros(self.no_dofs, dtype=bool)
+        mapped = np.any(self._geometry.transform_matrices != 0, axis=2)
+        active[self._element_dof_indices[mapped]] = True
+        controlled = self._controlled_dof
+        if controlled is not None and not active[self._dof_index(controlled)]:
+            raise RuntimeError(f"Controlled dof {controlled} is not stiffened by any element")
+        if not active.all():
+            events.emit(
+                events.INACTIVE_DOFS, events.INFO,
+                "Excluded {count} inactive dofs from the equation system",
+                count=self.no_dofs - np.count_nonzero(active),
+            )
+
+        self._set_equations(np.flatnonzero(active))
+        no_node_dofs = len(self._dof_index_map)
+        renumbered = np.array([
+            i
+            for node_id in reverse_cuthill_mckee(node_adjacency(self.elements))
+            for i in range(no_node_dofs * (node_id - 1), no_node_dofs * node_id)
+            if active[i]
+        ], dtype=int)
+        width = self._bandwidth
+        self._set_equations(renumbered)
+        if self._bandwidth >= width:
+            self._set_equations(np.flatnonzero(active))
+
+        if self._solver == "banded" and not banded_available():
+            raise ImportError("The banded solver needs scipy")
+        self._banded = self._solver == "banded" or (
+            self._solver == "auto"
+            and len(self._equations) >= BANDED_MIN_EQUATIONS
+            and banded_available()
+        )
+        if self._banded:
+            self._set_banded_indices()
+
+    def _set_equations(self, equations):
+        """ equations : global dof indices in the order of the equations """
+        self._equations = equations
+        self._equation_numbers = np.full(self.no_dofs, -1, dtype=int)
+        self._equation_numbers[equations] = np.arange(len(equations))
+        self._bandwidth = bandwidth(self._equation_numbers[self._element_dof_indices])
+
+    def _set_banded_indices(self):
+        """
+        positions of the element stiffness entries in the banded storage of the
+        stiffness matrix (diagonal ordered form, entry (i, j) in row
+        bandwidth + i - j and column j), without the excluded dofs
+        """
+        equations = self._equation_numbers[self._element_dof_indices]
+        rows = self._bandwidth + equations[:, :, None] - equations[:, None, :]
+        columns = np.broadcast_to(equations[:, None, :], rows.shape)
+        mask = (equations[:, :, None] >= 0) & (equations[:, None, :] >= 0)
+        self._banded_indices = (rows[mask], columns[mask], mask)
+        self._banded_stiffness = np.zeros((2 * self._bandwidth + 1, len(self._equations)))
+
     def _update_stiffness_matrix(self):
+        """
+        assemble the element stiffnesses, into the banded storage for the
+        banded solver and into the dense matrix otherwise
+        """
+        self._element_stiffness_matrices = self._geometry.global_matrices(
+            np.array([element.local_stiffness_matrix for element in self.elements])
+        )
+        if self._banded:
+            rows, columns, mask = self._banded_indices
+            self._banded_stiffness.fill(0.0)
+            np.add.at(self._banded_stiffness, (rows, columns),
+                      self._element_stiffness_matrices[mask])
+            self._stiffness_stale = True
+        else:
+            self._assemble_stiffness_matrix()
+
+    def _assemble_stiffness_matrix(self):
+        """ dense global stiffness matrix of the element stiffnesses of the last update """
         self._stiffness_matrix.fill(0.0)
-        for element in self.elements:
-            k_e = element.get_global_stiffness_matrix()
-            i = [index_from_dof(dof) for dof in element.dofs]
-            self._stiffness_matrix[np.ix_(i, i)] = k_e  # stiffness_matrix[i][:i] = k_e
+        i = self._element_dof_indices
+        np.add.at(self._stiffness_matrix, (i[:, :, None], i[:, None, :]),
+                  self._element_stiffness_matrices)
+        self._stiffness_stale = False
+
+    def _solve_linear_system(self, lhs, rhs):
+        if self._banded:
+            return solve_bordered_banded(*lhs, rhs, self._bandwidth)
+        return np.linalg.solve(lhs, rhs)
+
+    def _update_resisting_forces(self):
+        self._resisting_forces.fill(0.0)
+        f_e = np.einsum(
+            "eik,ek->ei", self._geometry.transform_matrices,
+            np.array([element.resisting_forces for element in self.elements]),
+        )
+        np.add.at(self._resisting_forces, self._element_dof_indices, f_e)
+
+    def _update_nodes(self):
+        for node in self.nodes:
+            for dof_type in "uvw":
+                if dof_type in self._dof_index_map:
+                    i = self._dof_index(DoF(node.id, dof_type))
+                    setattr(node, dof_type, self._converged_displacement[i])
+
+    def _get_fixed_equations(self):
+        """ equation numbers of the active dofs with homogenuous dirichlet conditions """
+        equations = [
+            self._equation_numbers[self._dof_index(dof)]
+            for dof, value in self._dirichlet_conditions.items() if value == 0
+        ]
+        return [i for i in equations if i >= 0]
 
     def _apply_homogenuous_dirichlet_BCs(self, matrix=None, vector=None):
+        """ matrix and vector of the equation system """
         if matrix is not None:
-            for dof, value in self._dirichlet_conditions.items():
-                if value == 0:
-                    i = index_from_dof(dof)
-                    matrix[:, i] = 0
-                    matrix[i, :] = 0
-                    matrix[i, i] = 1
+            for i in self._get_fixed_equations():
+                matrix[:, i] = 0
+                matrix[i, :] = 0
+                matrix[i, i] = 1
         if vector is not None:
-            for dof, value in self._dirichlet_conditions.items():
-                if value == 0:
-                    i = index_from_dof(dof)
-                    vector[i] = 0
+            for i in self._get_fixed_equations():
+                vector[i] = 0
 
     def _get_external_force_vector(self):
         external_forces = np.zeros(self.no_dofs)
         for dof, value in self._neumann_conditions.items():
-            external_forces[index_from_dof(self._controlled_dof)] += value
+            external_forces[self._dof_index(self._controlled_dof)] += value
         return external_forces
 
+    def _update_policy_weights(self):
+        """ component weights of the tolerance policy for all dofs """
+        if self._tolerance_policy is not None:
+            self._policy_weights = self._tolerance_policy.weights(
+                list(self._dof_index_map) * len(self._nodes)
+            )
+
+    def _converged(self, res, correction):
+        """ convergence test of the unbalanced forces after a correction """
+        if self._tolerance_policy is None:
+            return res < self._tolerance
+        return self._tolerance_policy.converged(
+            self._unbalanced_forces, correction, self._policy_weights,
+            (self._resisting_forces, self._displacement_increment),
+        )
+
+    def _update_unbalanced_forces(self):
+        external_forces = self._get_external_force_vector() * self._load_factor
+
+        self._unbalanced_forces = external_forces - self._resisting_forces
+        for dof, value in self._dirichlet_conditions.items():
+            if value == 0:
+                self._unbalanced_forces[self._dof_index(dof)] = value
+
+    def _line_search(self, solution, initial_projection, max_ele_iterations):
+        """
+        secant line search along a Newton-Raphson correction which has been
+        applied with the step length 1. the step length is changed until the
+        unbalanced forces projected onto the correction have decreased enough
+
+        Parameters
+        ----------
+        solution : ndarray
+            correction of the equations and the load factor
+        initial_projection : float
+            projected unbalanced forces before the correction
+        max_ele_iterations : int
+        """
+        direction = np.zeros(self.no_dofs)
+        direction[self._equations] = solution[:-1]
+        step_lengths = [0.0, 1.0]
+        projections = [initial_projection, self._unbalanced_forces @ direction]
+        for _ in range(LINE_SEARCH_TRIALS):
+            step_length = secant_step_length(step_lengths, projections)
+            if step_length is None:
+                return
+            change = step_length - step_lengths[-1]
+            self._load_factor_increment += change * solution[-1]
+            self._load_factor = self._converged_load_factor + self._load_factor_increment
+            self.update_state(change * direction, max_ele_iterations)
+            self._update_unbalanced_forces()
+            step_lengths.append(step_length)
+            projections.append(self._unbalanced_forces @ direction)
+
+    def _predict(self, max_ele_iterations):
+        """
+        secant predictor: state determination at the converged increments of
+        the previous load step, scaled to the controlled dof increment. no
+        prediction at the first load step and at reversals of the controlled dof.
+        returns whether a prediction was made
+        """
+        if self._predictor != "secant" or self._previous_increment is None:
+            return False
+        previous = self._previous_increment[self._dof_index(self._controlled_dof)]
+        if previous * self.controlled_dof_increment <= 0:
+            return False
+        ratio = self.controlled_dof_increment / previous
+        self._load_factor_increment = ratio * self._previous_load_factor_increment
+        self._load_factor = self._converged_load_factor + self._load_factor_increment
+        self.update_state(ratio * self._previous_increment, max_ele_iterations)
+        self._update_unbalanced_forces()
+        return True
+
     def _build_system_NR_displacement_control(self):
-        i = index_from_dof(self._controlled_dof)
-        dofs = self.no_dofs
+        """
+        bordered equation system of the displacement control with the
+        homogenuous dirichlet conditions. lhs is the dense matrix, or for the
+        banded solver the banded stiffness, the load column, the constraint
+        row and the corner entry
+        """
+        i = self._dof_index(self._controlled_dof)
+        equations = self._equations
+        dofs = len(equations)
+        fixed = self._get_fixed_equations()
 
-        lhs = np.zeros((dofs + 1, dofs + 1))
-        lhs[:dofs, :dofs] = self._stiffness_matrix # dr/du
-        lhs[:dofs, -1] = -self._get_external_force_vector() # dr/d lam
-        lhs[-1, i] = -1.0 # dr/dC
+        column = -self._get_external_force_vector()[equations] # dr/d lam
+        column[fixed] = 0
+        row = np.zeros(dofs)
+        row[self._equation_numbers[i]] = -1.0 # dr/dC
+        row[fixed] = 0
 
         rhs = np.zeros(dofs + 1)
-        rhs[:dofs] = self._unbalanced_forces # r
+        rhs[:dofs] = self._unbalanced_forces[equations] # r
         rhs[-1] = self._displacement_increment[i] - self.controlled_dof_increment # C
+
+        if self._banded:
+            stiffness = self._banded_stiffness.copy() # dr/du
+            width = self._bandwidth
+            for j in fixed:
+                stiffness[:, j] = 0
+                for k in range(max(j - width, 0), min(j + width + 1, dofs)):
+                    stiffness[width + j - k, k] = 0
+                stiffness[width, j] = 1
+            return (stiffness, column, row, 0.0), rhs
+
+        lhs = np.zeros((dofs + 1, dofs + 1))
+        lhs[:dofs, :dofs] = self._stiffness_matrix[np.ix_(equations, equations)] # dr/du
+        lhs[:dofs, -1] = column
+        lhs[-1, :dofs] = row
+        self._apply_homogenuous_dirichlet_BCs(lhs)
         return lhs, rhs
@@ -3,69 +3,53 @@ Example
 """
 
 import plotting as p
-from fe_code import io
+from fe_code import io, events, print_banner, set_print_options
+from fe_code.results import ResultWriter
+from fe_code.recorders import SectionRecorder
+from fe_code.model_io import cached_model
+from fe_code.protocol import LoadProtocol
 from models.column import *
 from disp_calc import *
 
 
-def advance_in_load(structure, load_step):
-    """ load stepping loop """
-
-    if load_step < STEPS[0]:
-        structure.controlled_dof_increment = STEP
-    elif load_step < STEPS[1]:
-        structure.controlled_dof_increment = -STEP
-    elif load_step < STEPS[2]:
-        structure.controlled_dof_increment = STEP
-    elif load_step < STEPS[3]:
-        structure.controlled_dof_increment = -STEP
-    elif load_step < STEPS[4]:
-        structure.controlled_dof_increment = STEP
-    elif load_step < STEPS[5]:
-        structure.controlled_dof_increment = -STEP
-    elif load_step < STEPS[6]:
-        structure.controlled_dof_increment = STEP
-    elif load_step < STEPS[7]:
-        structure.controlled_dof_increment = -STEP
-    elif load_step < STEPS[8]:
-        structure.controlled_dof_increment = STEP
-    elif load_step < STEPS[9]:
-        structure.controlled_dof_increment = -STEP
-    elif load_step < STEPS[10]:
-        structure.controlled_dof_increment = STEP
-    elif load_step < STEPS[11]:
-        structure.controlled_dof_increment = -STEP
-    elif load_step < STEPS[12]:
-        structure.controlled_dof_increment = STEP
-    elif load_step < STEPS[13]:
-        structure.controlled_dof_increment = -STEP
-    else:
-        structure.controlled_dof_increment = STEP
-
-
-def solution_loop(structure, result_filename="results.dat"):
+def solution_loop(structure, protocol, result_filename="results.res", restart_from=None,
+                  checkpoint_filename=None, checkpoint_every=100):
     max_nr_iterations = 10
     max_ele_iterations = 100
 
     structure.initialize()
+    keep_rows = None
+    if restart_from is not None:
+        structure.load_checkpoint(restart_from)
+        # the result file of the interrupted run is continued after the restored step
+        keep_rows = structure.load_step + 1
+        print(f":: Restarted from load step {structure.load_step} ::")
     print(":: Initialized the solver ::")
     print("\n:: Starting solution loop ::")
 
-    with open(result_filename, "w") as wfile:
-        wfile.write("#DISPLACEMENT LOAD\n")
-        wfile.write("0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0")
+    with ResultWriter.for_structure(result_filename, structure, keep_rows=keep_rows) as writer:
+        if restart_from is None:
+            writer.write_structure(structure)
 
-        for k in range(1, STEPS[-1]):
-            print(f"\nLOAD STEP : {k}")
-            advance_in_load(structure, k)
+        for k in range(structure.load_step + 1, len(protocol) + 1):
+            events.emit(events.STEP_STARTED, events.INFO, "\nLOAD STEP : {load_step}", load_step=k)
+            structure.controlled_dof_increment = protocol.increment(k)
 
             for i in range(1, max_nr_iterations + 1):
                 convergence, residual = structure.solve_NR_iteration(max_ele_iterations)
                 if convergence:
-                    print(f"NR converged with {i} iteration(s). Residual = {residual}")
+                    events.emit(
+                        events.NR_CONVERGED, events.INFO,
+                        "NR converged with {iterations} iteration(s). Residual = {residual}",
+                        load_step=k, iterations=i, residual=residual,
+                    )
                     break
                 if i == max_nr_iterations:
-                    io.warning(f"Newton-Raphson did not converge {max_nr_iterations} iterations")
+                    events.emit(
+                        events.NR_NOT_CONVERGED, events.WARNING,
+                        "Newton-Raphson did not converge {iterations} iterations",
+                        load_step=k, iterations=i, residual=residual,
+                    )
                     io.warning("FATAL ERROR: The solution is unstable")
                     break
             if i == max_nr_iterations:
@@ -73,29 +57,33 @@ def solution_loop(structure, result_filename="results.dat"):
 
             structure.finalize_load_step()
 
-            displacements = structure.get_displacements()
-            loads = structure.get_forces()
-            for disp in displacements:
-                wfile.write(str(disp)+" ")
-            for load in loads:
-                wfile.write(str(load)+" ")
-            wfile.write("\n")
+            writer.write_structure(structure)
+            if checkpoint_filename is not None and k % checkpoint_every == 0:
+                structure.save_checkpoint(checkpoint_filename)
 
+    structure.close_recorders()
     print("\n:: Finished solution loop ::")
 
 
 if __name__ == "__main__":
+    print_banner()
+    set_print_options()
+    events.set_level(events.INFO)
     STEP = 0.4
-    STEPS = calculate_loadsteps(STEP)
-    STRUCTURE = model1_3()
+    PROTOCOL = LoadProtocol.from_boundaries(STEP, calculate_loadsteps(STEP))
+    STRUCTURE = cached_model(model1_3)
     # p.plot_disctrized_2d(STRUCTURE.get_element(1).get_section(1))
+    STRUCTURE.add_recorder(SectionRecorder(1, [1], filename="moment_curvature.res"))
 
-    solution_loop(STRUCTURE)
+    solution_loop(STRUCTURE, PROTOCOL)
+    STRUCTURE.convergence_statistics.write("convergence.res", "residuals.res")
+    print(STRUCTURE.convergence_statistics.summary())
 
     # import matplotlib.pyplot as plt
-    # data = np.loadtxt("results.dat", usecols=(8, 14))
+    # from fe_code.results import open_results
+    # data = open_results("results.res")
     # fig = plt.figure()
     # ax = fig.add_subplot(111)
-    # ax.plot(data[:,0], -data[:,1])
+    # ax.plot(data["disp", 2, "w"], -data["force", 1, "w"])
     # ax.grid()
     # plt.show()
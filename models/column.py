@@ -1,11 +1,34 @@
-import numpy as np
 from math import sqrt, pi
 
 from fe_code import io, Structure, MenegottoPinto, KentPark
-
-
-def model1_1():
-    """ initiate the structural model """
+from fe_code.section_builder import (
+    build_section, rectangular_patch, straight_layer, add_to_section
+)
+
+
+def _bar_row(no_bars, bar_size, half_width, z, bar_material_id, gap_material_id):
+    """
+    row of square bars between the side covers with a concrete fiber in every
+    gap between two bars
+
+    Returns
+    -------
+    bars : FiberArrays
+    gaps : list of FiberArrays
+    """
+    y = half_width - bar_size / 2
+    bars = straight_layer(no_bars, bar_size ** 2, -y, z, y, z, bar_material_id)
+    spacing = (2 * half_width - no_bars * bar_size) / (no_bars - 1)
+    gaps = list()
+    for i in range(no_bars - 1):
+        y_min = -half_width + bar_size + i * (spacing + bar_size)
+        gaps.append(rectangular_patch(y_min, z - bar_size / 2, y_min + spacing, z + bar_size / 2,
+                                      1, 1, gap_material_id))
+    return bars, gaps
+
+
+def model1_1(planar=False):
+    """ initiate the structural model, in the planar mode if planar """
 
     length = 100
     width = 5
@@ -16,7 +39,7 @@ def model1_1():
     no_sections = 4
 
     # STRUCTURE INITIALIZATION
-    stru = Structure()
+    stru = Structure(planar)
     print("Constructed an empty stucture.")
 
     # NODES
@@ -36,30 +59,23 @@ def model1_1():
     # FIBERS
     w = width / no_fibers_y
     h = height / no_fibers_z
-    fiber_area = w * h
+    y_bar = width / 2 - 1.5 * w
+    z_bar = height / 2 - 1.5 * h
+    fibers = build_section(
+        [rectangular_patch(-width / 2, -height / 2, width / 2, height / 2, no_fibers_y,
+                           no_fibers_z, 0)],
+        [
+            straight_layer(2, w * h, -y_bar, -z_bar, y_bar, -z_bar, 1),
+            straight_layer(2, w * h, -y_bar, z_bar, y_bar, z_bar, 1),
+        ],
+    )
+    materials = [
+        lambda: KentPark(6.95, 770, 0.0027),
+        lambda: MenegottoPinto(29000, 0.0042, 60, 20, 18.5, 0.0002),
+    ]
     counter = 1
     for section in stru.get_element(1).sections:
-        for i in range(no_fibers_y):
-            # y = width / no_fibers_y * (i + 0.5)
-            y = 0.5 * (w - width) + i * w
-            for j in range(no_fibers_z):
-                # z = height / no_fibers_z * (j + 0.5)
-                z = 0.5 * (h - height) + j * h
-                if i in (1, no_fibers_y-2) and j in (1, no_fibers_z-2):
-                    section.add_fiber(
-                        counter,
-                        y,
-                        z,
-                        fiber_area,
-                        MenegottoPinto(29000, 0.0042, 60, 20, 18.5, 0.0002),
-                        w,
-                        h,
-                    )
-                else:
-                    section.add_fiber(
-                        counter, y, z, fiber_area, KentPark(6.95, 770, 0.0027), w, h
-                    )
-                counter += 1
+        counter = add_to_section(section, fibers, materials, counter)
     print(f"Added {counter - 1} fibers.")
 
     # CONVERGENCE TOLERANCE VALUES
@@ -76,7 +92,7 @@ def model1_1():
     return stru
 
 
-def model1_c():
+def model1_c(planar=False):
     """ needs FIX
     initiate the structural model """
 
@@ -89,7 +105,7 @@ def model1_c():
     no_sections = 4
 
     # STRUCTURE INITIALIZATION
-    stru = Structure()
+    stru = Structure(planar)
     print("Constructed an empty stucture.")
 
     # NODES
@@ -109,28 +125,21 @@ def model1_c():
     # FIBERS
     w = width / no_fibers_y
     h = height / no_fibers_x
-    fiber_area = w * h
+    fibers = build_section(
+        [rectangular_patch(0.0, 0.0, width, height, no_fibers_y, no_fibers_x, 0)],
+        [
+            straight_layer(2, w * h, 1.5 * w, 1.5 * h, width - 1.5 * w, 1.5 * h, 1),
+            straight_layer(2, w * h, 1.5 * w, height - 1.5 * h, width - 1.5 * w,
+                           height - 1.5 * h, 1),
+        ],
+    )
+    materials = [
+        lambda: KentPark(6.95, 770, 0.0027),
+        lambda: MenegottoPinto(29000, 0.0042, 60, 20, 18.5, 0.0002),
+    ]
     counter = 1
     for section in stru.get_element(1).sections:
-        for i in range(no_fibers_y):
-            y = width / no_fibers_y * (i + 0.5)
-            for j in range(no_fibers_x):
-                z = height / no_fibers_x * (j + 0.5)
-                if i in (1, 13) and j in (1, 18):
-                    section.add_fiber(
-                        counter,
-                        y,
-                        z,
-                        fiber_area,
-                        MenegottoPinto(29000, 0.0042, 60, 20, 18.5, 0.0002),
-                        w,
-                        h,
-                    )
-                else:
-                    section.add_fiber(
-                        counter, y, z, fiber_area, KentPark(6.95, 770, 0.0027), w, h
-                    )
-                counter += 1
+        counter = add_to_section(section, fibers, materials, counter)
     print(f"Added {counter - 1} fibers.")
 
     # CONVERGENCE TOLERANCE VALUES
@@ -147,8 +156,8 @@ def model1_c():
     return stru
 
 
-def model1_2():
-    """ initiate the structural model """
+def model1_2(planar=False):
+    """ initiate the structural model, in the planar mode if planar """
 
     length = 100
     width = 4 + 15/16
@@ -159,7 +168,7 @@ def model1_2():
     no_sections = 3
 
     # STRUCTURE INITIALIZATION
-    stru = Structure()
+    stru = Structure(planar)
     print("Constructed an empty stucture.")
 
     # NODES
@@ -177,75 +186,35 @@ def model1_2():
     print(f"Added {sum([len(element.sections) for element in stru.elements])} sections.")
 
     # FIBERS
+    y_core = width / 2 - cover_y
+    z_core = height / 2 - cover_z
+    bar_area = pi * (0.5 / 2) ** 2
+    # the bars do not displace the concrete
+    fibers = build_section(
+        [
+            # confined concrete
+            rectangular_patch(-y_core, -z_core, y_core, z_core, 2, 12, 0),
+            # unconfined sides
+            rectangular_patch(-width / 2, -z_core, -y_core, z_core, 1, 10, 1),
+            rectangular_patch(y_core, -z_core, width / 2, z_core, 1, 10, 1),
+            # unconfined bottom and top
+            rectangular_patch(-width / 2, -height / 2, width / 2, -z_core, 2, 4, 1),
+            rectangular_patch(-width / 2, z_core, width / 2, height / 2, 2, 4, 1),
+        ],
+        [
+            straight_layer(2, bar_area, -y_core, -z_core, y_core, -z_core, 2),
+            straight_layer(2, bar_area, -y_core, z_core, y_core, z_core, 2),
+        ],
+        subtract_overlap=False,
+    )
+    materials = [
+        lambda: KentPark.eu(6.95, 0.03810, 0.0027),
+        lambda: KentPark.eu(6.95, 0.00292, 0.0027),
+        lambda: MenegottoPinto(29000, 0.0042, 48.4, 20, 18.5, 0.0002),
+    ]
     counter = 1
-
-    # == confined concrete
-    no_y = 2
-    no_z = 12
-    y = width / 2 - cover_y
-    y = y - y / no_y
-    z = height / 2 - cover_z
-    z = z - z / no_z
-    w = ((width / 2) - cover_y) / (no_y / 2)
-    h = ((height / 2) - cover_z) / (no_z / 2)
-    area = w * h
-    ys = np.tile(np.linspace(-y, y, no_y), no_z)
-    zs = np.repeat(np.linspace(-z, z, no_z), no_y)
-    for section in stru.get_element(1).sections:
-        for y, z in zip(ys, zs):
-            section.add_fiber(counter, y, z, area, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
-
-    # == unconfined sides
-    y = (width / 2) - (cover_y / 2)
-    z = (height / 2) - cover_z
-    z = z - z / 10
-    w = cover_y
-    h = ((height / 2) - cover_z) / 5
-    area = w * h
-    ys = np.tile(np.linspace(-y, y, 2), 10)
-    zs = np.repeat(np.linspace(-z, z, 10), 2)
-    for section in stru.get_element(1).sections:
-        for y, z in zip(ys, zs):
-            section.add_fiber(counter, y, z, area, KentPark.eu(6.95, 0.00292, 0.0027), w, h)
-            counter += 1
-
-    # == unconfined bottom
-    y = (width / 2) / 2
-    zmin = (height / 2) - ((cover_z / 4) / 2)
-    zmax = (height / 2) - cover_z + ((cover_z / 4) / 2)
-    w = width / 2
-    h = cover_z / 4
-    area = w * h
-    ys = np.tile(np.linspace(-y, y, 2), 4)
-    zs = np.repeat(np.linspace(-zmin, -zmax, 4), 2)
-    for section in stru.get_element(1).sections:
-        for y, z in zip(ys, zs):
-            section.add_fiber(counter, y, z, area, KentPark.eu(6.95, 0.00292, 0.0027), w, h)
-            counter += 1
-
-    # == unconfined top
-    ys = np.tile(np.linspace(-y, y, 2), 4)
-    zs = np.repeat(np.linspace(zmin, zmax, 4), 2)
-    for section in stru.get_element(1).sections:
-        for y, z in zip(ys, zs):
-            section.add_fiber(counter, y, z, area, KentPark.eu(6.95, 0.00292, 0.0027), w, h)
-            counter += 1
-
-    # == steel
-    y = (width / 2) - cover_y
-    z = (height / 2) - cover_z
-    ys = [-y, y, -y, y]
-    zs = [-z, -z, z, z]
-    area = pi * (0.5 / 2) ** 2
-    w = sqrt(area)
-    h = sqrt(area)
     for section in stru.get_element(1).sections:
-        for y, z in zip(ys, zs):
-            section.add_fiber(
-                counter, y, z, area, MenegottoPinto(29000, 0.0042, 48.4, 20, 18.5, 0.0002), w, h
-            )
-            counter += 1
+        counter = add_to_section(section, fibers, materials, counter)
 
     print(f"Added {counter - 1} fibers.")
 
@@ -263,8 +232,8 @@ def model1_2():
     return stru
 
 
-def model1_3():
-    """ initiate the structural model """
+def model1_3(planar=False):
+    """ initiate the structural model, in the planar mode if planar """
 
     length = 100
     width = 4 + 15/16
@@ -284,7 +253,7 @@ def model1_3():
     no_sections = 4
 
     # STRUCTURE INITIALIZATION
-    stru = Structure()
+    stru = Structure(planar)
     print("Constructed an empty stucture.")
 
     # NODES
@@ -302,111 +271,38 @@ def model1_3():
     print(f"Added {sum([len(element.sections) for element in stru.elements])} sections.")
 
     # FIBERS
+    y_core = width / 2 - sidesCover
+    z_bottom = -height / 2 + bottomCover
+    z_top = height / 2 - topCover
+    # the bar rows leave room for the bars, which do not displace concrete
+    bottom_bars, bottom_gaps = _bar_row(
+        bottomNumberOfSteelRebars, bottomBarsDia, y_core, z_bottom + bottomBarsDia / 2, 1, 0
+    )
+    top_bars, top_gaps = _bar_row(
+        topNumberOfSteelRebars, topBarsDia, y_core, z_top - topBarsDia / 2, 1, 0
+    )
+    fibers = build_section(
+        bottom_gaps + top_gaps + [
+            # confined concrete
+            rectangular_patch(-y_core, z_bottom + bottomBarsDia, y_core, z_top - topBarsDia,
+                              2, confinedConcrete, 0),
+            # sides concrete
+            rectangular_patch(-width / 2, z_bottom, -y_core, z_top, 1, sideConcrete, 0),
+            rectangular_patch(y_core, z_bottom, width / 2, z_top, 1, sideConcrete, 0),
+            # top and bottom concrete
+            rectangular_patch(-width / 2, z_top, width / 2, height / 2, 2, topConcrete, 0),
+            rectangular_patch(-width / 2, -height / 2, width / 2, z_bottom, 2, bottomConcrete, 0),
+        ],
+        [bottom_bars, top_bars],
+        subtract_overlap=False,
+    )
+    materials = [
+        lambda: KentPark.eu(6.95, 0.03810, 0.0027),
+        lambda: MenegottoPinto(29000, 0.0042, 48.4, 20, 18.5, 0.0002),
+    ]
     counter = 1
-
-    # bottom steel
-    val = (width-2*sidesCover-bottomBarsDia) / 2
-    ys = np.linspace(-val, val, bottomNumberOfSteelRebars)
-    z = height/2 - bottomCover - bottomBarsDia/2
-    w = bottomBarsDia
-    h = bottomBarsDia
-    for section in stru.get_element(1).sections:
-        for y in ys:
-            section.add_fiber(
-                counter, y, -z, w*h, MenegottoPinto(29000, 0.0042, 48.4, 20, 18.5, 0.0002), w, h
-            )
-            counter += 1
-    spacing = (width-2*sidesCover-bottomNumberOfSteelRebars*bottomBarsDia)/(bottomNumberOfSteelRebars-1)
-    val = width/2 - sidesCover - bottomBarsDia - spacing/2
-    ys = np.linspace(-val, val, bottomNumberOfSteelRebars-1)
-    h = bottomBarsDia
-    w = spacing
-    for section in stru.get_element(1).sections:
-        for y in ys:
-            section.add_fiber(counter, y, -z, w*h, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
-
-    # top steel
-    val = (width-2*sidesCover-topBarsDia) / 2
-    ys = np.linspace(-val, val, topNumberOfSteelRebars)
-    z = height/2 - topCover - topBarsDia/2
-    w = topBarsDia
-    h = topBarsDia
-    for section in stru.get_element(1).sections:
-        for y in ys:
-            section.add_fiber(
-                counter, y, z, w*h, MenegottoPinto(29000, 0.0042, 48.4, 20, 18.5, 0.0002), w, h
-            )
-            counter += 1
-    spacing = (width-2*sidesCover-topNumberOfSteelRebars*topBarsDia)/(topNumberOfSteelRebars-1)
-    val = width/2 - sidesCover - topBarsDia - spacing/2
-    ys = np.linspace(-val, val, topNumberOfSteelRebars-1)
-    w = spacing
-    h = topBarsDia
     for section in stru.get_element(1).sections:
-        for y in ys:
-            section.add_fiber(counter, y, z, w*h, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
-
-    # confined concrete
-    total = height-bottomCover-topCover-topBarsDia-bottomBarsDia
-    area = (width/2 - sidesCover) * (total/confinedConcrete)
-    val1 = height/2 - bottomCover - bottomBarsDia - total/confinedConcrete/2
-    val2 = height/2 - topCover - topBarsDia - total/confinedConcrete/2
-    zs = np.linspace(-val1, val2, confinedConcrete)
-    y = (width/2 - sidesCover)/2
-    w = width/2 - sidesCover
-    h = total/confinedConcrete
-    for section in stru.get_element(1).sections:
-        for z in zs:
-            section.add_fiber(counter, -y, z, w*h, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
-            section.add_fiber(counter, y, z, w*h, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
-
-    # sides concrete
-    total = height-bottomCover-topCover
-    area = (sidesCover) * (total/sideConcrete)
-    val1 = height/2 - bottomCover - total/sideConcrete/2
-    val2 = height/2 - topCover - total/sideConcrete/2
-    zs = np.linspace(-val1, val2, sideConcrete)
-    y = width/2 - sidesCover/2
-    w = sidesCover
-    h = total/sideConcrete
-    for section in stru.get_element(1).sections:
-        for z in zs:
-            section.add_fiber(counter, -y, z, w*h, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
-            section.add_fiber(counter, y, z, w*h, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
-
-    # top concrete
-    val1 = height/2 - topCover + topCover/topConcrete/2
-    val2 = height/2 - topCover/topConcrete/2
-    zs = np.linspace(val1, val2, topConcrete)
-    y = width/4
-    w = width/2
-    h = topCover/topConcrete
-    for section in stru.get_element(1).sections:
-        for z in zs:
-            section.add_fiber(counter, -y, z, w*h, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
-            section.add_fiber(counter, y, z, w*h, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
-
-    # bottom concrete
-    val1 = height/2 - bottomCover + bottomCover/bottomConcrete/2
-    val2 = height/2 - bottomCover/bottomConcrete/2
-    zs = np.linspace(-val1, -val2, bottomConcrete)
-    y = width/4
-    w = width/2
-    h = bottomCover/bottomConcrete
-    for section in stru.get_element(1).sections:
-        for z in zs:
-            section.add_fiber(counter, -y, z, w*h, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
-            section.add_fiber(counter, y, z, w*h, KentPark.eu(6.95, 0.03810, 0.0027), w, h)
-            counter += 1
+        counter = add_to_section(section, fibers, materials, counter)
 
     print(f"Added {counter - 1} fibers.")
 
@@ -424,8 +320,8 @@ def model1_3():
     return stru
 
 
-def model2():
-    """ initiate the structural model """
+def model2(planar=False):
+    """ initiate the structural model, in the planar mode if planar """
 
     length = 71
     width = 9
@@ -447,7 +343,7 @@ def model2():
     no_sections = 2
 
     # STRUCTURE INITIALIZATION
-    stru = Structure()
+    stru = Structure(planar)
     print("Constructed an empty stucture.")
 
     # NODES
@@ -465,117 +361,41 @@ def model2():
     print(f"Added {sum([len(element.sections) for element in stru.elements])} sections.")
 
     # FIBERS
+    # the bottom of the section lies at positive z
+    y_core = width / 2 - sidesCover
+    z_bottom = height / 2 - bottomCover
+    z_top = -height / 2 + topCover
+    # the bar rows leave room for the bars, which do not displace concrete
+    bottom_bars, bottom_gaps = _bar_row(
+        bottomNumberOfSteelRebars, bottomBarsDia, y_core, z_bottom - bottomBarsDia / 2, 3, 1
+    )
+    top_bars, top_gaps = _bar_row(
+        topNumberOfSteelRebars, topBarsDia, y_core, z_top + topBarsDia / 2, 3, 1
+    )
+    fibers = build_section(
+        bottom_gaps + top_gaps + [
+            # confined concrete
+            rectangular_patch(-y_core, z_top + topBarsDia, y_core, z_bottom - bottomBarsDia,
+                              2, confinedConcrete, 0),
+            # sides concrete
+            rectangular_patch(-width / 2, z_top, -y_core, z_bottom, 1, sideConcrete, 2),
+            rectangular_patch(y_core, z_top, width / 2, z_bottom, 1, sideConcrete, 2),
+            # top and bottom concrete
+            rectangular_patch(-width / 2, -height / 2, width / 2, z_top, 1, topConcrete, 2),
+            rectangular_patch(-width / 2, z_bottom, width / 2, height / 2, 1, bottomConcrete, 2),
+        ],
+        [bottom_bars, top_bars],
+        subtract_overlap=False,
+    )
+    materials = [
+        lambda: KentPark.eu(5.43, 0.069, 0.00265),
+        lambda: KentPark.eu(5.43, 0.069, 0.00214),
+        lambda: KentPark.eu(5.07, 0.003, 0.002),
+        lambda: MenegottoPinto(29000, 0.0085, 66.5, 20, 18.5, 0.0002),
+    ]
     counter = 1
-
-    # bottom steel
-    val = (width-2*sidesCover-bottomBarsDia) / 2
-    ys = np.linspace(-val, val, bottomNumberOfSteelRebars)
-    z = height/2 - bottomCover - bottomBarsDia/2
-    w = bottomBarsDia
-    h = bottomBarsDia
-    for section in stru.get_element(1).sections:
-        for y in ys:
-            section.add_fiber(
-                counter, y, z, w*h, MenegottoPinto(29000, 0.0085, 66.5, 20, 18.5, 0.0002), w, h
-            )
-            counter += 1
-    spacing = (width-2*sidesCover-bottomNumberOfSteelRebars*bottomBarsDia)/(bottomNumberOfSteelRebars-1)
-    val = width/2 - sidesCover - bottomBarsDia - spacing/2
-    ys = np.linspace(-val, val, bottomNumberOfSteelRebars-1)
-    h = bottomBarsDia
-    w = spacing
-    for section in stru.get_element(1).sections:
-        for y in ys:
-            section.add_fiber(counter, y, z, w*h, KentPark.eu(5.43, 0.069, 0.00214), w, h)
-            counter += 1
-
-    # top steel
-    val = (width-2*sidesCover-topBarsDia) / 2
-    ys = np.linspace(-val, val, topNumberOfSteelRebars)
-    z = height/2 - topCover - topBarsDia/2
-    w = topBarsDia
-    h = topBarsDia
-    for section in stru.get_element(1).sections:
-        for y in ys:
-            section.add_fiber(
-                counter, y, -z, w*h, MenegottoPinto(29000, 0.0085, 66.5, 20, 18.5, 0.0002), w, h
-            )
-            counter += 1
-    spacing = (width-2*sidesCover-topNumberOfSteelRebars*topBarsDia)/(topNumberOfSteelRebars-1)
-    val = width/2 - sidesCover - topBarsDia - spacing/2
-    ys = np.linspace(-val, val, topNumberOfSteelRebars-1)
-    w = spacing
-    h = topBarsDia
-    for section in stru.get_element(1).sections:
-        for y in ys:
-            section.add_fiber(counter, y, -z, w*h, KentPark.eu(5.43, 0.069, 0.00214), w, h)
-            counter += 1
-
-    # confined concrete
-    total = height-bottomCover-topCover-topBarsDia-bottomBarsDia
-    area = (width/2 - sidesCover) * (total/confinedConcrete)
-    val1 = height/2 - bottomCover - bottomBarsDia - total/confinedConcrete/2
-    val2 = height/2 - topCover - topBarsDia - total/confinedConcrete/2
-    zs = np.linspace(-val1, val2, confinedConcrete)
-    y = (width/2 - sidesCover)/2
-    w = width/2 - sidesCover
-    h = total/confinedConcrete
-    for section in stru.get_element(1).sections:
-        for z in zs:
-            section.add_fiber(counter, -y, -z, w*h, KentPark.eu(5.43, 0.069, 0.00265), w, h)
-            counter += 1
-            section.add_fiber(counter, y, -z, w*h, KentPark.eu(5.43, 0.069, 0.00265), w, h)
-            counter += 1
-
-    # sides concrete
-    total = height-bottomCover-topCover
-    area = (sidesCover) * (total/sideConcrete)
-    val1 = height/2 - bottomCover - total/sideConcrete/2
-    val2 = height/2 - topCover - total/sideConcrete/2
-    zs = np.linspace(-val1, val2, sideConcrete)
-    y = width/2 - sidesCover/2
-    w = sidesCover
-    h = total/sideConcrete
-    for section in stru.get_element(1).sections:
-        for z in zs:
-            section.add_fiber(counter, -y, -z, w*h, KentPark.eu(5.07, 0.003, 0.002), w, h)
-            counter += 1
-            section.add_fiber(counter, y, -z, w*h, KentPark.eu(5.07, 0.003, 0.002), w, h)
-            counter += 1
-
-    # top concrete
-    val1 = height/2 - topCover + topCover/topConcrete/2
-    val2 = height/2 - topCover/topConcrete/2
-    zs = np.linspace(val1, val2, topConcrete)
-    y = width/4
-    # w = width/2
-    w = width
-    h = topCover/topConcrete
-    for section in stru.get_element(1).sections:
-        for z in zs:
-            # section.add_fiber(counter, -y, z, w*h, KentPark.eu(5.07, 0.003, 0.002), w, h)
-            # counter += 1
-            # section.add_fiber(counter, y, z, w*h, KentPark.eu(5.07, 0.003, 0.002), w, h)
-            # counter += 1
-            section.add_fiber(counter, 0, -z, w*h, KentPark.eu(5.07, 0.003, 0.002), w, h)
-            counter += 1
-
-    # bottom concrete
-    val1 = height/2 - bottomCover + bottomCover/bottomConcrete/2
-    val2 = height/2 - bottomCover/bottomConcrete/2
-    zs = np.linspace(-val1, -val2, bottomConcrete)
-    y = width/4
-    # w = width/2
-    w = width
-    h = bottomCover/bottomConcrete
     for section in stru.get_element(1).sections:
-        for z in zs:
-            # section.add_fiber(counter, -y, z, w*h, KentPark.eu(5.07, 0.003, 0.002), w, h)
-            # counter += 1
-            # section.add_fiber(counter, y, z, w*h, KentPark.eu(5.07, 0.003, 0.002), w, h)
-            # counter += 1
-            section.add_fiber(counter, 0, -z, w*h, KentPark.eu(5.07, 0.003, 0.002), w, h)
-            counter += 1
+        counter = add_to_section(section, fibers, materials, counter)
 
     print(f"Added {counter - 1} fibers.")
 
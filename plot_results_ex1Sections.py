@@ -3,37 +3,14 @@ import matplotlib
 matplotlib.rcParams['text.usetex'] = True
 import matplotlib.pyplot as plt
 
+from fe_code.results import open_results
 
-#  0: disp_x_1
-#  1: disp_y_1
-#  2: disp_z_1
-#  3:  rot_x_1
-#  4:  rot_y_1
-#  5:  rot_z_1
-#  6: disp_x_2
-#  7: disp_y_2
-#  8: disp_z_2
-#  9:  rot_x_2
-# 10:  rot_y_2
-# 11:  rot_z_2
-# 12: forc_x_1
-# 13: forc_y_1
-# 14: forc_z_1
-# 15:  mom_x_1
-# 16:  mom_y_1
-# 17:  mom_z_1
-# 18: forc_x_2
-# 19: forc_y_2
-# 20: forc_z_2
-# 21:  mom_x_2
-# 22:  mom_y_2
-# 23:  mom_z_2
 
 # dataEX = np.loadtxt("ex1exper.csv", delimiter=",", skiprows=1)
-data03 = np.loadtxt("results_ex1_3sections_0_4.dat", usecols=(10, 16))
-data06 = np.loadtxt("results_ex1_6sections_0_01.dat", usecols=(10, 16))
-data10 = np.loadtxt("results_ex1_10sections_0_01.dat", usecols=(10, 16))
-data20 = np.loadtxt("results_ex1_20sections_0_004.dat", usecols=(10, 16))
+data03 = open_results("results_ex1_3sections_0_4.dat")
+data06 = open_results("results_ex1_6sections_0_01.dat")
+data10 = open_results("results_ex1_10sections_0_01.dat")
+data20 = open_results("results_ex1_20sections_0_004.dat")
 
 colors = {
 	"TUM_blue1" : (0/255., 82/255., 147/255.),
@@ -51,10 +28,10 @@ colors = {
 fig = plt.figure()
 ax = fig.add_subplot(111)
 # ax.plot(dataEX[:,0], dataEX[:,1], "--", color="black", label="Experiment")
-ax.plot(-data03[:,0]*1e6/40, data03[:,1], "--", color=colors["TUM_grey2"], label="3 sections")
-ax.plot(-data06[:,0]*1e6/40, data06[:,1], ":",  color=colors["TUM_orange"], label="6 sections")
-ax.plot(-data10[:,0]*1e6/40, data10[:,1], "-*",  color=colors["TUM_green"], label="10 sections", markevery=20)
-ax.plot(-data20[:,0]*1e6/40, data20[:,1], "-",  color=colors["TUM_blue1"], label="20 sections")
+ax.plot(-data03["disp", 2, "y"]*1e6/40, data03["force", 1, "y"], "--", color=colors["TUM_grey2"], label="3 sections")
+ax.plot(-data06["disp", 2, "y"]*1e6/40, data06["force", 1, "y"], ":",  color=colors["TUM_orange"], label="6 sections")
+ax.plot(-data10["disp", 2, "y"]*1e6/40, data10["force", 1, "y"], "-*",  color=colors["TUM_green"], label="10 sections", markevery=20)
+ax.plot(-data20["disp", 2, "y"]*1e6/40, data20["force", 1, "y"], "-",  color=colors["TUM_blue1"], label="20 sections")
 ax.set(
 	title=r"Moment - Curvature",
 	xlabel=r"$\phi_y [\mu~rad/in]$",
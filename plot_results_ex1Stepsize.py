@@ -3,9 +3,11 @@ matplotlib.rcParams['text.usetex'] = True
 import matplotlib.pyplot as plt
 import numpy as np
 
-data04 = np.loadtxt("results_ex1_4sections_0_4.dat", usecols=(10, 16))
-data01 = np.loadtxt("results_ex1_4sections_0_1.dat", usecols=(10, 16))
-data005 = np.loadtxt("results_ex1_4sections_0_05.dat", usecols=(10, 16))
+from fe_code.results import open_results
+
+data04 = open_results("results_ex1_4sections_0_4.dat")
+data01 = open_results("results_ex1_4sections_0_1.dat")
+data005 = open_results("results_ex1_4sections_0_05.dat")
 
 colors = {
 	"TUM_blue1" : (0/255, 82/255, 147/255),
@@ -22,9 +24,9 @@ colors = {
 
 fig = plt.figure()
 ax = fig.add_subplot(111)
-ax.plot(-data04[:,0]*1e6/40, data04[:,1], "-*", color=colors["TUM_orange"], label="0.4")
-ax.plot(-data01[:,0]*1e6/40, data01[:,1], "--", color=colors["TUM_grey1"], label="0.1")
-ax.plot(-data005[:,0]*1e6/40, data005[:,1], "-", color=colors["TUM_blue1"], label="0.05")
+ax.plot(-data04["disp", 2, "y"]*1e6/40, data04["force", 1, "y"], "-*", color=colors["TUM_orange"], label="0.4")
+ax.plot(-data01["disp", 2, "y"]*1e6/40, data01["force", 1, "y"], "--", color=colors["TUM_grey1"], label="0.1")
+ax.plot(-data005["disp", 2, "y"]*1e6/40, data005["force", 1, "y"], "-", color=colors["TUM_blue1"], label="0.05")
 ax.set(
 	title=r"Load - Displacement",
 	xlabel=r"Displacement in Z direction [in]",
@@ -4,10 +4,14 @@ matplotlib.rcParams['text.usetex'] = True
 import matplotlib.pyplot as plt
 import numpy as np
 
-# data2 = np.loadtxt("results_ex2_2sections_0_1.dat", usecols=(8, 20), max_rows=10)
-# data3 = np.loadtxt("results_ex2_3sections_0_1.dat", usecols=(8, 20), max_rows=10)
-data4 = np.loadtxt("results_ex2_4sections0_01.dat")
-# data6 = np.loadtxt("results_ex2_6sections0_005.dat")
+from fe_code.results import open_results
+
+COLUMNS = [("disp", 2, "w"), ("force", 2, "w")]
+
+# data2 = open_results("results_ex2_2sections_0_1.dat")
+# data3 = open_results("results_ex2_3sections_0_1.dat")
+data4 = open_results("results_ex2_4sections0_01.dat", COLUMNS)
+# data6 = open_results("results_ex2_6sections0_005.dat", COLUMNS)
 
 colors = {
 	"TUM_blue1" : (0/255, 82/255, 147/255),
@@ -24,10 +28,10 @@ colors = {
 
 fig = plt.figure()
 ax = fig.add_subplot(111)
-# ax.plot(data2[:,0], data2[:,1], "--", color=colors["TUM_grey1"], label="2 sections")
-# ax.plot(data3[:,0], data3[:,1], "-.", color=colors["TUM_orange"], label="3 sections")
-# ax.plot(data4[:,0], data4[:,1], "-*", color=colors["TUM_grey2"], label="4 sections", markevery=10)
-ax.plot(data4[:,0], data4[:,1], "-" , color=colors["TUM_blue1"], label="6 sections")
+# ax.plot(data2["disp", 2, "w", :10], data2["force", 2, "w", :10], "--", color=colors["TUM_grey1"], label="2 sections")
+# ax.plot(data3["disp", 2, "w", :10], data3["force", 2, "w", :10], "-.", color=colors["TUM_orange"], label="3 sections")
+# ax.plot(data4["disp", 2, "w"], data4["force", 2, "w"], "-*", color=colors["TUM_grey2"], label="4 sections", markevery=10)
+ax.plot(data4["disp", 2, "w"], data4["force", 2, "w"], "-" , color=colors["TUM_blue1"], label="6 sections")
 ax.set(
 	title=r"Load - Displacement",
 	xlabel=r"Displacement in Z direction [in]",
@@ -1,7 +1,31 @@
 """
 Module plotting
 ===============
+
+matplotlib is only imported when a plotting function is first used.
 """
 
-from .plot_section import plot_disctrized_2d, custom_2d_plot
-from .run_time_results import initiate_plot, update_plot, keep_plot
+
+def plot_disctrized_2d(section):
+    from .plot_section import plot_disctrized_2d
+    return plot_disctrized_2d(section)
+
+
+def custom_2d_plot(x, y, *args, **kwargs):
+    from .plot_section import custom_2d_plot
+    return custom_2d_plot(x, y, *args, **kwargs)
+
+
+def initiate_plot(*args, **kwargs):
+    from .run_time_results import initiate_plot
+    return initiate_plot(*args, **kwargs)
+
+
+def update_plot(axes, line, x, y):
+    from .run_time_results import update_plot
+    return update_plot(axes, line, x, y)
+
+
+def keep_plot():
+    from .run_time_results import keep_plot
+    return keep_plot()
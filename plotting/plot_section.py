@@ -12,12 +12,13 @@ def plot_disctrized_2d(section):
     for fiber in section.fibers:
         y = -fiber.direction[0]
         z = fiber.direction[1]
-        if isinstance(fiber._material, KentPark):
+        material = fiber.material
+        if isinstance(material, KentPark):
             fcolor = "grey"
-        elif isinstance(fiber._material, MenegottoPinto):
+        elif isinstance(material, MenegottoPinto):
             fcolor = "black"
         else:
-            raise TypeError(f"Unknown fiber material law: {fiber._material}")
+            raise TypeError(f"Unknown fiber material law: {material}")
         ecolor = "black"
         rec = patches.Rectangle(
             xy=(y - fiber.w / 2, z - fiber.h / 2),
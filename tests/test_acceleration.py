@@ -0,0 +1,21 @@
+"""
+convergence acceleration of the element iterations
+"""
+import pytest
+
+import main
+from disp_calc import calculate_loadsteps
+from fe_code.protocol import LoadProtocol
+from models.column import model1_3
+
+
+@pytest.mark.parametrize("acceleration, completed", [("none", 16), ("aitken", 17)])
+def test_element_aitken_converges_a_large_step(tmp_path, acceleration, completed):
+    # without relaxation the element iterations of the 17th step of 1.0 do not converge,
+    # and neither do the Newton-Raphson iterations
+    protocol = LoadProtocol.from_boundaries(1.0, calculate_loadsteps(1.0))
+    protocol = LoadProtocol(protocol.increments[:17])
+    structure = model1_3()
+    structure.set_element_acceleration(acceleration)
+    main.solution_loop(structure, protocol, str(tmp_path / "x.res"))
+    assert structure.load_step == completed
@@ -0,0 +1,68 @@
+"""
+banded solver of the equation system
+"""
+import numpy as np
+import pytest
+
+import main
+from fe_code import KentPark, MenegottoPinto, Structure
+from fe_code.protocol import LoadProtocol
+from fe_code.results import ResultReader
+from fe_code.section_builder import (
+    add_to_section, build_section, rectangular_patch, straight_layer,
+)
+
+# planar portal frame, columns of height 100 and a beam of span 200
+FRAME_POINTS = [(0.0, 0.0), (0.0, 50.0), (0.0, 100.0), (50.0, 100.0), (100.0, 100.0),
+                (150.0, 100.0), (200.0, 100.0), (200.0, 50.0), (200.0, 0.0)]
+# node ids along the frame, scrambled so that the node order is not banded
+NODE_IDS = [5, 1, 9, 3, 7, 2, 8, 4, 6]
+
+
+def _frame(solver):
+    structure = Structure(True)
+    for node_id, (x, z) in zip(NODE_IDS, FRAME_POINTS):
+        structure.add_node(node_id, x, 0.0, z)
+    fibers = build_section(
+        [rectangular_patch(-2.5, -4.0, 2.5, 4.0, 5, 5, 0)],
+        [straight_layer(2, 0.8, -1.5, -2.4, 1.5, -2.4, 1),
+         straight_layer(2, 0.8, -1.5, 2.4, 1.5, 2.4, 1)],
+    )
+    materials = [lambda: KentPark(6.95, 770, 0.0027),
+                 lambda: MenegottoPinto(29000, 0.0042, 60, 20, 18.5, 0.0002)]
+    counter = 1
+    for i, (node1, node2) in enumerate(zip(NODE_IDS[:-1], NODE_IDS[1:])):
+        structure.add_fiber_beam_element(i + 1, node1, node2)
+        element = structure.get_element(i + 1)
+        for j in range(3):
+            element.add_section(j + 1)
+            counter = add_to_section(element.get_section(j + 1), fibers, materials, counter)
+    structure.add_dirichlet_condition(NODE_IDS[0], "uwy", 0)
+    structure.add_dirichlet_condition(NODE_IDS[-1], "uwy", 0)
+    structure.set_controlled_dof(NODE_IDS[2], "u")
+    structure.add_neumann_condition(NODE_IDS[2], "u", 1.0)
+    structure.set_tolerance(1e-7)
+    structure.set_section_tolerance(1e-6)
+    structure.set_solver(solver)
+    return structure
+
+
+def test_banded_solver_gives_the_dense_results(tmp_path):
+    pytest.importorskip("scipy.linalg")
+    protocol = LoadProtocol.from_targets([1.0, -1.0], 0.25)
+    results = dict()
+    for solver in ("dense", "banded"):
+        structure = _frame(solver)
+        main.solution_loop(structure, protocol, str(tmp_path / f"{solver}.res"))
+        assert structure.load_step == len(protocol)
+        results[solver] = ResultReader(str(tmp_path / f"{solver}.res")).data
+    # the nodes were renumbered along the frame
+    no_node_dofs = len(structure.dof_types)
+    nodes = structure.equations[::no_node_dofs] // no_node_dofs + 1
+    assert list(nodes) in (NODE_IDS, NODE_IDS[::-1])
+    assert structure.bandwidth == 2 * no_node_dofs - 1
+
+    reference = results["dense"]
+    np.testing.assert_allclose(
+        results["banded"], reference, rtol=0.0, atol=1e-9 * np.abs(reference).max()
+    )
@@ -0,0 +1,44 @@
+"""
+tolerance policies of the structure, element and section iterations
+"""
+import numpy as np
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code.convergence import TolerancePolicy
+from fe_code.protocol import LoadProtocol
+from fe_code.results import ResultReader
+
+
+def _run(path, tolerance=None):
+    structure = cantilever(no_sections=3, no_fibers_y=5, no_fibers_z=5, planar=True)
+    if tolerance is not None:
+        structure.set_tolerance_policy(TolerancePolicy(tolerance))
+        structure.set_section_tolerance_policy(TolerancePolicy(10 * tolerance))
+    main.solution_loop(structure, LoadProtocol.from_targets([1.2, -0.8, 0.4], 0.4), path)
+    return structure
+
+
+def test_absolute_policies_are_identical_to_no_policy(tmp_path):
+    reference = _run(str(tmp_path / "reference.res"))
+    # the tolerances of the absolute tests of cantilever
+    structure = _run(str(tmp_path / "policies.res"), tolerance=1e-7)
+    assert structure.load_step == reference.load_step
+    np.testing.assert_array_equal(
+        ResultReader(str(tmp_path / "policies.res")).data,
+        ResultReader(str(tmp_path / "reference.res")).data,
+    )
+    np.testing.assert_array_equal(
+        structure.convergence_statistics.table, reference.convergence_statistics.table
+    )
+    np.testing.assert_array_equal(
+        structure.convergence_statistics.residual_trace,
+        reference.convergence_statistics.residual_trace,
+    )
+
+    # the policies are applied
+    loose = _run(str(tmp_path / "loose.res"), tolerance=1e-2)
+    summary = loose.convergence_statistics.summary()
+    reference_summary = reference.convergence_statistics.summary()
+    assert summary["nr_iterations"]["total"] < reference_summary["nr_iterations"]["total"]
+    assert summary["section_iterations"]["total"] < reference_summary["section_iterations"]["total"]
@@ -0,0 +1,50 @@
+"""
+displacement-based fiber beam element
+"""
+import numpy as np
+import pytest
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code.protocol import LoadProtocol
+from fe_code.results import ResultReader
+
+
+def _structure(element_type, planar, no_elements=1):
+    return cantilever(no_elements=no_elements, no_sections=4, no_fibers_y=5, no_fibers_z=5,
+                      planar=planar, element_type=element_type)
+
+
+@pytest.mark.parametrize("planar", [False, True])
+def test_elastic_stiffness_matches_the_force_based_element(planar):
+    stiffness = dict()
+    for element_type in ("force_based", "displacement_based"):
+        structure = _structure(element_type, planar)
+        structure.initialize()
+        element = structure.get_element(1)
+        assert element.element_type == element_type
+        stiffness[element_type] = element.local_stiffness_matrix
+    # exact for the linear moments of an elastic prismatic member
+    expected = stiffness["force_based"]
+    np.testing.assert_allclose(
+        stiffness["displacement_based"], expected, rtol=0.0, atol=1e-10 * np.abs(expected).max()
+    )
+
+
+def test_meshed_displacement_based_elements_approach_the_force_based_element(tmp_path):
+    protocol = LoadProtocol.from_targets([1.2, -0.8], 0.4)
+    forces = dict()
+    for element_type, no_elements in (("force_based", 1), ("displacement_based", 1),
+                                      ("displacement_based", 4)):
+        structure = _structure(element_type, True, no_elements)
+        path = str(tmp_path / f"{element_type}_{no_elements}.res")
+        main.solution_loop(structure, protocol, path)
+        assert structure.load_step == len(protocol)
+        forces[element_type, no_elements] = ResultReader(path)["force", no_elements + 1, "w"]
+    expected = forces["force_based", 1]
+    errors = [
+        np.abs(forces["displacement_based", no_elements] - expected).max()
+        for no_elements in (1, 4)
+    ]
+    # the nonlinear response converges with the mesh
+    assert errors[1] < 0.5 * errors[0]
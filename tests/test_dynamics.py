@@ -0,0 +1,138 @@
+"""
+explicit and implicit time integration
+"""
+import numpy as np
+
+from fe_code import Structure, MenegottoPinto
+from fe_code.dynamics import (
+    CentralDifferenceIntegrator, NewmarkIntegrator, critical_time_step, free_dofs,
+    influence_vector, rayleigh_coefficients,
+)
+from fe_code.section_builder import build_section, rectangular_patch, add_to_section
+
+
+def _steel_cantilever(no_elements=2):
+    """ planar steel cantilever with a tip mass, elastic at small amplitudes """
+    structure = Structure(True)
+    for i in range(no_elements + 1):
+        structure.add_node(i + 1, 100.0 * i / no_elements, 0.0, 0.0)
+    fibers = build_section([rectangular_patch(-2.5, -4.0, 2.5, 4.0, 4, 8, 0)], [])
+    materials = [lambda: MenegottoPinto(29000, 0.0042, 60, 20, 18.5, 0.0002)]
+    counter = 1
+    for i in range(no_elements):
+        structure.add_fiber_beam_element(i + 1, i + 1, i + 2)
+        element = structure.get_element(i + 1)
+        # small distributed mass, the explicit integration needs masses at all dofs
+        element.mass_per_length = 1e-4
+        for j in range(4):
+            element.add_section(j + 1)
+            counter = add_to_section(element.get_section(j + 1), fibers, materials, counter)
+    tip = no_elements + 1
+    structure.add_dirichlet_condition(1, "uvwxyz", 0)
+    structure.add_nodal_mass(tip, "w", 0.05)
+    structure.set_controlled_dof(tip, "w")
+    structure.add_neumann_condition(tip, "w", 1.0)
+    structure.set_section_tolerance(1e-8)
+    structure.set_tolerance(1e-9)
+    return structure
+
+
+def _frequencies(structure):
+    """ circular frequencies of the free dofs with the lumped masses of the explicit method """
+    free = free_dofs(structure)
+    masses = structure.get_lumped_masses(rotational_inertia=True)[free]
+    scale = 1 / np.sqrt(masses)
+    stiffness = structure.stiffness_matrix[np.ix_(free, free)]
+    return np.sqrt(np.linalg.eigvalsh(stiffness * scale[:, None] * scale[None, :]))
+
+
+def test_critical_time_step_bounds_the_highest_frequency():
+    structure = _steel_cantilever()
+    structure.initialize()
+    exact = 2 / _frequencies(structure).max()
+    estimate = critical_time_step(structure, structure.get_lumped_masses(rotational_inertia=True))
+    # the element bound is conservative but not far off
+    assert 0.8 * exact < estimate <= exact
+
+
+def test_central_difference_agrees_with_newmark_at_small_amplitude():
+    reference = _steel_cantilever()
+    reference.initialize()
+    period = 2 * np.pi / _frequencies(reference).min()
+    dt = period / 100
+    record = [0.5] * 5 + [0.0] * 95
+
+    implicit = _steel_cantilever()
+    tip = implicit.get_dof_index((3, "w"))
+    newmark = NewmarkIntegrator(implicit, dt, excitation="w")
+    newmark.initialize()
+    expected = list()
+    for ground_acceleration in record:
+        newmark.step(ground_acceleration)
+        expected.append(implicit.get_displacements()[tip])
+
+    explicit = _steel_cantilever()
+    central_difference = CentralDifferenceIntegrator(explicit, excitation="w")
+    central_difference.initialize()
+    history = list()
+
+    class TipWriter:
+        def write_structure(self, structure):
+            history.append(structure.get_displacements()[tip])
+
+    assert central_difference.run(iter(record), record_dt=dt, result_writer=TipWriter()) == 100
+    assert central_difference.dt < central_difference.critical_time_step
+    expected, history = np.array(expected), np.array(history)
+    assert np.abs(history - expected).max() < 0.01 * np.abs(expected).max()
+    # elastic response
+    assert np.abs(explicit.get_element(1).get_section(1).fiber_stresses).max() < 1.0
+
+
+def test_newmark_conserves_the_energy_of_free_vibrations():
+    structure = _steel_cantilever()
+    newmark = NewmarkIntegrator(structure, 0.0, excitation="w")
+    newmark.initialize()
+    free = newmark.free_dofs
+    mass = structure.get_mass_matrix(False)[np.ix_(free, free)]
+    stiffness = structure.stiffness_matrix[np.ix_(free, free)].copy()
+    newmark.dt = 2 * np.pi / _frequencies(structure).min() / 50
+
+    def energy():
+        velocity = newmark.velocity[free]
+        displacement = structure.get_displacements()[free]
+        return 0.5 * velocity @ mass @ velocity + 0.5 * displacement @ stiffness @ displacement
+
+    # a short pulse, then free vibration with the average acceleration method
+    for ground_acceleration in [0.5] * 5 + [0.0]:
+        newmark.step(ground_acceleration)
+    initial = energy()
+    energies = list()
+    for _ in range(100):
+        assert newmark.step(0.0)[0]
+        energies.append(energy())
+    # elastic response, the average acceleration method conserves the energy
+    assert initial > 0
+    np.testing.assert_allclose(energies, initial, rtol=1e-10)
+
+
+def test_newmark_reaches_the_static_limit():
+    structure = _steel_cantilever()
+    structure.initialize()
+    free = free_dofs(structure)
+    omegas = np.sort(_frequencies(structure))
+    stiffness = structure.stiffness_matrix[np.ix_(free, free)].copy()
+    mass = structure.get_mass_matrix(False)[np.ix_(free, free)]
+    # critically damped in the first modes
+    damping = rayleigh_coefficients(1.0, omegas[0], omegas[1])
+    newmark = NewmarkIntegrator(structure, 2 * np.pi / omegas[0] / 20, excitation="w",
+                                mass_coefficient=damping[0], stiffness_coefficient=damping[1])
+    newmark.initialize()
+    ground_acceleration = 0.2
+    assert newmark.run(iter([ground_acceleration] * 200)) == 200
+
+    expected = np.linalg.solve(
+        stiffness, -mass @ influence_vector(structure, free, "w") * ground_acceleration
+    )
+    displacement = structure.get_displacements()[free]
+    np.testing.assert_allclose(displacement, expected, rtol=0.0, atol=1e-6 * np.abs(expected).max())
+    assert np.abs(newmark.velocity).max() < 1e-6 * np.abs(expected).max() * omegas[0]
@@ -0,0 +1,63 @@
+"""
+equation system of the structure
+"""
+import numpy as np
+import pytest
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code import events
+from fe_code.protocol import LoadProtocol
+from fe_code.results import ResultReader
+
+
+def _structure(free_torsion=False):
+    structure = cantilever(no_elements=2, no_sections=3, no_fibers_y=5, no_fibers_z=5)
+    # a node without elements
+    structure.add_node(4, 0.0, 50.0, 0.0)
+    if free_torsion:
+        conditions = structure.dirichlet_conditions
+        for dof in [dof for dof in conditions if dof.node_id > 1 and dof.type == "x"]:
+            del conditions[dof]
+    return structure
+
+
+def test_inactive_dofs_are_excluded(tmp_path):
+    structure = _structure()
+    reported = list()
+
+    def report(event, data):
+        reported.append(data)
+
+    events.subscribe(events.INACTIVE_DOFS, report)
+    try:
+        structure.initialize()
+    finally:
+        events.unsubscribe(events.INACTIVE_DOFS, report)
+
+    # the torsion of the fiber beams and all dofs of the free node
+    expected = [(node_id, "x") for node_id in (1, 2, 3)]
+    expected += [(4, dof_type) for dof_type in "uvwxyz"]
+    assert sorted((dof.node_id, dof.type) for dof in structure.inactive_dofs) == expected
+    assert reported and reported[0]["count"] == len(expected)
+    inactive = [structure.get_dof_index(dof) for dof in expected]
+    assert structure.no_equations == structure.no_dofs - len(expected)
+    assert not set(structure.equations) & set(inactive)
+
+    # free torsion does not make the equation system singular
+    protocol = LoadProtocol.from_targets([1.2, -0.8], 0.4)
+    results = dict()
+    for free_torsion in (False, True):
+        structure = _structure(free_torsion)
+        main.solution_loop(structure, protocol, str(tmp_path / f"{free_torsion}.res"))
+        assert structure.load_step == len(protocol)
+        results[free_torsion] = ResultReader(str(tmp_path / f"{free_torsion}.res")).data
+        np.testing.assert_array_equal(structure.get_displacements()[inactive], 0.0)
+    np.testing.assert_array_equal(results[True], results[False])
+
+
+def test_controlled_dof_has_to_be_active():
+    structure = _structure()
+    structure.set_controlled_dof(3, "x")
+    with pytest.raises(RuntimeError):
+        structure.initialize()
@@ -0,0 +1,35 @@
+"""
+array material laws against the scalar laws
+"""
+import numpy as np
+import pytest
+
+from fe_code.material_laws import KentPark, KentParkArray, MenegottoPinto, MenegottoPintoArray
+
+
+@pytest.mark.parametrize("material_class, array_class, parameters, scale", [
+    (KentPark, KentParkArray, [(6.95, 770, 0.0027), (5.0, 100.0, 0.0025)], 4e-4),
+    (MenegottoPinto, MenegottoPintoArray, [(29000, 0.0042, 60, 20, 18.5, 0.0002)], 1.5e-3),
+])
+def test_array_law_follows_the_scalar_law(material_class, array_class, parameters, scale):
+    rng = np.random.default_rng(0)
+    materials = [material_class(*parameters[i % len(parameters)]) for i in range(20)]
+    array = array_class.from_materials(materials)
+    path = np.cumsum(rng.normal(0.0, scale, (150, len(materials))), axis=0)
+    # fibers at rest
+    path[:, :3] = 0.0
+    for strains in path:
+        # trial strains of the iterations before the converged one
+        for trial in list(strains + rng.normal(0.0, scale / 3, (2, len(materials)))) + [strains]:
+            for material, strain in zip(materials, trial.tolist()):
+                material.update_strain(strain)
+            array.update_strain(trial)
+            stresses = np.array([material.stress for material in materials])
+            tangents = np.array([material.tangent_modulus for material in materials])
+            np.testing.assert_allclose(array.stress, stresses, rtol=1e-12, atol=1e-10)
+            np.testing.assert_allclose(array.tangent_modulus, tangents, rtol=1e-12, atol=1e-10)
+        for material in materials:
+            material.finalize_load_step()
+        array.finalize_load_step()
+    states = np.array([material.get_state() for material in materials])
+    np.testing.assert_allclose(array.get_state(), states, rtol=1e-12, atol=1e-12)
@@ -0,0 +1,48 @@
+"""
+modal analysis at the initial and at a softened state
+"""
+import numpy as np
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code.dynamics import free_dofs
+from fe_code.modal import modal_analysis, _dense_modes, _mass_matrix, _stiffness_entries
+from fe_code.protocol import LoadProtocol
+
+
+def _structure():
+    structure = cantilever(no_elements=2, no_sections=3, no_fibers_y=5, no_fibers_z=10,
+                           planar=True)
+    for element in structure.elements:
+        element.mass_per_length = 1e-4
+    return structure
+
+
+def _dense(structure):
+    free = free_dofs(structure)
+    eigenvalues, _ = _dense_modes(_stiffness_entries(structure, free),
+                                  _mass_matrix(structure, free, False, False), 3)
+    return eigenvalues
+
+
+def test_initial_modes_are_mass_normalized():
+    structure = _structure()
+    modes = modal_analysis(structure, 3)
+    assert np.all(modes.eigenvalues > 0)
+    np.testing.assert_allclose(modes.eigenvalues, _dense(structure), rtol=1e-10)
+    masses = structure.get_lumped_masses()
+    np.testing.assert_allclose(np.einsum("ik,i,ik->k", modes.shapes, masses, modes.shapes), 1.0)
+
+
+def test_modes_past_the_peak(tmp_path):
+    structure = _structure()
+    main.solution_loop(structure, LoadProtocol.from_targets([3.0], 0.5),
+                       str(tmp_path / "results.res"))
+    free = free_dofs(structure)
+    assert np.linalg.eigvalsh(structure.stiffness_matrix[np.ix_(free, free)])[0] < 0
+
+    modes = modal_analysis(structure, 3)
+    np.testing.assert_allclose(modes.eigenvalues, _dense(structure), rtol=1e-8)
+    assert modes.eigenvalues[0] < 0
+    assert modes.omegas[0] == 0 and modes.periods[0] == np.inf
+    assert np.all(np.isfinite(modes.periods[1:]))
@@ -0,0 +1,76 @@
+"""
+model files and the model cache
+"""
+import os
+
+import numpy as np
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code import model_io
+from fe_code.protocol import LoadProtocol
+from fe_code.results import ResultReader
+
+
+def _sections(structure):
+    return [section for element in structure.elements for section in element.sections]
+
+
+def test_loaded_model_equals_the_built_model(tmp_path):
+    built = cantilever(no_elements=2, no_sections=3, no_fibers_y=5, no_fibers_z=5, planar=True)
+    path = str(tmp_path / "model.npz")
+    model_io.save_model(built, path)
+    loaded = model_io.load_model(path)
+
+    for expected, section in zip(_sections(built), _sections(loaded)):
+        assert section.fiber_ids == expected.fiber_ids
+        np.testing.assert_array_equal(section.fiber_geometry, expected.fiber_geometry)
+        materials, material_ids = section.fiber_materials()
+        expected_materials, expected_ids = expected.fiber_materials()
+        assert materials == expected_materials
+        np.testing.assert_array_equal(material_ids, expected_ids)
+
+    # the fiber arrays of the loaded sections are saved unchanged
+    model_io.save_model(loaded, str(tmp_path / "saved_again.npz"))
+    with np.load(path) as first, np.load(str(tmp_path / "saved_again.npz")) as second:
+        for name in first.files:
+            np.testing.assert_array_equal(second[name], first[name])
+
+    protocol = LoadProtocol.from_targets([1.2, -0.8], 0.4)
+    main.solution_loop(built, protocol, str(tmp_path / "built.res"))
+    main.solution_loop(loaded, protocol, str(tmp_path / "loaded.res"))
+    np.testing.assert_array_equal(
+        ResultReader(str(tmp_path / "loaded.res")).data,
+        ResultReader(str(tmp_path / "built.res")).data,
+    )
+
+
+def test_model_cache_is_rebuilt_only_after_changes(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    path = model_io.cached_model_path(cantilever, no_sections=3, cache_dir=cache_dir)
+    assert os.path.exists(path)
+
+    def fail(structure, path):
+        raise AssertionError("the cached model was rebuilt")
+
+    save_model = model_io.save_model
+    monkeypatch.setattr(model_io, "save_model", fail)
+    assert model_io.cached_model_path(cantilever, no_sections=3, cache_dir=cache_dir) == path
+    assert len(list(model_io.cached_model(cantilever, no_sections=3, cache_dir=cache_dir)
+                    .get_element(1).sections)) == 3
+    monkeypatch.setattr(model_io, "save_model", save_model)
+
+    # other arguments
+    other = model_io.cached_model_path(cantilever, no_sections=4, cache_dir=cache_dir)
+    assert other != path and os.path.exists(other)
+
+    # a changed material module
+    get_source = model_io.inspect.getsource
+
+    def changed_source(module):
+        source = get_source(module)
+        return source + "\n# changed" if module.__name__.endswith("kent_park") else source
+
+    monkeypatch.setattr(model_io.inspect, "getsource", changed_source)
+    changed = model_io.cached_model_path(cantilever, no_sections=3, cache_dir=cache_dir)
+    assert changed not in (path, other) and os.path.exists(changed)
@@ -0,0 +1,42 @@
+"""
+planar mode of the structure
+"""
+import numpy as np
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code.protocol import LoadProtocol
+from fe_code.recorders import SectionRecorder
+from fe_code.results import ResultReader
+
+
+def test_planar_cantilever_gives_the_3d_results(tmp_path):
+    protocol = LoadProtocol.from_targets([1.2, -0.8, 0.4], 0.4)
+    results = dict()
+    for planar in (False, True):
+        structure = cantilever(no_elements=2, no_sections=3, no_fibers_y=5, no_fibers_z=5,
+                               planar=planar)
+        assert len(structure.dof_types) == (3 if planar else 6)
+        path = str(tmp_path / f"section_{planar}.res")
+        structure.add_recorder(SectionRecorder(1, [1, 3], filename=path))
+        main.solution_loop(structure, protocol, str(tmp_path / f"{planar}.res"))
+        assert structure.load_step == len(protocol)
+        results[planar] = (ResultReader(str(tmp_path / f"{planar}.res")), ResultReader(path))
+
+    (planar, planar_sections), (spatial, spatial_sections) = results[True], results[False]
+    for quantity in ("disp", "force"):
+        for node_id in (1, 2, 3):
+            for dof in "uwy":
+                expected = spatial[quantity, node_id, dof]
+                np.testing.assert_allclose(
+                    planar[quantity, node_id, dof], expected, rtol=1e-9,
+                    atol=1e-9 * np.abs(spatial[quantity]).max(),
+                )
+    for quantity, component in (("force", "my"), ("force", "n"), ("deformation", "ky"),
+                                ("deformation", "eps")):
+        for section_id in (1, 3):
+            expected = spatial_sections[quantity, section_id, component]
+            np.testing.assert_allclose(
+                planar_sections[quantity, section_id, component], expected, rtol=1e-9,
+                atol=1e-9 * np.abs(spatial_sections[quantity]).max(),
+            )
@@ -0,0 +1,47 @@
+"""
+secant predictor of the load steps
+"""
+import numpy as np
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code.protocol import LoadProtocol
+
+
+def _structure(predictor):
+    structure = cantilever(no_sections=3, no_fibers_y=5, no_fibers_z=5, planar=True)
+    structure.set_predictor(predictor)
+    return structure
+
+
+def test_secant_predictor_falls_back_at_reversals(tmp_path):
+    structure = _structure("secant")
+    predictions = list()
+    predict = structure._predict
+
+    def recording_predict(max_ele_iterations):
+        predicted = predict(max_ele_iterations)
+        predictions.append((structure.controlled_dof_increment, predicted))
+        return predicted
+
+    structure._predict = recording_predict
+    protocol = LoadProtocol.from_targets([1.2, -0.8, 0.4], 0.4)
+    main.solution_loop(structure, protocol, str(tmp_path / "results.res"))
+
+    increments = np.array([increment for increment, _ in predictions])
+    predicted = np.array([flag for _, flag in predictions])
+    np.testing.assert_array_equal(increments, protocol.increments)
+    # no prediction at the first load step and at the reversals
+    expected = np.append(False, increments[1:] * increments[:-1] > 0)
+    np.testing.assert_array_equal(predicted, expected)
+
+
+def test_secant_predictor_saves_iterations_on_a_monotonic_push(tmp_path):
+    protocol = LoadProtocol.from_targets([3.0], 0.25)
+    iterations = dict()
+    for predictor in ("tangent", "secant"):
+        structure = _structure(predictor)
+        main.solution_loop(structure, protocol, str(tmp_path / f"{predictor}.res"))
+        assert structure.load_step == len(protocol)
+        iterations[predictor] = structure.convergence_statistics.summary()["nr_iterations"]["total"]
+    assert iterations["secant"] < iterations["tangent"]
@@ -0,0 +1,44 @@
+"""
+load protocols of the controlled dof
+"""
+import numpy as np
+import pytest
+
+from disp_calc import calculate_loadsteps, calculate_loadsteps2
+from fe_code.protocol import LoadProtocol, cyclic_targets, iter_increments
+
+
+def _advance_in_load(load_step, boundaries, step_size):
+    """ increment of the former if-chain of main.advance_in_load """
+    for i, boundary in enumerate(boundaries):
+        if load_step < boundary:
+            return step_size if i % 2 == 0 else -step_size
+    return step_size
+
+
+@pytest.mark.parametrize("boundaries", [calculate_loadsteps(0.4), calculate_loadsteps2(0.5)])
+def test_boundaries_give_the_former_sign_pattern(boundaries):
+    protocol = LoadProtocol.from_boundaries(0.4, boundaries)
+    # the former solution loop ran the load steps 1 to boundaries[-1] - 1
+    expected = [_advance_in_load(k, boundaries, 0.4) for k in range(1, boundaries[-1])]
+    np.testing.assert_array_equal(protocol.increments, expected)
+    assert [protocol.increment(k) for k in (1, len(protocol))] == [expected[0], expected[-1]]
+    # the direction changes after the last step before every boundary
+    np.testing.assert_array_equal(protocol.segment_ends, np.asarray(boundaries) - 1)
+    ends = protocol.segment_ends[:-1]
+    np.testing.assert_array_equal(protocol.increments[ends], -protocol.increments[ends - 1])
+
+
+def test_targets_are_hit_exactly():
+    targets = list(cyclic_targets([1.0, 2.0]))
+    protocol = LoadProtocol.from_targets(targets, 0.3)
+    np.testing.assert_allclose(protocol.displacements[protocol.segment_ends - 1], targets)
+    assert np.abs(protocol.increments).max() <= 0.3 + 1e-12
+    np.testing.assert_array_equal(list(iter_increments(iter(targets), 0.3)), protocol.increments)
+    assert protocol.segment(protocol.segment_ends[0]) == 0
+    assert protocol.segment(protocol.segment_ends[0] + 1) == 1
+
+    # steps of exactly the step size end within half a step of the targets
+    protocol = LoadProtocol.from_targets(targets, 0.3, hit_peaks=False)
+    np.testing.assert_allclose(np.abs(protocol.increments), 0.3)
+    assert np.abs(protocol.displacements[protocol.segment_ends - 1] - targets).max() <= 0.15
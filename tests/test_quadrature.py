@@ -0,0 +1,55 @@
+"""
+quadrature rules of the fiber beam elements
+"""
+import numpy as np
+import pytest
+
+from fe_code.quadrature import QUADRATURE_RULES, gauss_lobatto
+
+# closed form Gauss-Lobatto rules (Abramowitz and Stegun, table 25.6)
+LOBATTO_TABLE = {
+    2: ([-1.0, 1.0], [1.0, 1.0]),
+    3: ([-1.0, 0.0, 1.0], [1 / 3, 4 / 3, 1 / 3]),
+    4: ([-1.0, -np.sqrt(1 / 5), np.sqrt(1 / 5), 1.0], [1 / 6, 5 / 6, 5 / 6, 1 / 6]),
+    5: (
+        [-1.0, -np.sqrt(3 / 7), 0.0, np.sqrt(3 / 7), 1.0],
+        [1 / 10, 49 / 90, 32 / 45, 49 / 90, 1 / 10],
+    ),
+    6: (
+        [-1.0, -np.sqrt(1 / 3 + 2 * np.sqrt(7) / 21), -np.sqrt(1 / 3 - 2 * np.sqrt(7) / 21),
+         np.sqrt(1 / 3 - 2 * np.sqrt(7) / 21), np.sqrt(1 / 3 + 2 * np.sqrt(7) / 21), 1.0],
+        [1 / 15, (14 - np.sqrt(7)) / 30, (14 + np.sqrt(7)) / 30, (14 + np.sqrt(7)) / 30,
+         (14 - np.sqrt(7)) / 30, 1 / 15],
+    ),
+}
+
+
+@pytest.mark.parametrize("num", sorted(LOBATTO_TABLE))
+def test_gauss_lobatto_matches_the_closed_form_table(num):
+    x, w = gauss_lobatto(num)
+    expected_x, expected_w = LOBATTO_TABLE[num]
+    np.testing.assert_allclose(x, expected_x, rtol=0.0, atol=1e-15)
+    np.testing.assert_allclose(w, expected_w, rtol=0.0, atol=1e-15)
+
+
+def test_gauss_lobatto_matches_the_scipy_rule():
+    legendre = pytest.importorskip("scipy.special").legendre
+    for num in range(2, 16):
+        # the former rule from the roots of the Legendre polynomials
+        x = np.concatenate(([-1.0], np.sort(legendre(num - 1).deriv().roots), [1.0]))
+        w = 2 / (num * (num - 1) * legendre(num - 1)(x) ** 2)
+        np.testing.assert_allclose(gauss_lobatto(num)[0], x, rtol=0.0, atol=1e-12)
+        np.testing.assert_allclose(gauss_lobatto(num)[1], w, rtol=0.0, atol=1e-12)
+
+
+@pytest.mark.parametrize("scheme, num, degree", [
+    ("gauss_lobatto", 5, 7), ("gauss_lobatto", 40, 77), ("gauss_radau", 5, 8),
+    ("gauss_radau", 30, 58), ("gauss_legendre", 5, 9), ("newton_cotes", 5, 5),
+])
+def test_rules_integrate_polynomials_exactly(scheme, num, degree):
+    x, w = QUADRATURE_RULES[scheme](num)
+    assert not w.flags.writeable
+    for k in range(degree + 1):
+        assert w @ x ** k == pytest.approx(2 / (k + 1) if k % 2 == 0 else 0.0, abs=1e-13)
+    # the rules are cached
+    assert QUADRATURE_RULES[scheme](num)[0] is x
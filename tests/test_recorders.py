@@ -0,0 +1,77 @@
+"""
+recorders of node, section and fiber histories
+"""
+import numpy as np
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code.protocol import LoadProtocol
+from fe_code.recorders import FiberRecorder, NodeRecorder, SectionRecorder
+from fe_code.results import ResultReader
+
+
+def _structure():
+    return cantilever(no_sections=3, no_fibers_y=5, no_fibers_z=5, planar=True)
+
+
+def test_recorders_follow_the_structure_results(tmp_path):
+    structure = _structure()
+    tip = structure.controlled_dof.node_id
+    fiber_ids = structure.get_element(1).get_section(1).fiber_ids[:2]
+    nodes = NodeRecorder([tip], "w", filename=str(tmp_path / "node.res"), buffer_size=3)
+    decimated = NodeRecorder([tip], "w", every=3, filename=str(tmp_path / "decimated.res"))
+    in_memory = NodeRecorder([tip], "w", quantities=("disp",), buffer_size=4)
+    section = SectionRecorder(1, [1], filename=str(tmp_path / "section.res"))
+    fibers = FiberRecorder(1, 1, fiber_ids, filename=str(tmp_path / "fiber.res"))
+    for recorder in (nodes, decimated, in_memory, section, fibers):
+        structure.add_recorder(recorder)
+    protocol = LoadProtocol.from_targets([1.2, -0.8], 0.4)
+    main.solution_loop(structure, protocol, str(tmp_path / "x.res"))
+
+    results = ResultReader(str(tmp_path / "x.res"))
+    steps = np.arange(len(protocol) + 1)
+    recorded = ResultReader(str(tmp_path / "node.res"))
+    np.testing.assert_array_equal(recorded["step"], steps)
+    np.testing.assert_array_equal(recorded["disp", tip, "w"], results["disp", tip, "w"])
+    np.testing.assert_array_equal(recorded["force", tip, "w"], results["force", tip, "w"])
+
+    recorded = ResultReader(str(tmp_path / "decimated.res"))
+    np.testing.assert_array_equal(recorded["step"], steps[::3])
+    np.testing.assert_array_equal(recorded["disp", tip, "w"], results["disp", tip, "w"][::3])
+
+    # the ring buffer keeps the latest rows
+    np.testing.assert_array_equal(
+        in_memory.get_history(), np.column_stack((steps, results["disp", tip, "w"]))[-4:]
+    )
+
+    recorded = ResultReader(str(tmp_path / "section.res"))
+    last = structure.get_element(1).get_section(1)
+    np.testing.assert_array_equal(recorded.data[-1, 1:], np.concatenate(
+        (last.forces, last.deformations)
+    ))
+    recorded = ResultReader(str(tmp_path / "fiber.res"))
+    np.testing.assert_array_equal(recorded["stress"][-1], last.fiber_stresses[:2])
+    np.testing.assert_array_equal(recorded["strain"][-1], last.fiber_strains[:2])
+
+
+def test_reversal_recorder_writes_the_peaks_and_the_last_step(tmp_path):
+    structure = _structure()
+    tip = structure.controlled_dof.node_id
+    peaks = NodeRecorder([tip], "w", on_reversal=True, filename=str(tmp_path / "peaks.res"))
+    in_memory = NodeRecorder([tip], "w", quantities=("disp",), on_reversal=True)
+    structure.add_recorder(peaks)
+    structure.add_recorder(in_memory)
+    protocol = LoadProtocol.from_targets([1.2, -0.8, 0.4], 0.4)
+    main.solution_loop(structure, protocol, str(tmp_path / "x.res"))
+
+    # initial state, the peaks at 1.2 and -0.8 and the last step at 0.4
+    expected = [0, 3, 8, 11]
+    recorded = ResultReader(str(tmp_path / "peaks.res"))
+    np.testing.assert_array_equal(recorded["step"], expected)
+    disp = ResultReader(str(tmp_path / "x.res"))["disp", tip, "w"]
+    np.testing.assert_array_equal(recorded["disp", tip, "w"], disp[expected])
+    np.testing.assert_allclose(disp[expected], [0.0, 1.2, -0.8, 0.4], atol=1e-12)
+    np.testing.assert_array_equal(in_memory.get_history()[:, 0], expected)
+    # closing again does not repeat the last step
+    peaks.close()
+    assert len(ResultReader(str(tmp_path / "peaks.res"))) == 4
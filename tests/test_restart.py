@@ -0,0 +1,46 @@
+"""
+restart of the solution loop from a checkpoint
+"""
+import numpy as np
+import pytest
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code.protocol import LoadProtocol
+from fe_code.recorders import SectionRecorder
+from fe_code.results import ResultReader
+
+
+def _structure(recorder_path, predictor):
+    structure = cantilever(no_sections=3, no_fibers_y=5, no_fibers_z=5, planar=True)
+    structure.set_predictor(predictor)
+    structure.add_recorder(SectionRecorder(1, [1], filename=str(recorder_path), buffer_size=4))
+    return structure
+
+
+@pytest.mark.parametrize("predictor", ["tangent", "secant"])
+def test_restart_continues_the_result_files(tmp_path, predictor):
+    protocol = LoadProtocol.from_targets([2.0, -2.0, 1.0], 0.4)
+
+    # uninterrupted run
+    main.solution_loop(_structure(tmp_path / "ref_section.res", predictor), protocol,
+                       str(tmp_path / "ref.res"))
+
+    # interrupted after 13 steps with a checkpoint at step 10, then restarted
+    checkpoint = str(tmp_path / "checkpoint.npz")
+    interrupted = LoadProtocol(protocol.increments[:13])
+    main.solution_loop(_structure(tmp_path / "section.res", predictor), interrupted,
+                       str(tmp_path / "run.res"), checkpoint_filename=checkpoint,
+                       checkpoint_every=10)
+    main.solution_loop(_structure(tmp_path / "section.res", predictor), protocol,
+                       str(tmp_path / "run.res"), restart_from=checkpoint)
+
+    reference = ResultReader(str(tmp_path / "ref.res")).data
+    stitched = ResultReader(str(tmp_path / "run.res")).data
+    assert stitched.shape == (len(protocol) + 1, reference.shape[1])
+    np.testing.assert_array_equal(stitched, reference)
+
+    reference = ResultReader(str(tmp_path / "ref_section.res")).data
+    stitched = ResultReader(str(tmp_path / "section.res")).data
+    np.testing.assert_array_equal(stitched[:, 0], np.arange(len(protocol) + 1))
+    np.testing.assert_array_equal(stitched, reference)
@@ -0,0 +1,49 @@
+"""
+binary result store
+"""
+import numpy as np
+import pytest
+
+from fe_code.results import ResultReader, ResultWriter, convert_legacy, structure_columns
+
+
+def test_written_rows_are_read_back(tmp_path):
+    path = str(tmp_path / "x.res")
+    columns = structure_columns([1, 2], "uw")
+    rows = np.random.default_rng(0).normal(size=(7, len(columns)))
+    with ResultWriter(path, columns, {"model": "cantilever"}) as writer:
+        writer.write_row(rows[0])
+        writer.write_rows(rows[1:])
+
+    result = ResultReader(path)
+    assert result.metadata == {"model": "cantilever"}
+    assert result.columns == [tuple(column) for column in columns]
+    assert len(result) == 7
+    np.testing.assert_array_equal(result.data, rows)
+    np.testing.assert_array_equal(result["disp", 2, "w"], rows[:, 3])
+    np.testing.assert_array_equal(result["force", 1, "u", 2:5], rows[2:5, 4])
+    np.testing.assert_array_equal(result["force"], rows[:, 4:])
+    np.testing.assert_array_equal(
+        result.get("disp", dof="u", steps=[0, 6]), rows[[0, 6]][:, [0, 2]]
+    )
+    with pytest.raises(KeyError):
+        result["disp", 3, "w"]
+
+    # continued after the first 4 rows, e.g. after a restart
+    with ResultWriter(path, columns, keep_rows=4) as writer:
+        writer.write_rows(rows[:2])
+    np.testing.assert_array_equal(ResultReader(path).data, np.vstack((rows[:4], rows[:2])))
+    assert ResultReader(path).metadata == {"model": "cantilever"}
+
+
+def test_legacy_text_files_are_converted(tmp_path):
+    rows = np.arange(1.0, 49.0).reshape(4, 12)
+    rows[0] = 0.0
+    dat_path = tmp_path / "x.dat"
+    # the old writer omitted the newline after the initial zero row
+    lines = [" ".join(f"{value:g}" for value in row) for row in rows]
+    dat_path.write_text(lines[0] + "\n".join(lines[1:]) + "\n")
+
+    result = ResultReader(convert_legacy(str(dat_path)))
+    assert result.columns == structure_columns([1])
+    np.testing.assert_array_equal(result.data, rows)
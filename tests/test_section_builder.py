@@ -0,0 +1,71 @@
+"""
+section discretizations of the section builder
+"""
+import numpy as np
+import pytest
+
+from fe_code import KentPark, MenegottoPinto
+from fe_code.section import Section
+from fe_code.section_builder import (
+    add_to_section, build_section, circular_cover_core, circular_layer, point_bar,
+    rectangular_cover_core, rectangular_patch, straight_layer,
+)
+
+
+def test_patches_cover_the_section_area():
+    fibers = rectangular_cover_core(5.0, 8.0, 0.5, 4, 6, 0, 1, no_fibers_cover=2)
+    assert fibers.area.sum() == pytest.approx(40.0)
+    assert fibers.area[fibers.material == 0].sum() == pytest.approx(4.0 * 7.0)
+    # first moments vanish about the centroid
+    assert fibers.area @ fibers.y == pytest.approx(0.0, abs=1e-12)
+    assert fibers.area @ fibers.z == pytest.approx(0.0, abs=1e-12)
+    # second moment of the grid, exact for the fiber sizes
+    inertia = fibers.area @ fibers.z ** 2 + fibers.area @ fibers.h ** 2 / 12
+    assert inertia == pytest.approx(5.0 * 8.0 ** 3 / 12)
+
+    fibers = circular_cover_core(10.0, 1.0, 6, 16, 0, 1)
+    assert fibers.area.sum() == pytest.approx(np.pi * 100.0)
+    assert fibers.area[fibers.material == 0].sum() == pytest.approx(np.pi * 81.0)
+    assert fibers.area @ fibers.y == pytest.approx(0.0, abs=1e-10)
+
+
+def test_bars_displace_the_patch_fibers():
+    patch = rectangular_patch(-2.0, -4.0, 2.0, 4.0, 2, 4, 0)
+    bars = straight_layer(2, 0.2, -1.0, -3.0, 1.0, -3.0, 1)
+    fibers = build_section([patch], [bars])
+    # patch fibers first, the bars last
+    np.testing.assert_array_equal(fibers.material, [0] * 8 + [1] * 2)
+    assert fibers.area.sum() == pytest.approx(32.0)
+    # the bars lie at the centroids of the two lowest fibers
+    displaced = np.isclose(fibers.z[:8], -3.0)
+    np.testing.assert_allclose(fibers.area[:8][displaced], 4.0 - 0.2)
+    np.testing.assert_allclose(fibers.area[:8][~displaced], 4.0)
+
+    # without the subtraction the bar areas are counted twice
+    fibers = build_section([patch], [bars], subtract_overlap=False)
+    assert fibers.area.sum() == pytest.approx(32.4)
+
+    # a bar larger than its fiber removes only that fiber
+    fibers = build_section([patch], [point_bar(1.0, 3.0, 5.0, 1)])
+    assert fibers.y.size == 8
+    assert fibers.area.sum() == pytest.approx(28.0 + 5.0)
+
+    # bars outside of the patches keep all patch fibers
+    fibers = build_section([patch], [circular_layer(4, 0.1, 10.0, 1)])
+    assert fibers.area.sum() == pytest.approx(32.4)
+
+
+def test_fibers_are_added_with_one_material_per_id():
+    fibers = build_section(
+        [rectangular_patch(-2.0, -4.0, 2.0, 4.0, 2, 4, 0)],
+        [straight_layer(2, 0.2, -1.0, -3.0, 1.0, -3.0, 1)],
+    )
+    section = Section(1)
+    materials = [lambda: KentPark(6.95, 770, 0.0027),
+                 lambda: MenegottoPinto(29000, 0.0042, 60, 20, 18.5, 0.0002)]
+    assert add_to_section(section, fibers, materials, 5) == 15
+    assert section.fiber_ids == list(range(5, 15))
+    np.testing.assert_array_equal(section.fiber_geometry[:, 2], fibers.area)
+    table, material_ids = section.fiber_materials()
+    assert [material_class for material_class, _ in table] == [KentPark, MenegottoPinto]
+    np.testing.assert_array_equal(material_ids, fibers.material)
@@ -0,0 +1,55 @@
+"""
+iterative and non-iterative element state determination
+"""
+import numpy as np
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code import events
+from fe_code.protocol import LoadProtocol
+from fe_code.results import ResultReader
+
+
+def _structure(method):
+    structure = cantilever(no_sections=3, no_fibers_y=5, no_fibers_z=5, planar=True)
+    structure.set_state_determination(method)
+    return structure
+
+
+def test_non_iterative_state_determination_gives_the_iterative_results(tmp_path):
+    protocol = LoadProtocol.from_targets([1.2, -0.8, 0.4], 0.4)
+    results = dict()
+    for method in ("iterative", "non_iterative"):
+        structure = _structure(method)
+        main.solution_loop(structure, protocol, str(tmp_path / f"{method}.res"))
+        assert structure.load_step == len(protocol)
+        assert structure.elements_converged
+        results[method] = ResultReader(str(tmp_path / f"{method}.res")).data
+    reference = results["iterative"]
+    np.testing.assert_allclose(
+        results["non_iterative"], reference, rtol=0.0, atol=1e-8 * np.abs(reference).max()
+    )
+
+
+def test_failed_element_iterations_keep_the_residuals():
+    structure = _structure("non_iterative")
+    structure.initialize()
+    element = structure.get_element(1)
+    # pretend the residuals grew, so they are resolved by element iterations
+    element._residual_norm = 0.0
+    reported = list()
+
+    def report(event, data):
+        reported.append(data)
+
+    events.subscribe(events.ELEMENT_NOT_CONVERGED, report)
+    try:
+        converged = element.non_iterative_state_determination(
+            np.array([0.0, 0.0, 0.0, 0.0, 1.0, 0.0]), max_ele_iterations=1
+        )
+    finally:
+        events.unsubscribe(events.ELEMENT_NOT_CONVERGED, report)
+    assert not converged
+    assert reported and reported[0]["element_id"] == 1
+    residual = np.linalg.norm(element._displacement_residual)
+    assert residual > 0.0 and residual == element._residual_norm
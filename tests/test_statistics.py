@@ -0,0 +1,104 @@
+"""
+convergence statistics of the solver
+"""
+import numpy as np
+import pytest
+
+import main
+from benchmarks.parametric import cantilever
+from fe_code.protocol import LoadProtocol
+from fe_code.section import Section
+
+
+def _structure(predictor="tangent", element_acceleration="none"):
+    structure = cantilever(no_sections=3, no_fibers_y=5, no_fibers_z=5, planar=True)
+    structure.set_predictor(predictor)
+    structure.set_element_acceleration(element_acceleration)
+    return structure
+
+
+def _count_section_calls(monkeypatch):
+    calls = [0]
+    for name in ("state_determination", "extend_correction"):
+        method = getattr(Section, name)
+
+        def counted(self, *args, method=method):
+            calls[0] += 1
+            return method(self, *args)
+
+        monkeypatch.setattr(Section, name, counted)
+    return calls
+
+
+@pytest.mark.parametrize("predictor, element_acceleration", [
+    ("tangent", "none"), ("secant", "none"), ("tangent", "line_search"),
+])
+def test_section_iterations_count_the_section_calls(
+        tmp_path, monkeypatch, predictor, element_acceleration):
+    calls = _count_section_calls(monkeypatch)
+    structure = _structure(predictor, element_acceleration)
+    protocol = LoadProtocol.from_targets([2.0, -2.0], 1.0)
+    main.solution_loop(structure, protocol, str(tmp_path / "x.res"))
+    assert structure.load_step == len(protocol)
+
+    statistics = structure.convergence_statistics
+    assert statistics.get("section_iterations").sum() == calls[0]
+    # element iterations per load step, one row per step and element
+    histories = np.array([element.iteration_history for element in structure.elements])
+    np.testing.assert_array_equal(
+        statistics.get("element_iterations"), histories[:, :, 0].sum(axis=0)
+    )
+    np.testing.assert_array_equal(
+        statistics.get("max_element_iterations"), histories[:, :, 0].max(axis=0)
+    )
+    np.testing.assert_array_equal(
+        statistics.get("section_iterations"), histories[:, :, 1].sum(axis=0)
+    )
+
+
+def test_summary_of_the_load_steps(tmp_path):
+    structure = _structure()
+    protocol = LoadProtocol.from_targets([1.2, -0.8], 0.4)
+    main.solution_loop(structure, protocol, str(tmp_path / "x.res"))
+
+    statistics = structure.convergence_statistics
+    summary = statistics.summary(no_expensive_steps=3)
+    assert summary["load_steps"] == len(protocol)
+    np.testing.assert_array_equal(statistics.get("load_step"), np.arange(1, len(protocol) + 1))
+    for column in ("nr_iterations", "element_iterations", "section_iterations"):
+        values = statistics.get(column)
+        assert summary[column]["total"] == values.sum()
+        assert summary[column]["max"] == values.max()
+        assert summary[column]["mean"] == pytest.approx(values.mean())
+    nr_iterations = [len(statistics.get_residual_trace(k)) for k in range(1, len(protocol) + 1)]
+    np.testing.assert_array_equal(statistics.get("nr_iterations"), nr_iterations)
+    expensive = summary["most_expensive_steps"]
+    assert len(expensive) == 3
+    element_iterations = statistics.get("element_iterations")
+    assert element_iterations[expensive[-1] - 1] >= np.delete(
+        element_iterations, np.array(expensive) - 1
+    ).max()
+
+
+def test_statistics_restart_with_the_analysis(tmp_path):
+    structure = _structure()
+    protocol = LoadProtocol.from_targets([1.2, -0.8], 0.4)
+    checkpoint = str(tmp_path / "checkpoint.npz")
+    main.solution_loop(structure, protocol, str(tmp_path / "x.res"),
+                       checkpoint_filename=checkpoint, checkpoint_every=5)
+    table = structure.convergence_statistics.table.copy()
+    trace = structure.convergence_statistics.residual_trace.copy()
+
+    # the records after the checkpoint are dropped
+    structure.load_checkpoint(checkpoint)
+    statistics = structure.convergence_statistics
+    assert len(statistics) == 5
+    np.testing.assert_array_equal(statistics.table, table[:5])
+    np.testing.assert_array_equal(statistics.residual_trace, trace[trace[:, 0] <= 5])
+
+    # a new analysis starts with empty statistics
+    main.solution_loop(structure, protocol, str(tmp_path / "y.res"))
+    statistics = structure.convergence_statistics
+    np.testing.assert_array_equal(statistics.get("load_step"), np.arange(1, len(protocol) + 1))
+    assert len(statistics.residual_trace) == statistics.get("nr_iterations").sum()
+    assert all(len(element.iteration_history) == len(protocol) for element in structure.elements)